@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable
 import logging
+from typing import Any
 
 from rivian import Rivian
 
@@ -10,26 +13,45 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.device_registry import DeviceEntry
-from homeassistant.helpers.issue_registry import (
-    IssueSeverity,
-    async_create_issue,
-    async_delete_issue,
-)
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     ATTR_API,
+    ATTR_CONFIG,
+    ATTR_CONTROL_ENTITIES,
     ATTR_COORDINATOR,
+    ATTR_FRAME_RECORDER,
+    ATTR_MEMORY_WATCHDOG,
+    ATTR_METRICS,
+    ATTR_STARTUP_TIMINGS,
+    ATTR_SUBSCRIPTION,
     ATTR_USER,
     ATTR_VEHICLE,
     ATTR_WALLBOX,
-    CONF_VEHICLE_CONTROL,
+    CONF_RECORD_FRAMES,
+    DATA_IMAGE_CACHE,
+    DATA_RELEASE_NOTES,
     DOMAIN,
     ISSUE_URL,
+    UNLOAD_TIMEOUT,
+    VEHICLE_STATE_API_FIELDS,
     VERSION,
 )
 from .coordinator import UserCoordinator, VehicleCoordinator, WallboxCoordinator
+from .enrollment import PhoneEnrollment
+from .frame_recorder import FrameRecorder, async_start_frame_recorder
 from .helpers import get_rivian_api_from_entry
+from .image_cache import ImageCache
+from .memory import MemoryWatchdog
+from .metrics import ACCOUNT_SCOPE, MetricsRegistry
+from .options import async_apply_options, async_setup_vehicle_control, config_snapshot
+from .profiler import PROFILE_SCHEMA, SERVICE_PROFILE, IntegrationProfiler
+from .release_notes import ReleaseNotesCache
+from .startup import StartupTimings
+from .subscription import VehicleSubscriptionManager
+from .view import RivianImageView, RivianMetricsView
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [
@@ -46,6 +68,24 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
     Platform.UPDATE,
 ]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Rivian integration."""
+    image_cache = hass.data[DATA_IMAGE_CACHE] = ImageCache(hass)
+    await image_cache.async_load()
+    release_notes = hass.data[DATA_RELEASE_NOTES] = ReleaseNotesCache(hass)
+    await release_notes.async_load()
+    hass.http.register_view(RivianImageView())
+    hass.http.register_view(RivianMetricsView())
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        IntegrationProfiler(hass).async_handle_profile,
+        schema=PROFILE_SCHEMA,
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -58,9 +98,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
+    timings = StartupTimings()
     client = get_rivian_api_from_entry(hass, entry)
     try:
-        await client.create_csrf_token()
+        with timings.span("csrf_token"):
+            await client.create_csrf_token()
     except Exception as err:  # pylint: disable=broad-except
         _LOGGER.error("Could not update Rivian Data: %s", err, exc_info=1)
         await client.close()
@@ -69,50 +111,76 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator = UserCoordinator(
         hass=hass, config_entry=entry, client=client, include_phones=True
     )
-    await coordinator.async_config_entry_first_refresh()
-
-    vehicle_control = entry.options.get(CONF_VEHICLE_CONTROL)
-    if vehicle_control and not coordinator.data.get("registrationChannels"):
-        vehicle_control = []
-        async_create_issue(
-            hass,
-            DOMAIN,
-            entry.entry_id,
-            is_fixable=False,
-            is_persistent=False,
-            severity=IssueSeverity.WARNING,
-            translation_key="2fa_missing",
-        )
-    else:
-        async_delete_issue(hass, DOMAIN, entry.entry_id)
+    metrics = MetricsRegistry()
+    subscriptions = VehicleSubscriptionManager(
+        hass=hass,
+        client=client,
+        properties=VEHICLE_STATE_API_FIELDS,
+        metrics=metrics,
+    )
+    recorder: FrameRecorder | None = None
+    vehicle_coordinators: dict[str, VehicleCoordinator] = {}
+    try:
+        with timings.span("user"):
+            await coordinator.async_config_entry_first_refresh()
 
-    vehicles = coordinator.get_vehicles()
-    if vehicle_control and (
-        enrolled := coordinator.get_enrolled_phone_data(entry.options.get("public_key"))
-    ):
-        for vehicle_id in vehicles:
-            if vehicle_id in enrolled[1]:
-                vehicles[vehicle_id]["phone_identity_id"] = enrolled[1][vehicle_id]
+        vehicles = coordinator.get_vehicles()
+        async_setup_vehicle_control(hass, entry, coordinator, vehicles)
 
-    vehicle_coordinators: dict[str, VehicleCoordinator] = {}
-    for vehicle_id in vehicles:
-        coor = VehicleCoordinator(
-            hass=hass, config_entry=entry, client=client, vehicle_id=vehicle_id
+        metrics.add(ACCOUNT_SCOPE, "user", coordinator.metrics)
+        if entry.options.get(CONF_RECORD_FRAMES):
+            recorder = async_start_frame_recorder(hass, entry.entry_id, metrics)
+        for vehicle_id in vehicles:
+            coor = vehicle_coordinators[vehicle_id] = VehicleCoordinator(
+                hass=hass,
+                config_entry=entry,
+                client=client,
+                vehicle_id=vehicle_id,
+                subscriptions=subscriptions,
+                recorder=recorder,
+                metrics=metrics,
+            )
+            with timings.span("vehicle_state", vehicle_id):
+                await coor.async_config_entry_first_refresh()
+            if not coor.data:
+                raise ConfigEntryNotReady("Issue loading vehicle data")
+            with timings.span("charging", vehicle_id):
+                await coor.charging_coordinator.async_config_entry_first_refresh()
+            with timings.span("drivers", vehicle_id):
+                await coor.drivers_coordinator.async_config_entry_first_refresh()
+            metrics.add(vehicle_id, "vehicle", coor.metrics)
+            metrics.add(vehicle_id, "charging", coor.charging_coordinator.metrics)
+            metrics.add(vehicle_id, "drivers", coor.drivers_coordinator.metrics)
+
+        wallbox_coordinator = WallboxCoordinator(
+            hass=hass, config_entry=entry, client=client
         )
-        await coor.async_config_entry_first_refresh()
-        if not coor.data:
-            raise ConfigEntryNotReady("Issue loading vehicle data")
-        await coor.charging_coordinator.async_config_entry_first_refresh()
-        await coor.drivers_coordinator.async_config_entry_first_refresh()
-        vehicle_coordinators[vehicle_id] = coor
-
-    wallbox_coordinator = WallboxCoordinator(
-        hass=hass, config_entry=entry, client=client
-    )
-    await wallbox_coordinator.async_config_entry_first_refresh()
+        with timings.span("wallbox"):
+            await wallbox_coordinator.async_config_entry_first_refresh()
+        metrics.add(ACCOUNT_SCOPE, "wallbox", wallbox_coordinator.metrics)
+    except Exception:
+        # a failed setup is retried, so release everything it started
+        await _async_wait_all(
+            "cleaning up",
+            subscriptions.async_close(),
+            *(coor.async_shutdown() for coor in vehicle_coordinators.values()),
+            *((recorder.async_close(),) if recorder else ()),
+        )
+        await client.close()
+        raise
+    # supervise the subscriptions once every vehicle is set up
+    subscriptions.async_start()
 
+    watchdog = MemoryWatchdog(hass, entry)
     hass.data[DOMAIN][entry.entry_id] = {
         ATTR_API: client,
+        ATTR_CONFIG: config_snapshot(entry),
+        ATTR_CONTROL_ENTITIES: [],
+        ATTR_SUBSCRIPTION: subscriptions,
+        ATTR_FRAME_RECORDER: recorder,
+        ATTR_MEMORY_WATCHDOG: watchdog,
+        ATTR_METRICS: metrics,
+        ATTR_STARTUP_TIMINGS: timings,
         ATTR_VEHICLE: vehicles,
         ATTR_COORDINATOR: {
             ATTR_USER: coordinator,
@@ -121,18 +189,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         },
     }
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with timings.span("platforms"):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    timings.finish()
 
+    watchdog.async_start()
+    entry.async_on_unload(watchdog.async_stop)
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
+    """Unload a config entry.
+
+    Once the platforms are unloaded, the subscriptions, vehicle coordinators
+    and frame recorder are stopped concurrently within `UNLOAD_TIMEOUT`
+    before the client is closed.
+    """
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    api: Rivian = hass.data[DOMAIN][entry.entry_id][ATTR_API]
+    data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
+    subscriptions: VehicleSubscriptionManager = data[ATTR_SUBSCRIPTION]
+    vehicle_coordinators: dict[str, VehicleCoordinator] = data[ATTR_COORDINATOR][
+        ATTR_VEHICLE
+    ]
+    recorder: FrameRecorder | None = data[ATTR_FRAME_RECORDER]
+    await _async_wait_all(
+        "unloading",
+        subscriptions.async_close(),
+        *(coor.async_shutdown() for coor in vehicle_coordinators.values()),
+        *((recorder.async_close(),) if recorder else ()),
+    )
+    api: Rivian = data[ATTR_API]
     await api.close()
 
     if unload_ok:
@@ -143,22 +232,68 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of an entry."""
+    image_cache: ImageCache = hass.data[DATA_IMAGE_CACHE]
+    image_cache.async_remove_catalog(entry.entry_id)
+    await image_cache.async_prune()
+    release_notes: ReleaseNotesCache = hass.data[DATA_RELEASE_NOTES]
+    release_notes.async_retain(
+        {
+            vehicle_id
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+            for vehicle_id in entry_data[ATTR_VEHICLE]
+        }
+    )
     if public_key := entry.options.get("public_key"):
         client = get_rivian_api_from_entry(hass, entry)
-        coordinator = UserCoordinator(
-            hass=hass, config_entry=entry, client=client, include_phones=True
+        try:
+            await _async_wait_all(
+                "disenrolling", _async_disenroll(hass, entry, client, public_key)
+            )
+        finally:
+            await client.close()
+
+
+async def _async_disenroll(
+    hass: HomeAssistant, entry: ConfigEntry, client: Rivian, public_key: str
+) -> None:
+    """Disenroll the phone of a config entry from every vehicle."""
+    await client.create_csrf_token()
+    coordinator = UserCoordinator(
+        hass=hass, config_entry=entry, client=client, include_phones=True
+    )
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        _LOGGER.warning("Could not disenroll the phone: user data is unavailable")
+        return
+    if enrolled_data := coordinator.get_enrolled_phone_data(public_key=public_key):
+        await PhoneEnrollment(client, coordinator.get_vehicles()).async_disenroll(
+            enrolled_data[1]
         )
-        await coordinator.async_config_entry_first_refresh()
 
-        if enrolled_data := coordinator.get_enrolled_phone_data(public_key=public_key):
-            for identity_id in enrolled_data[1].values():
-                await client.disenroll_phone(identity_id=identity_id)
-        await client.close()
+
+async def _async_wait_all(action: str, *aws: Awaitable[Any]) -> None:
+    """Run awaitables concurrently, cancelling those left after the timeout."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    done, pending = await asyncio.wait(tasks, timeout=UNLOAD_TIMEOUT)
+    for task in pending:
+        task.cancel()
+    if pending:
+        _LOGGER.warning(
+            "Cancelled %s task(s) still %s after %s seconds",
+            len(pending),
+            action,
+            UNLOAD_TIMEOUT,
+        )
+        await asyncio.wait(pending)
+    for task in done:
+        if not task.cancelled() and (err := task.exception()):
+            _LOGGER.error("Error %s: %s", action, err, exc_info=err)
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Handle options update, reloading only if it cannot be applied in place."""
+    if not await async_apply_options(hass, entry):
+        await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_remove_config_entry_device(
@@ -171,9 +306,10 @@ async def async_remove_config_entry_device(
 
     vehicles = user_coordinator.get_vehicles().keys()
     wallboxes = {x["wallboxId"] for x in wallbox_coordinator.data}
+    account = {user_coordinator.data["id"]}
 
     return not any(
         identifier
         for identifier in device_entry.identifiers
-        if identifier[0] == DOMAIN and identifier[1] in vehicles | wallboxes
+        if identifier[0] == DOMAIN and identifier[1] in vehicles | wallboxes | account
     )
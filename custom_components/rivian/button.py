@@ -18,12 +18,13 @@ from homeassistant.components.bluetooth import BluetoothScanningMode
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, HomeAssistantError
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import ATTR_COORDINATOR, ATTR_USER, ATTR_VEHICLE, DOMAIN
 from .coordinator import UserCoordinator, VehicleCoordinator
 from .data_classes import RivianButtonEntityDescription
-from .entity import RivianVehicleControlEntity
+from .entity import RivianVehicleControlEntity, async_add_vehicle_control_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -75,33 +76,32 @@ async def async_setup_entry(
 ) -> None:
     """Set up the button entities."""
     data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
-    vehicles: dict[str, dict[str, Any]] = data[ATTR_VEHICLE]
     coordinators: dict[str, VehicleCoordinator] = data[ATTR_COORDINATOR][ATTR_VEHICLE]
 
-    entities = [
-        RivianButtonEntity(coordinators[vehicle_id], entry, description, vehicle)
-        for vehicle_id, vehicle in vehicles.items()
-        if vehicle.get("phone_identity_id")
-        for feature, descriptions in BUTTONS.items()
-        if feature is None or feature in (vehicle.get("supported_features", []))
-        for description in descriptions
-    ]
-    entities.extend(
-        RivianPairPhoneButtonEntity(
-            coordinators[vehicle_id],
-            entry,
-            ButtonEntityDescription(key="pair", name="Pair"),
-            vehicle,
-        )
-        for vehicle_id, vehicle in vehicles.items()
+    def _entities(vehicle_id: str, vehicle: dict[str, Any]) -> list[Entity]:
+        if not (identity_id := vehicle.get("phone_identity_id")):
+            return []
+        coordinator = coordinators[vehicle_id]
+        entities: list[Entity] = [
+            RivianButtonEntity(coordinator, entry, description, vehicle)
+            for feature, descriptions in BUTTONS.items()
+            if feature is None or feature in (vehicle.get("supported_features", []))
+            for description in descriptions
+        ]
         if (
-            device := coordinators[vehicle_id].drivers_coordinator.get_device_details(
-                vehicle.get("phone_identity_id")
+            device := coordinator.drivers_coordinator.get_device_details(identity_id)
+        ) and not device["isPaired"]:
+            entities.append(
+                RivianPairPhoneButtonEntity(
+                    coordinator,
+                    entry,
+                    ButtonEntityDescription(key="pair", name="Pair"),
+                    vehicle,
+                )
             )
-        )
-        and not device["isPaired"]
-    )
-    async_add_entities(entities)
+        return entities
+
+    async_add_vehicle_control_entities(hass, entry, async_add_entities, _entities)
 
 
 class RivianButtonEntity(RivianVehicleControlEntity, ButtonEntity):
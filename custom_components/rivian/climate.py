@@ -17,11 +17,12 @@ from homeassistant.components.climate import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import ATTR_COORDINATOR, ATTR_VEHICLE, DOMAIN
 from .coordinator import VehicleCoordinator
-from .entity import RivianVehicleControlEntity
+from .entity import RivianVehicleControlEntity, async_add_vehicle_control_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,15 +38,14 @@ async def async_setup_entry(
 ) -> None:
     """Set up the climate entity."""
     data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
-    vehicles: dict[str, dict[str, Any]] = data[ATTR_VEHICLE]
     coordinators: dict[str, VehicleCoordinator] = data[ATTR_COORDINATOR][ATTR_VEHICLE]
 
-    entities = [
-        RivianClimateEntity(coordinators[vehicle_id], entry, CLIMATE, vehicle)
-        for vehicle_id, vehicle in vehicles.items()
-        if vehicle.get("phone_identity_id")
-    ]
-    async_add_entities(entities)
+    def _entities(vehicle_id: str, vehicle: dict[str, Any]) -> list[Entity]:
+        if not vehicle.get("phone_identity_id"):
+            return []
+        return [RivianClimateEntity(coordinators[vehicle_id], entry, CLIMATE, vehicle)]
+
+    async_add_vehicle_control_entities(hass, entry, async_add_entities, _entities)
 
 
 class RivianClimateEntity(RivianVehicleControlEntity, ClimateEntity):
@@ -0,0 +1,325 @@
+"""Vehicle command tracing for the Rivian integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+from time import perf_counter
+from typing import Any, Final
+
+from rivian import VehicleCommand
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from .const import LOCK_STATE_ENTITIES
+from .metrics import (
+    COMMAND_CONFIRM,
+    COMMAND_FAILURES,
+    COMMAND_LATENCY,
+    COMMAND_PREPARE,
+    COMMAND_SEND,
+    COMMAND_TIMEOUTS,
+    COMMAND_WAKE,
+    Metrics,
+    MetricsRegistry,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPONENT_PREFIX = "command_"
+
+# traced phases and their histograms, in order
+PHASES: Final[dict[str, str]] = {
+    "wake": COMMAND_WAKE,
+    "prepare": COMMAND_PREPARE,
+    "send": COMMAND_SEND,
+    "confirm": COMMAND_CONFIRM,
+}
+
+OUTCOME_ACKNOWLEDGED = "acknowledged"
+OUTCOME_CONFIRMED = "confirmed"
+OUTCOME_FAILED = "failed"
+OUTCOME_REJECTED = "rejected"
+OUTCOME_TIMEOUT = "timeout"
+
+_CLOSED = frozenset({"closed"})
+_LOCKED = frozenset({"locked"})
+_OPEN = frozenset({"open"})
+_UNLOCKED = frozenset({"unlocked"})
+_WINDOWS = frozenset(
+    {
+        "windowFrontLeftClosed",
+        "windowFrontRightClosed",
+        "windowRearLeftClosed",
+        "windowRearRightClosed",
+    }
+)
+
+# Fields reflecting the result of a command and the values confirming it.
+# Without values, any fresh record of the fields confirms the command.
+COMMAND_CONFIRMATIONS: Final[
+    dict[str, tuple[frozenset[str], frozenset[str] | None]]
+] = {
+    VehicleCommand.WAKE_VEHICLE: (frozenset({"powerState"}), None),
+    VehicleCommand.LOCK_ALL_CLOSURES_FEEDBACK: (
+        frozenset(LOCK_STATE_ENTITIES),
+        _LOCKED,
+    ),
+    VehicleCommand.UNLOCK_ALL_CLOSURES: (frozenset(LOCK_STATE_ENTITIES), _UNLOCKED),
+    VehicleCommand.UNLOCK_DRIVER_DOOR: (
+        frozenset({"doorFrontLeftLocked"}),
+        _UNLOCKED,
+    ),
+    VehicleCommand.UNLOCK_PASSENGER_DOOR: (
+        frozenset({"doorFrontRightLocked"}),
+        _UNLOCKED,
+    ),
+    VehicleCommand.OPEN_FRUNK: (frozenset({"closureFrunkClosed"}), _OPEN),
+    VehicleCommand.CLOSE_FRUNK: (frozenset({"closureFrunkClosed"}), _CLOSED),
+    VehicleCommand.OPEN_ALL_WINDOWS: (_WINDOWS, _OPEN),
+    VehicleCommand.CLOSE_ALL_WINDOWS: (_WINDOWS, _CLOSED),
+    VehicleCommand.OPEN_CHARGE_PORT_DOOR: (frozenset({"chargePortState"}), _OPEN),
+    VehicleCommand.CLOSE_CHARGE_PORT_DOOR: (frozenset({"chargePortState"}), _CLOSED),
+    VehicleCommand.CLOSE_LIFTGATE: (frozenset({"closureLiftgateClosed"}), _CLOSED),
+    VehicleCommand.OPEN_LIFTGATE_UNLATCH_TAILGATE: (
+        frozenset({"closureLiftgateClosed", "closureTailgateClosed"}),
+        _OPEN,
+    ),
+    VehicleCommand.OPEN_TONNEAU_COVER: (frozenset({"closureTonneauClosed"}), _OPEN),
+    VehicleCommand.CLOSE_TONNEAU_COVER: (
+        frozenset({"closureTonneauClosed"}),
+        _CLOSED,
+    ),
+    VehicleCommand.RELEASE_LEFT_SIDE_BIN: (
+        frozenset({"closureSideBinLeftClosed"}),
+        _OPEN,
+    ),
+    VehicleCommand.RELEASE_RIGHT_SIDE_BIN: (
+        frozenset({"closureSideBinRightClosed"}),
+        _OPEN,
+    ),
+    VehicleCommand.PANIC_ON: (frozenset({"alarmSoundStatus"}), frozenset({"true"})),
+    VehicleCommand.PANIC_OFF: (frozenset({"alarmSoundStatus"}), frozenset({"false"})),
+    VehicleCommand.START_CHARGING: (
+        frozenset({"chargerState"}),
+        frozenset({"charging_active", "charging_connecting"}),
+    ),
+    VehicleCommand.STOP_CHARGING: (frozenset({"chargerState"}), None),
+    VehicleCommand.CHARGING_LIMITS: (frozenset({"batteryLimit"}), None),
+    VehicleCommand.ENABLE_GEAR_GUARD_VIDEO: (
+        frozenset({"gearGuardVideoStatus"}),
+        None,
+    ),
+    VehicleCommand.DISABLE_GEAR_GUARD_VIDEO: (
+        frozenset({"gearGuardVideoStatus"}),
+        None,
+    ),
+    VehicleCommand.CABIN_HVAC_DEFROST_DEFOG: (frozenset({"defrostDefogStatus"}), None),
+    VehicleCommand.CABIN_HVAC_LEFT_SEAT_HEAT: (frozenset({"seatFrontLeftHeat"}), None),
+    VehicleCommand.CABIN_HVAC_LEFT_SEAT_VENT: (frozenset({"seatFrontLeftVent"}), None),
+    VehicleCommand.CABIN_HVAC_RIGHT_SEAT_HEAT: (
+        frozenset({"seatFrontRightHeat"}),
+        None,
+    ),
+    VehicleCommand.CABIN_HVAC_RIGHT_SEAT_VENT: (
+        frozenset({"seatFrontRightVent"}),
+        None,
+    ),
+    VehicleCommand.CABIN_HVAC_REAR_LEFT_SEAT_HEAT: (
+        frozenset({"seatRearLeftHeat"}),
+        None,
+    ),
+    VehicleCommand.CABIN_HVAC_REAR_RIGHT_SEAT_HEAT: (
+        frozenset({"seatRearRightHeat"}),
+        None,
+    ),
+    VehicleCommand.CABIN_HVAC_STEERING_HEAT: (frozenset({"steeringWheelHeat"}), None),
+    VehicleCommand.CABIN_PRECONDITIONING_SET_TEMP: (
+        frozenset({"cabinClimateDriverTemperature"}),
+        None,
+    ),
+    VehicleCommand.VEHICLE_CABIN_PRECONDITION_ENABLE: (
+        frozenset({"cabinPreconditioningStatus", "cabinPreconditioningType"}),
+        None,
+    ),
+    VehicleCommand.VEHICLE_CABIN_PRECONDITION_DISABLE: (
+        frozenset({"cabinPreconditioningStatus", "cabinPreconditioningType"}),
+        None,
+    ),
+}
+
+
+@dataclass
+class CommandTrace:
+    """The phases of a vehicle command, up to the frame confirming it."""
+
+    command: str
+    started: str = field(default_factory=lambda: dt_util.utcnow().isoformat())
+    began: float = field(default_factory=perf_counter)
+    phases: dict[str, float] = field(default_factory=dict)
+    outcome: str | None = None
+    confirmed_by: str | None = None
+    total: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the command."""
+        began = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = perf_counter() - began
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace, in milliseconds."""
+        return {
+            "command": self.command,
+            "started": self.started,
+            "outcome": self.outcome,
+            "confirmed_by": self.confirmed_by,
+            "phases_ms": {
+                name: round(seconds * 1000, 1) for name, seconds in self.phases.items()
+            },
+            "total_ms": None if self.total is None else round(self.total * 1000, 1),
+        }
+
+
+class CommandTracer:
+    """Trace the commands sent to a vehicle.
+
+    A command is traced from the call through waking the vehicle, preparing
+    the request and sending it, until the API acknowledges it, then until a
+    vehicle state frame reflects its expected result. Finished traces are
+    kept in a bounded log and their phases observed on per-command
+    histograms in the metrics registry.
+    """
+
+    size = 50
+    confirm_timeout = 60  # seconds
+
+    def __init__(
+        self, hass: HomeAssistant, vehicle_id: str, metrics: MetricsRegistry
+    ) -> None:
+        """Initialize the tracer."""
+        self.hass = hass
+        self.vehicle_id = vehicle_id
+        self.metrics = metrics
+        self.traces: deque[CommandTrace] = deque(maxlen=self.size)
+        self._awaiting: dict[int, tuple[CommandTrace, float, CALLBACK_TYPE]] = {}
+
+    def start(self, command: str) -> CommandTrace:
+        """Start tracing a command."""
+        return CommandTrace(str(command))
+
+    @callback
+    def async_acknowledged(self, trace: CommandTrace, command_id: str | None) -> None:
+        """Handle the API response to a command.
+
+        Commands with a known result wait for the confirming frame.
+        """
+        if not command_id:
+            self._finish(trace, OUTCOME_REJECTED)
+            return
+        if trace.command not in COMMAND_CONFIRMATIONS:
+            self._finish(trace, OUTCOME_ACKNOWLEDGED)
+            return
+
+        @callback
+        def _async_timeout(_: Any) -> None:
+            if self._awaiting.pop(id(trace), None):
+                self._finish(trace, OUTCOME_TIMEOUT)
+
+        self._awaiting[id(trace)] = (
+            trace,
+            perf_counter(),
+            async_call_later(self.hass, self.confirm_timeout, _async_timeout),
+        )
+
+    @callback
+    def async_failed(self, trace: CommandTrace) -> None:
+        """Handle a command that could not be sent."""
+        self._finish(trace, OUTCOME_FAILED)
+
+    @callback
+    def async_observe(self, frame: dict[str, Any], transport: str) -> None:
+        """Confirm the commands awaiting a frame reflecting their result."""
+        if not self._awaiting:
+            return
+        for key, (trace, acknowledged, cancel) in list(self._awaiting.items()):
+            fields, values = COMMAND_CONFIRMATIONS[trace.command]
+            if not any(
+                (record := frame.get(field_name))
+                and "value" in record
+                and (values is None or record["value"] in values)
+                for field_name in fields
+            ):
+                continue
+            cancel()
+            del self._awaiting[key]
+            trace.phases["confirm"] = perf_counter() - acknowledged
+            trace.confirmed_by = transport
+            self._finish(trace, OUTCOME_CONFIRMED)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop waiting for confirmations."""
+        for _, _, cancel in self._awaiting.values():
+            cancel()
+        self._awaiting.clear()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the trace log and the latency histograms by command."""
+        return {
+            "vehicleId": self.vehicle_id,
+            "awaiting_confirmation": [
+                trace.command for trace, _, _ in self._awaiting.values()
+            ],
+            "traces": [trace.as_dict() for trace in self.traces],
+            "latency": {
+                component.removeprefix(COMPONENT_PREFIX): {
+                    name: histogram.summary()
+                    for name, histogram in metrics.histograms.items()
+                }
+                for component, metrics in self.metrics.scopes()
+                .get(self.vehicle_id, {})
+                .items()
+                if component.startswith(COMPONENT_PREFIX)
+            },
+        }
+
+    def _finish(self, trace: CommandTrace, outcome: str) -> None:
+        """Record a finished trace."""
+        trace.outcome = outcome
+        trace.total = perf_counter() - trace.began
+        self.traces.append(trace)
+
+        metrics = self._command_metrics(trace.command)
+        for phase, seconds in trace.phases.items():
+            metrics.observe(PHASES[phase], seconds)
+        if outcome in (OUTCOME_CONFIRMED, OUTCOME_ACKNOWLEDGED):
+            metrics.observe(COMMAND_LATENCY, trace.total)
+        elif outcome == OUTCOME_TIMEOUT:
+            metrics.increment(COMMAND_TIMEOUTS)
+        else:
+            metrics.increment(COMMAND_FAILURES)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "%s to vehicle %s ended %s after %.2fs: %s",
+                trace.command,
+                self.vehicle_id,
+                outcome,
+                trace.total,
+                ", ".join(
+                    f"{phase} {seconds:.2f}s" for phase, seconds in trace.phases.items()
+                ),
+            )
+
+    def _command_metrics(self, command: str) -> Metrics:
+        """Return the metrics of a command."""
+        return self.metrics.get(self.vehicle_id, f"{COMPONENT_PREFIX}{command.lower()}")
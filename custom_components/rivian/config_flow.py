@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 from rivian import Rivian
-from rivian.exceptions import RivianPhoneLimitReachedError, RivianUnauthenticated
+from rivian.exceptions import RivianUnauthenticated
 from rivian.utils import generate_key_pair
 import voluptuous as vol
 
@@ -24,29 +25,43 @@ from homeassistant.helpers.schema_config_entry_flow import (
     SchemaOptionsFlowHandler,
 )
 from homeassistant.helpers.selector import (
+    BooleanSelector,
     DeviceFilterSelectorConfig,
     DeviceSelector,
     DeviceSelectorConfig,
     EntitySelector,
     EntitySelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
 )
 
 from .const import (
+    ATTR_COORDINATOR,
+    ATTR_USER,
+    ATTR_VEHICLE,
     CONF_ACCESS_TOKEN,
+    CONF_MEMORY_POLICY,
     CONF_OTP,
+    CONF_RECORD_FRAMES,
     CONF_REFRESH_TOKEN,
+    CONF_UPDATE_COALESCE_WINDOW,
     CONF_USER_SESSION_TOKEN,
     CONF_VEHICLE_CONTROL,
     CONF_VEHICLE_IMAGE_STYLE,
+    DEFAULT_UPDATE_COALESCE_WINDOW,
     DOMAIN,
     IMAGE_STYLE_CEL,
     IMAGE_STYLE_NONE,
     IMAGE_STYLE_PHOTO,
+    MEMORY_POLICY_TRIM,
+    MEMORY_POLICY_WARN,
 )
-from .coordinator import UserCoordinator
+from .coordinator import DriverKeyCoordinator, UserCoordinator
+from .enrollment import ENROLL, EnrollmentPlan, PhoneEnrollment
 from .helpers import get_rivian_api_from_entry
 
 _LOGGER = logging.getLogger(__name__)
@@ -70,6 +85,25 @@ OPTIONS_SCHEMA = vol.Schema(
         vol.Optional(CONF_ZONE): EntitySelector(
             EntitySelectorConfig(domain=ZONE_DOMAIN, multiple=True)
         ),
+        vol.Optional(
+            CONF_UPDATE_COALESCE_WINDOW, default=DEFAULT_UPDATE_COALESCE_WINDOW
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=5,
+                step=0.05,
+                unit_of_measurement="s",
+                mode=NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(CONF_RECORD_FRAMES, default=False): BooleanSelector(),
+        vol.Optional(CONF_MEMORY_POLICY, default=MEMORY_POLICY_WARN): SelectSelector(
+            SelectSelectorConfig(
+                options=[MEMORY_POLICY_WARN, MEMORY_POLICY_TRIM],
+                mode=SelectSelectorMode.DROPDOWN,
+                translation_key="memory_policy",
+            )
+        ),
     }
 )
 
@@ -77,21 +111,44 @@ OPTIONS_SCHEMA = vol.Schema(
 async def validate_vehicle_control(
     handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
 ) -> dict[str, Any]:
-    """Validate vehicle control."""
+    """Validate vehicle control.
+
+    A loaded entry's client and user data are reused; otherwise a client is
+    created for the flow and closed after.
+    """
     hass = handler.parent_handler.hass
     entry = handler.parent_handler.config_entry
+    if entry_data := hass.data.get(DOMAIN, {}).get(entry.entry_id):
+        user: UserCoordinator = entry_data[ATTR_COORDINATOR][ATTR_USER]
+        return await _async_apply_vehicle_control(handler, user_input, user)
+
     api = get_rivian_api_from_entry(hass, entry)
     user = UserCoordinator(
         hass=hass, config_entry=entry, client=api, include_phones=True
     )
-    await user.async_refresh()
-    user_id = user.data["id"]
+    try:
+        await user.async_refresh()
+        return await _async_apply_vehicle_control(handler, user_input, user)
+    finally:
+        await api.close()
+
+
+async def _async_apply_vehicle_control(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any], user: UserCoordinator
+) -> dict[str, Any]:
+    """Enroll and disenroll the phone key to match the vehicles to control.
+
+    Nothing is changed if a vehicle to enroll has no free phone key slot. If
+    a vehicle fails, the changes that succeeded are saved and the form is
+    shown again with an error.
+    """
+    hass = handler.parent_handler.hass
+    entry = handler.parent_handler.config_entry
     vehicles = user.get_vehicles()
     vehicle_control = user_input.get(CONF_VEHICLE_CONTROL, [])
     device_registry = dr.async_get(hass)
 
     if vehicle_control and not user.data.get("registrationChannels"):
-        await api.close()
         raise SchemaFlowError("2fa_missing")
 
     if vehicle_control and not entry.options.get("private_key"):
@@ -105,62 +162,98 @@ async def validate_vehicle_control(
     else:
         vehicle_identity = {}
 
-    if vehicle_control:
-        control_vehicles = {
-            identifier[1]: device_id
-            for device_id in vehicle_control
-            if (device := device_registry.async_get(device_id))
-            for identifier in device.identifiers
-            if identifier[0] == DOMAIN and identifier[1] in vehicles
-        }
-    else:
-        control_vehicles = {}
+    control_vehicles = {
+        identifier[1]: device_id
+        for device_id in vehicle_control
+        if (device := device_registry.async_get(device_id))
+        for identifier in device.identifiers
+        if identifier[0] == DOMAIN and identifier[1] in vehicles
+    }
 
-    for vehicle_id, vehicle in vehicles.items():
-        vehicle_name = vehicle["name"]
+    phone_keys = await _async_phone_keys(
+        handler,
+        user,
+        [
+            vehicle_id
+            for vehicle_id in control_vehicles
+            if vehicle_id not in vehicle_identity
+        ],
+    )
+    plan = EnrollmentPlan.create(
+        vehicles, control_vehicles, vehicle_identity, phone_keys
+    )
+    if plan.full:
+        _LOGGER.error(
+            "Unable to enable control for %s: phone limit reached",
+            ", ".join(vehicles[vehicle_id]["name"] for vehicle_id in plan.full),
+        )
+        raise SchemaFlowError("phone_limit")
+    if not plan:
+        return user_input
+    results = await PhoneEnrollment(user.api, vehicles).async_apply(
+        plan,
+        user_id=user.data["id"],
+        public_key=public_key,
+        device_name=hass.config.location_name,
+    )
+    # the enrolled phones changed
+    await user.async_refresh()
+    if all(result.success for result in results):
+        return user_input
 
-        # check if phone needs to be enrolled
-        if vehicle_id in control_vehicles and vehicle_id not in vehicle_identity:
-            success = False
-            try:
-                if not (
-                    success := await api.enroll_phone(
-                        user_id=user_id,
-                        vehicle_id=vehicle["id"],
-                        device_type="HA",
-                        device_name=hass.config.location_name,
-                        public_key=public_key,
-                    )
-                ):
-                    _LOGGER.warning("Unable to enable control for %s", vehicle_name)
-            except RivianPhoneLimitReachedError as err:
-                _LOGGER.error(
-                    "Unable to enable control for %s: phone limit reached", vehicle_name
-                )
-                await api.close()
-                raise SchemaFlowError("phone_limit") from err
-            except Exception as ex:  # pylint: disable=broad-except
-                _LOGGER.error("Unable to enable control for %s: %s", vehicle_name, ex)
-            if not success:
-                user_input[CONF_VEHICLE_CONTROL] = [
-                    vehicle
-                    for vehicle in user_input[CONF_VEHICLE_CONTROL]
-                    if vehicle != control_vehicles[vehicle_id]
-                ]
-
-        # check if phone needs to be disenrolled
-        elif vehicle_id not in control_vehicles and vehicle_id in vehicle_identity:
-            success = False
-            try:
-                identity_id = vehicle_identity[vehicle_id]
-                if not (success := await api.disenroll_phone(identity_id=identity_id)):
-                    _LOGGER.warning("Unable to disable control for %s", vehicle_name)
-            except Exception as ex:  # pylint: disable=broad-except
-                _LOGGER.error("Unable to disable control for %s: %s", vehicle_name, ex)
-            # should we do something else if unable to disenroll?
-
-    await api.close()
-    return user_input
+    failed = {
+        plan.enroll[result.vehicle_id]
+        for result in results
+        if result.action == ENROLL and not result.success
+    }
+    user_input[CONF_VEHICLE_CONTROL] = [
+        device_id for device_id in vehicle_control if device_id not in failed
+    ]
+    # keep the key and the vehicles that did change, then show the form again
+    applied = {
+        key: user_input[key]
+        for key in ("public_key", "private_key", CONF_VEHICLE_CONTROL)
+        if key in user_input
+    }
+    handler.options.update(applied)
+    hass.config_entries.async_update_entry(entry, options=entry.options | applied)
+    if any(result.error == "phone_limit" for result in results):
+        raise SchemaFlowError("phone_limit")
+    raise SchemaFlowError("enrollment_failed")
+
+
+async def _async_phone_keys(
+    handler: SchemaCommonFlowHandler, user: UserCoordinator, vehicle_ids: list[str]
+) -> dict[str, int]:
+    """Return the current number of phone keys of vehicles, by vehicle ID.
+
+    Vehicles whose drivers and keys could not be fetched are left out.
+    """
+    hass = handler.parent_handler.hass
+    entry = handler.parent_handler.config_entry
+    coordinators = (
+        hass.data.get(DOMAIN, {})
+        .get(entry.entry_id, {})
+        .get(ATTR_COORDINATOR, {})
+        .get(ATTR_VEHICLE, {})
+    )
+
+    async def _async_count(vehicle_id: str) -> int | None:
+        if coordinator := coordinators.get(vehicle_id):
+            drivers = coordinator.drivers_coordinator
+        else:
+            drivers = DriverKeyCoordinator(
+                hass=hass, config_entry=entry, client=user.api, vehicle_id=vehicle_id
+            )
+        await drivers.async_refresh()
+        return drivers.phone_keys()
+
+    counts = await asyncio.gather(*(_async_count(vid) for vid in vehicle_ids))
+    return {
+        vehicle_id: count
+        for vehicle_id, count in zip(vehicle_ids, counts)
+        if count is not None
+    }
 
 
 OPTIONS_FLOW = {
@@ -30,23 +30,43 @@ ISSUE_URL = "https://github.com/bretterer/home-assistant-rivian/issues"
 
 # Attributes
 ATTR_API = "api"
+ATTR_CONFIG = "config"
+ATTR_CONTROL_ENTITIES = "control_entities"
 ATTR_COORDINATOR = "coordinator"
+ATTR_FRAME_RECORDER = "frame_recorder"
+ATTR_MEMORY_WATCHDOG = "memory_watchdog"
+ATTR_METRICS = "metrics"
+ATTR_STARTUP_TIMINGS = "startup_timings"
+ATTR_SUBSCRIPTION = "subscription"
 ATTR_USER = "user"
 ATTR_VEHICLE = "vehicle"
 ATTR_WALLBOX = "wallbox"
 
+# Integration data, shared by every config entry
+DATA_IMAGE_CACHE = f"{DOMAIN}_image_cache"
+DATA_RELEASE_NOTES = f"{DOMAIN}_release_notes"
+
 # Config properties
 CONF_ACCESS_TOKEN = "access_token"
+CONF_MEMORY_POLICY = "memory_policy"
 CONF_OTP = "otp"
+CONF_RECORD_FRAMES = "record_frames"
 CONF_REFRESH_TOKEN = "refresh_token"
+CONF_UPDATE_COALESCE_WINDOW = "update_coalesce_window"
 CONF_USER_SESSION_TOKEN = "user_session_token"
 CONF_VEHICLE_CONTROL = "vehicle_control"
 CONF_VEHICLE_IMAGE_STYLE = "vehicle_image_style"
 
+DEFAULT_UPDATE_COALESCE_WINDOW = 0.25  # seconds
+UNLOAD_TIMEOUT = 10  # seconds
+
 IMAGE_STYLE_CEL = "cel"
 IMAGE_STYLE_PHOTO = "photo"
 IMAGE_STYLE_NONE = "none"
 
+MEMORY_POLICY_TRIM = "trim"
+MEMORY_POLICY_WARN = "warn"
+
 LOCK_STATE_ENTITIES = {
     "closureFrunkLocked",
     "closureLiftgateLocked",
@@ -78,6 +98,26 @@ CLOSURE_STATE_ENTITIES = {
 
 INVALID_SENSOR_STATES = {"fault", "signal_not_available", "undefined"}
 
+# Vehicle state update priorities: critical changes are published immediately
+# and fire an event, deferred fields may wait longer than the coalesce window
+CRITICAL_STATE_FIELDS: Final[set[str]] = {
+    "alarmSoundStatus",
+    "batteryHvThermalEvent",
+    "batteryHvThermalEventPropagation",
+    *CLOSURE_STATE_ENTITIES,
+    *DOOR_STATE_ENTITIES,
+    *LOCK_STATE_ENTITIES,
+}
+DEFERRED_STATE_FIELDS: Final[set[str]] = {
+    "gnssAltitude",
+    "gnssBearing",
+    "gnssLocation",
+    "gnssSpeed",
+}
+DEFERRED_UPDATE_WINDOW = 2  # seconds
+
+EVENT_CRITICAL_STATE_CHANGED = f"{DOMAIN}_critical_state_changed"
+
 
 DRIVE_MODE_MAP = {
     "everyday": "All-Purpose",
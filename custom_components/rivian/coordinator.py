@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import asyncio
-from collections.abc import Coroutine
-from datetime import datetime, timedelta, timezone
+from collections.abc import Callable, Mapping
+from datetime import timedelta
 import logging
+from time import monotonic
 from typing import Any, Generic, TypeVar
 
 from aiohttp import ClientResponse
@@ -19,23 +20,48 @@ from rivian.exceptions import (
 )
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .commands import CommandTracer
 from .const import (
     ATTR_COORDINATOR,
     ATTR_USER,
     ATTR_VEHICLE,
     CHARGING_API_FIELDS,
+    CONF_UPDATE_COALESCE_WINDOW,
+    CRITICAL_STATE_FIELDS,
+    DEFAULT_UPDATE_COALESCE_WINDOW,
+    DEFERRED_STATE_FIELDS,
+    DEFERRED_UPDATE_WINDOW,
     DOMAIN,
-    INVALID_SENSOR_STATES,
-    VEHICLE_STATE_API_FIELDS,
+    EVENT_CRITICAL_STATE_CHANGED,
 )
-from .helpers import redact
+from .frame_recorder import FrameRecorder
+from .helpers import is_invalid_state, is_older, redact
+from .image_cache import ImageCache
+from .metrics import (
+    ERROR_COUNT,
+    ERRORS,
+    FAN_OUT,
+    LISTENER_CALLS,
+    MERGE_TIME,
+    POLLING_INTERVAL,
+    QUEUE_DEPTH,
+    RATE_LIMITS,
+    REQUEST_LATENCY,
+    TOKEN_REFRESHES,
+    Metrics,
+    MetricsRegistry,
+)
+from .subscription import VehicleSubscriptionManager
+from .transport import PollingTransport, VehicleTransport, WebSocketTransport
+from .vehicle_state import VehicleState
 
 _LOGGER = logging.getLogger(__name__)
-T = TypeVar("T", bound=dict[str, Any] | list[dict[str, Any]])
+T = TypeVar("T", bound=Mapping[str, Any] | list[dict[str, Any]])
 
 
 class RivianDataUpdateCoordinator(DataUpdateCoordinator[T], Generic[T], ABC):
@@ -62,6 +88,9 @@ class RivianDataUpdateCoordinator(DataUpdateCoordinator[T], Generic[T], ABC):
             always_update=False,
         )
         self.api = client
+        self.metrics = Metrics()
+        self.metrics.set(POLLING_INTERVAL, self._update_interval_seconds or None)
+        self.metrics.collect(ERROR_COUNT, lambda: self._error_count)
 
     def _set_update_interval(self, seconds: float | None = None) -> None:
         """Set the update interval or calculate new one based on errors."""
@@ -75,12 +104,14 @@ class RivianDataUpdateCoordinator(DataUpdateCoordinator[T], Generic[T], ABC):
                 self.config_entry.async_create_task(self.hass, task)
             else:
                 self._schedule_refresh()
+            self.metrics.set(POLLING_INTERVAL, seconds)
             _LOGGER.info("Polling set to %s seconds", seconds)
 
     async def _async_update_data(self) -> T:
         """Get the latest data from Rivian."""
         try:
-            resp = await self._fetch_data()
+            with self.metrics.time(REQUEST_LATENCY):
+                resp = await self._fetch_data()
             if resp.status == 200:
                 data = await resp.json()
                 _LOGGER.debug(
@@ -96,10 +127,12 @@ class RivianDataUpdateCoordinator(DataUpdateCoordinator[T], Generic[T], ABC):
 
         except RivianExpiredTokenError:
             _LOGGER.info("Rivian token expired, refreshing")
+            self.metrics.increment(TOKEN_REFRESHES)
             await self.api.create_csrf_token()
             return await self._async_update_data()
         except RivianApiRateLimitError as err:
             _LOGGER.error("Rate limit being enforced: %s", err, exc_info=1)
+            self.metrics.increment(RATE_LIMITS)
             self._set_update_interval()
         except RivianUnauthenticated as err:
             await self.api.close()
@@ -112,6 +145,7 @@ class RivianDataUpdateCoordinator(DataUpdateCoordinator[T], Generic[T], ABC):
             )
 
         self._error_count += 1
+        self.metrics.increment(ERRORS)
         if self.data:
             return self.data
         raise UpdateFailed("Error communicating with API")
@@ -190,6 +224,16 @@ class DriverKeyCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
             None,
         )
 
+    def phone_keys(self) -> int | None:
+        """Return the number of phone keys of the vehicle, if known."""
+        if not self.data:
+            return None
+        return sum(
+            len(user["devices"])
+            for user in self.data.get("invitedUsers", [])
+            if user["__typename"] == "ProvisionedUser"
+        )
+
 
 class UserCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
     """User data update coordinator for Rivian."""
@@ -245,11 +289,14 @@ class UserCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
         }
 
 
-class VehicleCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
+class VehicleCoordinator(RivianDataUpdateCoordinator[VehicleState]):
     """Vehicle data update coordinator for Rivian."""
 
     key = "vehicleState"
     _update_interval_seconds = 15 * 60  # 15 minutes
+    _initial_timeout = 10
+    _transport_check_interval = timedelta(seconds=15)
+    _failover_seconds = 60
 
     def __init__(
         self,
@@ -257,10 +304,29 @@ class VehicleCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
         config_entry: ConfigEntry,
         client: Rivian,
         vehicle_id: str,
+        subscriptions: VehicleSubscriptionManager,
+        recorder: FrameRecorder | None = None,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(hass=hass, config_entry=config_entry, client=client)
         self.vehicle_id = vehicle_id
+        self.commands = CommandTracer(hass, vehicle_id, metrics or MetricsRegistry())
+        self.subscriptions = subscriptions
+        self.recorder = recorder
+        self.websocket = WebSocketTransport(self, subscriptions)
+        self.polling = PollingTransport(self)
+        self.transport: VehicleTransport = self.websocket
+        self._websocket_unhealthy_since: float | None = None
+        self._unsub_transport_check: CALLBACK_TYPE | None = None
+        self.coalesce_window: float = config_entry.options.get(
+            CONF_UPDATE_COALESCE_WINDOW, DEFAULT_UPDATE_COALESCE_WINDOW
+        )
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._flush_due: float | None = None
+        self.stale_records = 0
+        self.changed_fields: set[str] = set()
         self.charging_coordinator = ChargingCoordinator(
             hass=hass, config_entry=config_entry, client=client, vehicle_id=vehicle_id
         )
@@ -268,135 +334,310 @@ class VehicleCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
             hass=hass, config_entry=config_entry, client=client, vehicle_id=vehicle_id
         )
         self._initial = asyncio.Event()
-        self._unsub_handler: Coroutine[None, None, None] | None = None
         self._awake = asyncio.Event()
+        self.metrics.collect(QUEUE_DEPTH, lambda: len(self._pending))
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> VehicleState:
         """Get the latest data from Rivian."""
-        if not self.data or not self.last_update_success:
-            await self._unsubscribe()
-            self._unsub_handler = await self.api.subscribe_for_vehicle_updates(
-                vehicle_id=self.vehicle_id,
-                properties=VEHICLE_STATE_API_FIELDS,
-                callback=self._process_new_data,
+        if not self._unsub_transport_check:
+            self._unsub_transport_check = async_track_time_interval(
+                self.hass,
+                self._async_check_transport,
+                self._transport_check_interval,
+                name=f"Rivian {self.vehicle_id} transport check",
             )
 
-            try:
-                await asyncio.wait_for(self._initial.wait(), 1)
-            except asyncio.TimeoutError as err:
+        if self.data:
+            # the subscription supervisor recovers stalled subscriptions and
+            # the polling transport covers longer outages, so keep serving the
+            # current state instead of failing the update
+            if not self.subscriptions.is_subscribed(self.vehicle_id):
+                self.subscriptions.async_request_resubscribe(self.vehicle_id)
+            return self.data
+
+        if not self.websocket.running:
+            self._initial.clear()
+            await self.websocket.async_start()
+
+        try:
+            await asyncio.wait_for(self._initial.wait(), self._initial_timeout)
+        except asyncio.TimeoutError as err:
+            if not await self.polling.async_poll():
                 raise UpdateFailed from err
+            await self._async_set_transport(self.polling)
 
         return self.data
 
     async def _fetch_data(self) -> ClientResponse:
         """Fetch the data."""
-        raise NotImplementedError("Polling VehicleState no longer allowed")
+        raise NotImplementedError("Vehicle state is provided by the transports")
 
     async def async_shutdown(self) -> None:
-        await self._unsubscribe(True)
+        if self._unsub_transport_check:
+            self._unsub_transport_check()
+            self._unsub_transport_check = None
+        self._cancel_flush()
+        self._pending.clear()
+        self.commands.async_cancel()
+        await asyncio.gather(self.websocket.async_stop(), self.polling.async_stop())
+        self._initial.clear()
         return await super().async_shutdown()
 
+    async def _async_check_transport(self, *_: Any) -> None:
+        """Fail over to polling when the websocket is down and fail back after."""
+        if self.websocket.healthy:
+            self._websocket_unhealthy_since = None
+            await self._async_set_transport(self.websocket)
+            return
+        now = monotonic()
+        if self._websocket_unhealthy_since is None:
+            self._websocket_unhealthy_since = now
+        elif now - self._websocket_unhealthy_since >= self._failover_seconds:
+            await self._async_set_transport(self.polling)
+
+    async def _async_set_transport(self, transport: VehicleTransport) -> None:
+        """Make a transport the active source of vehicle state."""
+        if (previous := self.transport) is transport:
+            return
+        _LOGGER.info(
+            "Vehicle state for %s switched from %s to %s",
+            self.vehicle_id,
+            previous.name,
+            transport.name,
+        )
+        self.transport = transport
+        if transport is self.websocket:
+            self.metrics.set(POLLING_INTERVAL, self._update_interval_seconds)
+        # the websocket keeps running so the supervisor can recover it
+        if previous is not self.websocket:
+            await previous.async_stop()
+        if not transport.running:
+            await transport.async_start()
+
+    def transport_diagnostics(self) -> dict[str, Any]:
+        """Return diagnostics for the vehicle state transports."""
+        return {
+            "active": self.transport.name,
+            self.websocket.name: self.websocket.diagnostics(),
+            self.polling.name: self.polling.diagnostics(),
+        }
+
     @callback
     def _process_new_data(self, data: dict[str, Any]) -> None:
         """Process new data."""
+        if self.recorder:
+            self.recorder.record(self.vehicle_id, data)
         if not (payload := data.get("payload")) or not (pdata := payload.get("data")):
             _LOGGER.error("Received an unknown subscription update: %s", data)
             self._error_count += 1
+            self.metrics.increment(ERRORS)
             if not self._initial.is_set() or self._error_count > 5:
-                task = self._unsubscribe()
-                self.config_entry.async_create_task(self.hass, task, eager_start=True)
+                self.subscriptions.async_request_resubscribe(self.vehicle_id)
             return
-        vehicle_info = self._build_vehicle_info_dict(pdata.get(self.key, {}))
-        self.async_set_updated_data(vehicle_info)
         self._error_count = 0
-        self._initial.set()
+        if not (frame := self._drop_stale(pdata.get(self.key) or {})):
+            return
+        self.commands.async_observe(frame, self.transport.name)
+        if not self._initial.is_set():
+            self._publish(frame)
+            return
+        if critical := self._critical_changes(frame):
+            # bypass coalescing, flushing anything pending along with it
+            self._coalesce(frame)
+            self._async_flush_pending()
+            for field, value, previous in critical:
+                self.hass.bus.async_fire(
+                    EVENT_CRITICAL_STATE_CHANGED,
+                    {
+                        "vehicle_id": self.vehicle_id,
+                        "field": field,
+                        "value": value,
+                        "previous_value": previous,
+                    },
+                )
+            return
+        if not self.coalesce_window:
+            self._publish(frame)
+            return
+        self._coalesce(frame)
+        if DEFERRED_STATE_FIELDS.issuperset(frame):
+            delay = max(self.coalesce_window, DEFERRED_UPDATE_WINDOW)
+        else:
+            delay = self.coalesce_window
+        self._schedule_flush(delay)
+
+    def _drop_stale(self, frame: dict[str, Any]) -> dict[str, Any]:
+        """Drop field records that are older than, or repeat, the current state."""
+        if not (data := self.data):
+            return frame
+        fresh = {}
+        for key, record in frame.items():
+            if not record:
+                continue
+            if (current := data.get(key)) is not None and current.is_stale(record):
+                self.stale_records += 1
+                continue
+            fresh[key] = record
+        return fresh
+
+    def _critical_changes(self, frame: dict[str, Any]) -> list[tuple[str, Any, Any]]:
+        """Return the critical fields changed by a frame.
+
+        Invalid readings are ignored, as they never replace the stored value.
+        """
+        return [
+            (key, value, previous)
+            for key in CRITICAL_STATE_FIELDS.intersection(frame)
+            if (record := frame[key]) and "value" in record
+            if not is_invalid_state(value := record["value"])
+            and value != (previous := self.get(key))
+        ]
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Schedule publishing the pending update, keeping the earliest deadline."""
+        due = self.hass.loop.time() + delay
+        if self._flush_due is not None and self._flush_due <= due:
+            return
+        self._cancel_flush()
+        self._flush_due = due
+        self._unsub_flush = async_call_later(
+            self.hass, delay, self._async_flush_pending
+        )
 
-    def _build_vehicle_info_dict(self, vijson: dict[str, Any]) -> dict[str, Any]:
-        """Take the json output of vehicle_info and build a dictionary."""
-        items = {
-            k: v | ({"history": {v["value"]}} if "value" in v else {})
-            for k, v in vijson.items()
-            if v
-        }
+    def _cancel_flush(self) -> None:
+        """Cancel a scheduled publish of the pending update."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._flush_due = None
+
+    def _coalesce(self, frame: dict[str, Any]) -> None:
+        """Merge a frame into the pending update, keeping the latest per field."""
+        pending = self._pending
+        for key, record in frame.items():
+            if not record:
+                continue
+            if (current := pending.get(key)) is None:
+                pending[key] = record
+                continue
+            older, newer = (
+                (record, current)
+                if is_older(record.get("timeStamp", ""), current.get("timeStamp", ""))
+                else (current, record)
+            )
+            if "value" in older:
+                # keep superseded values in the field history
+                history = older.get("history", set()) | {older["value"]}
+                newer = newer | {"history": newer.get("history", set()) | history}
+            pending[key] = newer
+
+    @callback
+    def _async_flush_pending(self, _: Any = None) -> None:
+        """Publish the pending coalesced update."""
+        self._cancel_flush()
+        if pending := self._pending:
+            self._pending = {}
+            self._publish(pending)
 
-        if items:
-            _LOGGER.debug("Vehicle %s updated: %s", self.vehicle_id, redact(items))
+    @callback
+    def _publish(self, frame: dict[str, Any]) -> None:
+        """Merge a frame into the vehicle state and notify listeners."""
+        with self.metrics.time(MERGE_TIME):
+            vehicle_info = self._build_vehicle_info_dict(frame)
+        if self.changed_fields or not self._initial.is_set():
+            self.metrics.increment(LISTENER_CALLS, len(self._listeners))
+            with self.metrics.time(FAN_OUT):
+                self.async_set_updated_data(vehicle_info)
+        self._initial.set()
+
+    def _build_vehicle_info_dict(self, vijson: dict[str, Any]) -> VehicleState:
+        """Merge the json output of vehicle_info into the vehicle state in place.
+
+        Only the records of fields present in the frame are touched; invalid
+        values keep the previous record and everything else is reused as is.
+        """
+        data = self.data if self.data is not None else VehicleState()
+        changed = data.merge(vijson)
+        self.changed_fields = changed
+
+        if changed and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Vehicle %s updated: %s",
+                self.vehicle_id,
+                redact({key: data[key] for key in changed}),
+            )
 
-        if power_state := items.get("powerState"):
-            if power_state.get("value") == "sleep":
+        if "powerState" in changed:
+            if data["powerState"].get("value") == "sleep":
                 self._awake.clear()
             else:
                 self._awake.set()
-        if charger_status := items.get("chargerStatus"):
+        if "chargerStatus" in changed:
             self.charging_coordinator.adjust_update_interval(
-                is_plugged_in=charger_status.get("value") != "chrgr_sts_not_connected"
+                is_plugged_in=data["chargerStatus"].get("value")
+                != "chrgr_sts_not_connected"
             )
 
-        if not (prev_items := (self.data or {})):
-            return items
-        if not items or prev_items == items:
-            return prev_items
-
-        new_data = prev_items | items
-        for key in filter(lambda i: i != "gnssLocation", items):
-            value = items[key].get("value")
-            if str(value).lower() in INVALID_SENSOR_STATES and key in prev_items:
-                new_data[key] = prev_items[key]
-            new_data[key]["history"] |= prev_items.get(key, {}).get("history", set())
-
-        return new_data
-
-    async def _unsubscribe(self, close_monitor: bool = False):
-        """Unsubscribe."""
-        if unsub := self._unsub_handler:
-            await unsub()
-            self._unsub_handler = None
-            self._initial.clear()
-        if close_monitor and (monitor := self.api._ws_monitor):
-            await monitor.close()
+        return data
 
     def get(self, key: str) -> Any | None:
         """Get a data value by key."""
-        if entity := self.data.get(key, {}):
-            return entity.get("value")
-        return None
+        return self.data.value(key) if self.data is not None else None
 
     async def send_vehicle_command(
         self, command: VehicleCommand, params: dict[str, Any] | None = None
     ) -> None:
-        """Send a command to the vehicle."""
-        if self.get("powerState") == "sleep" and command != VehicleCommand.WAKE_VEHICLE:
-            await self.send_vehicle_command(VehicleCommand.WAKE_VEHICLE)
-            try:
-                await asyncio.wait_for(self._awake.wait(), 30)
-            except asyncio.TimeoutError:
-                pass  # didn't wake-up in time, but we'll try command anyway
-
-        entry_data = self.hass.data[DOMAIN][self.config_entry.entry_id]
-        vehicle = entry_data[ATTR_VEHICLE][self.vehicle_id]
-        user: UserCoordinator = entry_data[ATTR_COORDINATOR][ATTR_USER]
-        phone_info = user.get_enrolled_phone_data(
-            self.config_entry.options.get("public_key")
-        )
+        """Send a command to the vehicle, tracing it until it is confirmed."""
+        trace = self.commands.start(command)
+        try:
+            if (
+                self.get("powerState") == "sleep"
+                and command != VehicleCommand.WAKE_VEHICLE
+            ):
+                with trace.phase("wake"):
+                    await self.send_vehicle_command(VehicleCommand.WAKE_VEHICLE)
+                    try:
+                        await asyncio.wait_for(self._awake.wait(), 30)
+                    except asyncio.TimeoutError:
+                        pass  # didn't wake-up in time, but we'll try command anyway
+
+            with trace.phase("prepare"):
+                entry_data = self.hass.data[DOMAIN][self.config_entry.entry_id]
+                vehicle = entry_data[ATTR_VEHICLE][self.vehicle_id]
+                user: UserCoordinator = entry_data[ATTR_COORDINATOR][ATTR_USER]
+                phone_info = user.get_enrolled_phone_data(
+                    self.config_entry.options.get("public_key")
+                )
 
-        if response := await self.api.send_vehicle_command(
-            command=command,
-            vehicle_id=self.vehicle_id,
-            phone_id=phone_info[0],
-            identity_id=vehicle["phone_identity_id"],
-            vehicle_key=vehicle["public_key"],
-            private_key=self.config_entry.options.get("private_key"),
-            params=params,
-        ):
+            with trace.phase("send"):
+                response = await self.api.send_vehicle_command(
+                    command=command,
+                    vehicle_id=self.vehicle_id,
+                    phone_id=phone_info[0],
+                    identity_id=vehicle["phone_identity_id"],
+                    vehicle_key=vehicle["public_key"],
+                    private_key=self.config_entry.options.get("private_key"),
+                    params=params,
+                )
+        except BaseException:
+            self.commands.async_failed(trace)
+            raise
+        self.commands.async_acknowledged(trace, response)
+        if response:
             _LOGGER.debug("%s response was: %s", command, response)
 
 
-class VehicleImageCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
-    """Vehicle image data update coordinator for Rivian."""
+class VehicleImageCoordinator(RivianDataUpdateCoordinator[list[dict[str, Any]]]):
+    """Vehicle image data update coordinator for Rivian.
+
+    Only the catalog entries of `size` are retained, and only the images
+    `wanted`, those of enabled entities, are downloaded into the image cache.
+    The first refresh takes the catalog from the cache when it has one.
+    """
 
     key = "getVehicleMobileImages"
+    size = "large"
     _update_interval_seconds = 0  # disabled
-    _last_updated: datetime | None = None
 
     def __init__(
         self,
@@ -404,18 +645,60 @@ class VehicleImageCoordinator(RivianDataUpdateCoordinator[dict[str, Any]]):
         config_entry: ConfigEntry,
         client: Rivian,
         version: str,
+        cache: ImageCache,
+        wanted: Callable[[dict[str, Any]], bool] | None = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(hass=hass, config_entry=config_entry, client=client)
         self.version = version
+        self.cache = cache
+        self.wanted = wanted or (lambda image: True)
+
+    async def _async_update_data(self) -> list[dict[str, Any]]:
+        """Get the image catalog and cache the wanted images."""
+        entry_id = self.config_entry.entry_id
+        if self.data is None and (
+            catalog := self.cache.catalog(entry_id, self.version)
+        ):
+            images = catalog["images"]
+        else:
+            if (images := await super()._async_update_data()) is self.data:
+                return images  # the request failed
+            images = [image for image in images if image["size"] == self.size]
+            self.cache.async_set_catalog(entry_id, self.version, images)
+        await asyncio.gather(
+            *(
+                self.cache.async_fetch(image["url"])
+                for image in images
+                if self.wanted(image)
+            )
+        )
+        return images
+
+    async def async_revalidate(self) -> None:
+        """Refresh a stale catalog, then revalidate the stale wanted images."""
+        catalog = self.cache.catalog(self.config_entry.entry_id, self.version)
+        if catalog is None or self.cache.is_stale(catalog["fetched"]):
+            await self.async_refresh()
+        stale = [
+            url
+            for image in self.data or []
+            if self.wanted(image)
+            and (entry := self.cache.index.get(url := image["url"]))
+            and self.cache.is_stale(entry["fetched"])
+        ]
+        changed = await asyncio.gather(
+            *(self.cache.async_revalidate(url) for url in stale)
+        )
+        if any(changed):
+            self.async_update_listeners()
+        await self.cache.async_prune()
 
     async def _fetch_data(self) -> ClientResponse:
         """Fetch the data."""
-        data = await self.api.get_vehicle_images(
+        return await self.api.get_vehicle_images(
             resolution="@3x", vehicle_version=self.version
         )
-        self._last_updated = datetime.now(timezone.utc)
-        return data
 
 
 class WallboxCoordinator(RivianDataUpdateCoordinator[list[dict[str, Any]]]):
@@ -14,12 +14,13 @@ from homeassistant.components.cover import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import ATTR_COORDINATOR, ATTR_VEHICLE, DOMAIN
 from .coordinator import VehicleCoordinator
 from .data_classes import RivianCoverEntityDescription
-from .entity import RivianVehicleControlEntity
+from .entity import RivianVehicleControlEntity, async_add_vehicle_control_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -107,18 +108,19 @@ async def async_setup_entry(
 ) -> None:
     """Set up the cover entities."""
     data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
-    vehicles: dict[str, dict[str, Any]] = data[ATTR_VEHICLE]
     coordinators: dict[str, VehicleCoordinator] = data[ATTR_COORDINATOR][ATTR_VEHICLE]
 
-    entities = [
-        RivianCoverEntity(coordinators[vehicle_id], entry, description, vehicle)
-        for vehicle_id, vehicle in vehicles.items()
-        if vehicle.get("phone_identity_id")
-        for feature, descriptions in COVERS.items()
-        if feature is None or feature in (vehicle.get("supported_features", []))
-        for description in descriptions
-    ]
-    async_add_entities(entities)
+    def _entities(vehicle_id: str, vehicle: dict[str, Any]) -> list[Entity]:
+        if not vehicle.get("phone_identity_id"):
+            return []
+        return [
+            RivianCoverEntity(coordinators[vehicle_id], entry, description, vehicle)
+            for feature, descriptions in COVERS.items()
+            if feature is None or feature in (vehicle.get("supported_features", []))
+            for description in descriptions
+        ]
+
+    async_add_vehicle_control_entities(hass, entry, async_add_entities, _entities)
 
 
 class RivianCoverEntity(RivianVehicleControlEntity, CoverEntity):
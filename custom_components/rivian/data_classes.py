@@ -18,6 +18,7 @@ from homeassistant.helpers.entity import EntityDescription
 
 if TYPE_CHECKING:
     from .coordinator import VehicleCoordinator
+    from .metrics import ScopeMetrics
 
 
 @dataclass(kw_only=True)
@@ -64,6 +65,14 @@ class RivianLockEntityDescription(LockEntityDescription):
     unlock: Callable[[VehicleCoordinator], Awaitable[None]]
 
 
+@dataclass(kw_only=True)
+class RivianMetricSensorEntityDescription(SensorEntityDescription):
+    """Rivian metric sensor entity description."""
+
+    value_fn: Callable[[ScopeMetrics], Any]
+    attributes_fn: Callable[[ScopeMetrics], dict[str, Any]] | None = None
+
+
 @dataclass(kw_only=True)
 class RivianNumberEntityDescription(NumberEntityDescription):
     """Rivian number entity description."""
@@ -52,6 +52,7 @@ class RivianDeviceEntity(RivianVehicleEntity, TrackerEntity):
         super().__init__(coordinator, config_entry, description, vehicle)
         self._attribute = "gnssLocation"
         self._tracker_data = coordinator.data[self._attribute]
+        self._last_update = self._tracker_data.get("timeStamp")
 
     @property
     def force_update(self) -> bool:
@@ -81,16 +82,18 @@ class RivianDeviceEntity(RivianVehicleEntity, TrackerEntity):
     def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes of the device."""
         return {
-            "last_update": self._tracker_data["timeStamp"],
+            "last_update": self._last_update,
         }
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Respond to a DataUpdateCoordinator update."""
         entity = self.coordinator.data[self._attribute]
+        # records are updated in place, so compare against the last timestamp seen
         try:
-            if entity["timeStamp"] != self._tracker_data["timeStamp"]:
+            if entity["timeStamp"] != self._last_update:
                 self._tracker_data = entity
+                self._last_update = entity["timeStamp"]
                 self.async_write_ha_state()
         except Exception:
             self._tracker_data = entity
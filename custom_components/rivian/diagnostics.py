@@ -7,16 +7,30 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import ATTR_COORDINATOR, ATTR_USER, ATTR_VEHICLE, ATTR_WALLBOX, DOMAIN
+from .const import (
+    ATTR_COORDINATOR,
+    ATTR_FRAME_RECORDER,
+    ATTR_MEMORY_WATCHDOG,
+    ATTR_METRICS,
+    ATTR_STARTUP_TIMINGS,
+    ATTR_SUBSCRIPTION,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    ATTR_WALLBOX,
+    DOMAIN,
+)
 from .coordinator import UserCoordinator, VehicleCoordinator, WallboxCoordinator
 from .helpers import redact
+from .subscription import VehicleSubscriptionManager
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinators = hass.data[DOMAIN][entry.entry_id][ATTR_COORDINATOR]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinators = entry_data[ATTR_COORDINATOR]
+    subscriptions: VehicleSubscriptionManager = entry_data[ATTR_SUBSCRIPTION]
     user_coordinator: UserCoordinator = coordinators[ATTR_USER]
     vehicle_coordinators: dict[str, VehicleCoordinator] = coordinators[ATTR_VEHICLE]
     wallbox_coordinator: WallboxCoordinator = coordinators[ATTR_WALLBOX]
@@ -29,6 +43,22 @@ async def async_get_config_entry_diagnostics(
         "drivers": [
             coor.drivers_coordinator.data for coor in vehicle_coordinators.values()
         ],
+        "transports": [
+            coor.transport_diagnostics() for coor in vehicle_coordinators.values()
+        ],
+        "commands": [
+            coor.commands.diagnostics() for coor in vehicle_coordinators.values()
+        ],
+        "stale_records": [coor.stale_records for coor in vehicle_coordinators.values()],
         "wallbox": wallbox_coordinator.data,
+        "subscriptions": subscriptions.diagnostics(),
+        "frame_recorder": (
+            recorder.diagnostics()
+            if (recorder := entry_data[ATTR_FRAME_RECORDER])
+            else None
+        ),
+        "startup": entry_data[ATTR_STARTUP_TIMINGS].diagnostics(),
+        "metrics": entry_data[ATTR_METRICS].diagnostics(),
+        "memory": entry_data[ATTR_MEMORY_WATCHDOG].diagnostics(),
     }
     return redact(data)
@@ -0,0 +1,171 @@
+"""Phone enrollment for Rivian vehicle control."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from rivian import Rivian
+from rivian.exceptions import RivianPhoneLimitReachedError
+
+_LOGGER = logging.getLogger(__name__)
+
+ENROLL = "enroll"
+DISENROLL = "disenroll"
+
+
+@dataclass
+class EnrollmentPlan:
+    """The vehicles to enroll the phone key for and to disenroll it from."""
+
+    # vehicle ID to the device ID selected for control
+    enroll: dict[str, str] = field(default_factory=dict)
+    # vehicle ID to the identity ID of the enrolled phone
+    disenroll: dict[str, str] = field(default_factory=dict)
+    # vehicle ID to the device ID selected for control, for vehicles without
+    # a free phone key slot
+    full: dict[str, str] = field(default_factory=dict)
+
+    # phone keys a vehicle accepts, as of vehicle software 2023.26.00
+    phone_limit = 4
+
+    @classmethod
+    def create(
+        cls,
+        vehicles: dict[str, dict[str, Any]],
+        control: dict[str, str],
+        enrolled: dict[str, str],
+        phone_keys: dict[str, int] | None = None,
+    ) -> EnrollmentPlan:
+        """Plan the changes from the enrolled vehicles to those to control.
+
+        Vehicles to enroll that already have `phone_limit` phone keys, by
+        vehicle ID in `phone_keys`, are planned as full instead.
+        """
+        phone_keys = phone_keys or {}
+        plan = cls(
+            disenroll={
+                vehicle_id: identity_id
+                for vehicle_id, identity_id in enrolled.items()
+                if vehicle_id in vehicles and vehicle_id not in control
+            }
+        )
+        for vehicle_id, device_id in control.items():
+            if vehicle_id not in vehicles or vehicle_id in enrolled:
+                continue
+            if phone_keys.get(vehicle_id, 0) >= cls.phone_limit:
+                plan.full[vehicle_id] = device_id
+            else:
+                plan.enroll[vehicle_id] = device_id
+        return plan
+
+    def __bool__(self) -> bool:
+        """Return `True` if the plan changes anything."""
+        return bool(self.enroll or self.disenroll)
+
+
+@dataclass
+class EnrollmentResult:
+    """The outcome of enrolling or disenrolling a vehicle."""
+
+    vehicle_id: str
+    action: str
+    success: bool
+    error: str | None = None
+
+
+class PhoneEnrollment:
+    """Apply enrollment plans with a bounded number of concurrent requests."""
+
+    concurrency = 4
+
+    def __init__(self, api: Rivian, vehicles: dict[str, dict[str, Any]]) -> None:
+        """Initialize the enrollment."""
+        self.api = api
+        self.vehicles = vehicles
+
+    async def async_apply(
+        self,
+        plan: EnrollmentPlan,
+        user_id: str,
+        public_key: str,
+        device_name: str,
+    ) -> list[EnrollmentResult]:
+        """Apply a plan and return the result of every vehicle."""
+        return await self._async_gather(
+            *(
+                self._async_enroll(vehicle_id, user_id, public_key, device_name)
+                for vehicle_id in plan.enroll
+            ),
+            *(
+                self._async_disenroll(vehicle_id, identity_id)
+                for vehicle_id, identity_id in plan.disenroll.items()
+            ),
+        )
+
+    async def async_disenroll(
+        self, identities: dict[str, str]
+    ) -> list[EnrollmentResult]:
+        """Disenroll the phone from vehicles, by vehicle ID to identity ID."""
+        return await self._async_gather(
+            *(
+                self._async_disenroll(vehicle_id, identity_id)
+                for vehicle_id, identity_id in identities.items()
+            )
+        )
+
+    async def _async_gather(
+        self, *requests: Awaitable[EnrollmentResult]
+    ) -> list[EnrollmentResult]:
+        """Run requests, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(request: Awaitable[EnrollmentResult]) -> EnrollmentResult:
+            async with semaphore:
+                return await request
+
+        return list(await asyncio.gather(*(_bounded(request) for request in requests)))
+
+    async def _async_enroll(
+        self, vehicle_id: str, user_id: str, public_key: str, device_name: str
+    ) -> EnrollmentResult:
+        """Enroll the phone key for a vehicle."""
+        name = self._name(vehicle_id)
+        try:
+            success = await self.api.enroll_phone(
+                user_id=user_id,
+                vehicle_id=self.vehicles[vehicle_id]["id"],
+                device_type="HA",
+                device_name=device_name,
+                public_key=public_key,
+            )
+        except RivianPhoneLimitReachedError:
+            _LOGGER.error("Unable to enable control for %s: phone limit reached", name)
+            return EnrollmentResult(vehicle_id, ENROLL, False, "phone_limit")
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Unable to enable control for %s: %s", name, ex)
+            return EnrollmentResult(vehicle_id, ENROLL, False, str(ex))
+        if not success:
+            _LOGGER.warning("Unable to enable control for %s", name)
+        return EnrollmentResult(vehicle_id, ENROLL, bool(success))
+
+    async def _async_disenroll(
+        self, vehicle_id: str, identity_id: str
+    ) -> EnrollmentResult:
+        """Disenroll the phone key from a vehicle."""
+        name = self._name(vehicle_id)
+        try:
+            success = await self.api.disenroll_phone(identity_id=identity_id)
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Unable to disable control for %s: %s", name, ex)
+            return EnrollmentResult(vehicle_id, DISENROLL, False, str(ex))
+        if not success:
+            _LOGGER.warning("Unable to disable control for %s", name)
+        return EnrollmentResult(vehicle_id, DISENROLL, bool(success))
+
+    def _name(self, vehicle_id: str) -> str:
+        """Return the name of a vehicle for logging."""
+        return (self.vehicles.get(vehicle_id) or {}).get("name") or vehicle_id
@@ -2,17 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable, Iterable
 import logging
 from typing import Any, TypeVar
 
 from homeassistant.components.zone import in_zone
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ZONE
-from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTR_COORDINATOR, ATTR_USER, DOMAIN
+from .const import (
+    ATTR_CONTROL_ENTITIES,
+    ATTR_COORDINATOR,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    DOMAIN,
+)
 from .coordinator import (
     ChargingCoordinator,
     RivianDataUpdateCoordinator,
@@ -25,6 +34,50 @@ _LOGGER = logging.getLogger(__name__)
 T = TypeVar("T", bound=RivianDataUpdateCoordinator)
 
 
+@callback
+def async_add_vehicle_control_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create: Callable[[str, dict[str, Any]], Iterable[Entity]],
+) -> None:
+    """Add the entities of every vehicle that depend on its vehicle control.
+
+    `create` returns the entities of a vehicle, by vehicle ID and vehicle.
+    They are created again when the vehicle control of the vehicle changes,
+    see `async_replace_vehicle_control_entities`.
+    """
+    data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
+    vehicles: dict[str, dict[str, Any]] = data[ATTR_VEHICLE]
+    added = {
+        vehicle_id: list(create(vehicle_id, vehicle))
+        for vehicle_id, vehicle in vehicles.items()
+    }
+
+    async def _async_replace(vehicle_ids: set[str]) -> None:
+        for vehicle_id in vehicle_ids & added.keys():
+            await asyncio.gather(
+                *(entity.async_remove() for entity in added[vehicle_id])
+            )
+            added[vehicle_id] = list(create(vehicle_id, vehicles[vehicle_id]))
+            async_add_entities(added[vehicle_id])
+
+    data[ATTR_CONTROL_ENTITIES].append(_async_replace)
+    async_add_entities([entity for entities in added.values() for entity in entities])
+
+
+async def async_replace_vehicle_control_entities(
+    hass: HomeAssistant, entry: ConfigEntry, vehicle_ids: set[str]
+) -> None:
+    """Create the vehicle control entities of some vehicles again."""
+    await asyncio.gather(
+        *(
+            replace(vehicle_ids)
+            for replace in hass.data[DOMAIN][entry.entry_id][ATTR_CONTROL_ENTITIES]
+        )
+    )
+
+
 class RivianEntity(CoordinatorEntity[T]):
     """Base class for Rivian entities."""
 
@@ -104,7 +157,7 @@ class RivianVehicleControlEntity(RivianVehicleEntity):
         device = self.coordinator.drivers_coordinator.get_device_details(
             phone_info[1].get(self.coordinator.vehicle_id)
         )
-        self._available = device["isPaired"]
+        self._available = bool(device and device["isPaired"])
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
@@ -0,0 +1,195 @@
+"""Vehicle frame recorder for the Rivian integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import timedelta
+import gzip
+import json
+import logging
+from pathlib import Path
+from time import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+from .helpers import redact
+from .metrics import ACCOUNT_SCOPE, QUEUE_DEPTH, MetricsRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT = "rivian-frames"
+ARCHIVE_VERSION = 1
+
+
+class FrameRecorder:
+    """Record raw vehicle state frames to redacted, compressed JSONL archives.
+
+    Frames are buffered on the event loop and redacted, serialized and
+    appended in the executor. Vehicle ids are replaced by stable aliases.
+
+    An archive that reaches `max_bytes` is closed and recording continues in
+    a new one. Archives with the recorder's prefix older than `max_age`, or
+    beyond the newest `max_archives`, are removed when recording starts and
+    on rotation.
+    """
+
+    flush_interval = timedelta(seconds=30)
+    max_pending = 1000
+    max_bytes = 20 * 1024 * 1024
+    max_archives = 10
+    max_age = timedelta(days=7)
+
+    def __init__(self, hass: HomeAssistant, directory: Path, prefix: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.directory = directory
+        self.prefix = prefix
+        self.path = self._new_path()
+        self.frames = 0
+        self._aliases: dict[str, str] = {}
+        self._pending: list[tuple[float, str, dict[str, Any]]] = []
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of frames waiting to be written."""
+        return len(self._pending)
+
+    @callback
+    def async_start(self) -> None:
+        """Start flushing recorded frames periodically."""
+        if not self._unsub_flush:
+            self._unsub_flush = async_track_time_interval(
+                self.hass,
+                self.async_flush,
+                self.flush_interval,
+                name="Rivian frame recorder",
+            )
+            self.hass.async_create_background_task(
+                self._async_prune(), "rivian_frame_recorder_prune"
+            )
+        _LOGGER.info("Recording vehicle frames to %s", self.path)
+
+    @callback
+    def record(self, vehicle_id: str, data: dict[str, Any]) -> None:
+        """Record a frame as received by a vehicle coordinator."""
+        alias = self._aliases.setdefault(vehicle_id, f"vehicle_{len(self._aliases)}")
+        self._pending.append((time(), alias, data))
+        self.frames += 1
+        if len(self._pending) >= self.max_pending:
+            self.hass.async_create_background_task(
+                self.async_flush(), "rivian_frame_recorder_flush"
+            )
+
+    async def async_flush(self, *_: Any) -> None:
+        """Append the buffered frames to the archive."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self._write, pending)
+            except OSError as err:
+                _LOGGER.error("Could not record vehicle frames: %s", err)
+
+    async def async_close(self) -> None:
+        """Stop recording, flushing what is buffered."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_prune(self) -> None:
+        """Remove the archives past the retention limits in the executor."""
+        try:
+            await self.hass.async_add_executor_job(self._prune)
+        except OSError as err:
+            _LOGGER.error("Could not remove old vehicle frame archives: %s", err)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return recorder diagnostics."""
+        return {
+            "path": str(self.path),
+            "frames": self.frames,
+            "pending": self.pending,
+        }
+
+    def _new_path(self) -> Path:
+        """Return the path of a new archive."""
+        stamp = dt_util.utcnow().strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"{self.prefix}-{stamp}.jsonl.gz"
+        index = 1
+        while path.exists():
+            path = self.directory / f"{self.prefix}-{stamp}-{index}.jsonl.gz"
+            index += 1
+        return path
+
+    def _prune(self) -> None:
+        """Remove the archives past the retention limits."""
+        if not self.directory.is_dir():
+            return
+        archives = sorted(
+            (
+                (path.stat().st_mtime, path)
+                for path in self.directory.glob(f"{self.prefix}-*.jsonl.gz")
+                if path != self.path
+            ),
+            reverse=True,
+        )
+        oldest = time() - self.max_age.total_seconds()
+        for index, (modified, path) in enumerate(archives):
+            # the archive being written counts against the limit
+            if modified < oldest or index >= self.max_archives - 1:
+                _LOGGER.debug("Removing vehicle frame archive %s", path)
+                path.unlink(missing_ok=True)
+
+    def _write(self, frames: list[tuple[float, str, dict[str, Any]]]) -> None:
+        """Append frames to the archive as gzip members, rotating it when full."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = []
+        if not self.path.exists():
+            lines.append({"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION})
+        lines.extend(
+            {"t": round(timestamp, 3), "vehicle": alias, "frame": redact(data)}
+            for timestamp, alias, data in frames
+        )
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.writelines(
+                json.dumps(line, separators=(",", ":")) + "\n" for line in lines
+            )
+        if self.path.stat().st_size >= self.max_bytes:
+            self.path = self._new_path()
+            _LOGGER.info("Recording vehicle frames to %s", self.path)
+            self._prune()
+
+
+@callback
+def async_start_frame_recorder(
+    hass: HomeAssistant, entry_id: str, metrics: MetricsRegistry
+) -> FrameRecorder:
+    """Start recording the frames of a config entry to a new archive."""
+    recorder = FrameRecorder(hass, Path(hass.config.path(DOMAIN, "frames")), entry_id)
+    recorder.async_start()
+    metrics.get(ACCOUNT_SCOPE, "frame_recorder").collect(
+        QUEUE_DEPTH, lambda: recorder.pending
+    )
+    return recorder
+
+
+def iter_archive(path: Path) -> Iterator[tuple[float, str, dict[str, Any]]]:
+    """Yield the (time, vehicle alias, frame) records of a frame archive."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(next(file, "{}"))
+        if header.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"{path} is not a Rivian frame archive")
+        if header.get("version", 0) > ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported frame archive version in {path}")
+        for line in file:
+            record = json.loads(line)
+            yield record["t"], record["vehicle"], record["frame"]
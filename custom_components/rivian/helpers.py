@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from rivian import Rivian
@@ -12,7 +14,12 @@ from homeassistant.const import CONF_EMAIL, CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_ACCESS_TOKEN, CONF_REFRESH_TOKEN, CONF_USER_SESSION_TOKEN
+from .const import (
+    CONF_ACCESS_TOKEN,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_SESSION_TOKEN,
+    INVALID_SENSOR_STATES,
+)
 
 TO_REDACT = {
     CONF_EMAIL,
@@ -47,3 +54,24 @@ def get_rivian_api_from_entry(hass: HomeAssistant, entry: ConfigEntry) -> Rivian
 def redact(data: Any) -> dict:
     """Redact sensitive data."""
     return async_redact_data(data, TO_REDACT)
+
+
+def is_older(timestamp: str, other: str) -> bool:
+    """Return `True` if an ISO 8601 timestamp is older than another."""
+    if len(timestamp) == len(other):
+        return timestamp < other
+    try:
+        return datetime.fromisoformat(timestamp) < datetime.fromisoformat(other)
+    except ValueError:
+        return False
+
+
+def is_invalid_state(value: Any) -> bool:
+    """Return `True` if a field value is a known invalid sensor state."""
+    return isinstance(value, str) and _is_invalid_string(value)
+
+
+@lru_cache(maxsize=1024)
+def _is_invalid_string(value: str) -> bool:
+    """Return `True` if a string is a known invalid sensor state."""
+    return value.lower() in INVALID_SENSOR_STATES
@@ -7,22 +7,27 @@ from typing import Any
 
 from homeassistant.components.image import ImageEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     ATTR_COORDINATOR,
+    ATTR_METRICS,
+    ATTR_STARTUP_TIMINGS,
     ATTR_USER,
     ATTR_VEHICLE,
     CONF_VEHICLE_IMAGE_STYLE,
+    DATA_IMAGE_CACHE,
     DOMAIN,
     IMAGE_STYLE_CEL,
     IMAGE_STYLE_NONE,
 )
 from .coordinator import VehicleImageCoordinator
 from .entity import RivianEntity
+from .metrics import ACCOUNT_SCOPE
 
 
 async def async_setup_entry(
@@ -35,29 +40,61 @@ async def async_setup_entry(
     vehicle_image_style = entry.options.get(CONF_VEHICLE_IMAGE_STYLE, IMAGE_STYLE_CEL)
 
     if vehicle_image_style == IMAGE_STYLE_NONE:
+        hass.data[DATA_IMAGE_CACHE].async_remove_catalog(entry.entry_id)
         return
 
+    registry = er.async_get(hass)
+
+    def _enabled(image: dict[str, Any]) -> bool:
+        """Return `True` if the entity of an image is enabled."""
+        if not (vehicle := vehicles.get(image["vehicleId"])):
+            return False
+        entity_id = registry.async_get_entity_id(
+            Platform.IMAGE, DOMAIN, _unique_id(vehicle["vin"], image)
+        )
+        return not (entity_id and registry.async_get(entity_id).disabled)
+
     version = "3" if vehicle_image_style == IMAGE_STYLE_CEL else "2"
     coordinator = VehicleImageCoordinator(
-        hass=hass, config_entry=entry, client=client, version=version
+        hass=hass,
+        config_entry=entry,
+        client=client,
+        version=version,
+        cache=hass.data[DATA_IMAGE_CACHE],
+        wanted=_enabled,
+    )
+    with data[ATTR_STARTUP_TIMINGS].span("vehicle_images"):
+        await coordinator.async_config_entry_first_refresh()
+    data[ATTR_METRICS].add(ACCOUNT_SCOPE, "images", coordinator.metrics)
+    entry.async_create_background_task(
+        hass, coordinator.async_revalidate(), "rivian vehicle image revalidation"
     )
-    await coordinator.async_config_entry_first_refresh()
 
     entities = [
         RivianVehicleImageEntity(
             coordinator=coordinator, vin=vehicles[image["vehicleId"]]["vin"], data=image
         )
         for image in coordinator.data
-        if image["size"] == "large"
+        if image["vehicleId"] in vehicles
     ]
     async_add_entities(entities)
 
 
+def _unique_id(vin: str, image: dict[str, Any]) -> str:
+    """Return the unique ID of the entity of a vehicle image."""
+    return f"{vin}-{image['design']}-{image['placement']}"
+
+
 class RivianVehicleImageEntity(RivianEntity, ImageEntity):
-    """Rivian vehicle image entity."""
+    """Rivian vehicle image entity.
+
+    Images are served from the image cache, falling back to the remote URL.
+    """
 
     _attr_content_type = "image/png"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    coordinator: VehicleImageCoordinator
+    display_width = 1024
 
     def __init__(
         self,
@@ -72,9 +109,22 @@ class RivianVehicleImageEntity(RivianEntity, ImageEntity):
         self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, vin)})
         self._attr_image_url = data["url"]
         self._attr_name = f"{data['placement'].capitalize()} {data['design']}"
-        self._attr_unique_id = f"{vin}-{data['design']}-{data['placement']}"
+        self._attr_unique_id = _unique_id(vin, data)
+        self._url = data["url"]
 
     @property
     def image_last_updated(self) -> datetime | None:
         """The time when the image was last updated."""
-        return self.coordinator._last_updated  # pylint: disable=protected-access
+        return self.coordinator.cache.modified(self._url)
+
+    async def async_image(self) -> bytes | None:
+        """Return bytes of the image at the display width."""
+        return await self.async_image_variant(self.display_width)
+
+    async def async_image_variant(self, width: int | None) -> bytes | None:
+        """Return bytes of the narrowest cached variant at least `width` wide."""
+        if (digest := self.coordinator.cache.digest(self._url)) and (
+            image := await self.coordinator.cache.async_read(digest, width)
+        ):
+            return image
+        return await super().async_image()
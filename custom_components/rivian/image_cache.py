@@ -0,0 +1,286 @@
+"""On-disk vehicle image cache for the Rivian integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from hashlib import sha256
+import io
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+
+from aiohttp import ClientError, hdrs
+from PIL import Image
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.images"
+STORAGE_CATALOGS_KEY = f"{DOMAIN}.image_catalogs"
+STORAGE_VERSION = 1
+
+
+class ImageCache:
+    """Content-addressed cache of vehicle images and their resized variants.
+
+    Images are stored under the config dir by the SHA-256 of their content,
+    so the same image referenced by several URLs is stored once. Variants
+    narrower than the original are generated when an image is stored.
+
+    The image catalog of each config entry is kept too, so that setting up
+    does not need to request it. Catalogs and images older than `max_age`
+    are stale and revalidated with conditional requests.
+    """
+
+    widths = (256, 512, 1024)
+    downloads = 4
+    max_age = timedelta(days=7)
+    save_delay = 10
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.path = Path(hass.config.path(DOMAIN, "images"))
+        # URL to the digest of its image, its validators and when it was
+        # fetched and last changed
+        self.index: dict[str, dict[str, Any]] = {}
+        # config entry ID to its image catalog version, images and fetch time
+        self.catalogs: dict[str, dict[str, Any]] = {}
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._catalog_store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_CATALOGS_KEY
+        )
+        # bytes used by the image files
+        self.disk_bytes = 0
+        self._semaphore = asyncio.Semaphore(self.downloads)
+        self._pending: dict[str, asyncio.Future[str | None]] = {}
+        self._downloads = 0
+
+    async def async_load(self) -> None:
+        """Load the index and the catalogs."""
+        self.index = await self._store.async_load() or {}
+        self.catalogs = await self._catalog_store.async_load() or {}
+        self.disk_bytes = await self.hass.async_add_executor_job(self._disk_usage)
+
+    def digest(self, url: str) -> str | None:
+        """Return the digest of a URL's cached image."""
+        return entry["digest"] if (entry := self.index.get(url)) else None
+
+    def modified(self, url: str) -> datetime | None:
+        """Return when a URL's cached image last changed."""
+        if not (entry := self.index.get(url)):
+            return None
+        return dt_util.parse_datetime(entry.get("modified", entry["fetched"]))
+
+    def is_stale(self, fetched: str) -> bool:
+        """Return `True` if something fetched at a time needs revalidating."""
+        return (
+            parsed := dt_util.parse_datetime(fetched)
+        ) is None or parsed < dt_util.utcnow() - self.max_age
+
+    def catalog(self, entry_id: str, version: str) -> dict[str, Any] | None:
+        """Return the cached image catalog of a config entry."""
+        if (catalog := self.catalogs.get(entry_id)) and catalog["version"] == version:
+            return catalog
+        return None
+
+    @callback
+    def async_set_catalog(
+        self, entry_id: str, version: str, images: list[dict[str, Any]]
+    ) -> None:
+        """Cache the image catalog of a config entry."""
+        self.catalogs[entry_id] = {
+            "version": version,
+            "fetched": dt_util.utcnow().isoformat(),
+            "images": images,
+        }
+        self._catalog_store.async_delay_save(lambda: self.catalogs, self.save_delay)
+
+    @callback
+    def async_remove_catalog(self, entry_id: str) -> None:
+        """Forget the image catalog of a config entry."""
+        if self.catalogs.pop(entry_id, None) is not None:
+            self._catalog_store.async_delay_save(lambda: self.catalogs, self.save_delay)
+
+    async def async_fetch(self, url: str) -> str | None:
+        """Return the digest of a URL's image, downloading it if not cached."""
+        if (entry := self.index.get(url)) and await self.hass.async_add_executor_job(
+            self._file(entry["digest"]).exists
+        ):
+            return entry["digest"]
+        if (pending := self._pending.get(url)) is None:
+            pending = self._pending[url] = asyncio.ensure_future(self._download(url))
+            pending.add_done_callback(lambda _: self._pending.pop(url, None))
+        return await asyncio.shield(pending)
+
+    async def async_revalidate(self, url: str) -> bool:
+        """Revalidate a URL's cached image and return `True` if it changed."""
+        previous = self.digest(url)
+        return await self._download(url, conditional=True) not in (None, previous)
+
+    async def async_read(self, digest: str, width: int | None = None) -> bytes | None:
+        """Return the narrowest variant of an image at least `width` wide.
+
+        Without a width, or when no variant is wide enough, the original is
+        returned.
+        """
+        return await self.hass.async_add_executor_job(self._read, digest, width)
+
+    async def async_prune(self) -> None:
+        """Remove the images not in any catalog.
+
+        Nothing is removed while images are being downloaded.
+        """
+        if self._downloads:
+            return
+        urls = {
+            image["url"]
+            for catalog in self.catalogs.values()
+            for image in catalog["images"]
+        }
+        if removed := self.index.keys() - urls:
+            for url in removed:
+                del self.index[url]
+            self._store.async_delay_save(lambda: self.index, self.save_delay)
+        digests = {entry["digest"] for entry in self.index.values()}
+        count, freed = await self.hass.async_add_executor_job(self._remove, digests)
+        if count:
+            self.disk_bytes = max(self.disk_bytes - freed, 0)
+            _LOGGER.debug("Removed %s unused vehicle image file(s)", count)
+
+    async def _download(self, url: str, conditional: bool = False) -> str | None:
+        """Download and store the image of a URL and return its digest.
+
+        A conditional download keeps the cached image if it is unchanged.
+        """
+        entry = self.index.get(url, {})
+        headers = {}
+        if conditional and (etag := entry.get("etag")):
+            headers[hdrs.IF_NONE_MATCH] = etag
+        if conditional and (last_modified := entry.get("last_modified")):
+            headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+        session = async_get_clientsession(self.hass)
+        self._downloads += 1
+        try:
+            async with self._semaphore, session.get(url, headers=headers) as resp:
+                if resp.status == 304 and entry:
+                    self._async_index(url, entry["digest"], resp.headers)
+                    return entry["digest"]
+                resp.raise_for_status()
+                content = await resp.read()
+            digest = sha256(content).hexdigest()
+            self.disk_bytes += await self.hass.async_add_executor_job(
+                self._write, digest, content
+            )
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.warning("Could not download vehicle image %s: %s", url, err)
+            return entry.get("digest")
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not cache vehicle image %s: %s", url, err)
+            return entry.get("digest")
+        finally:
+            self._downloads -= 1
+        self._async_index(url, digest, resp.headers)
+        return digest
+
+    @callback
+    def _async_index(self, url: str, digest: str, headers: Any) -> None:
+        """Record a URL's image digest and validators."""
+        now = dt_util.utcnow().isoformat()
+        previous = self.index.get(url, {})
+        self.index[url] = {
+            "digest": digest,
+            "etag": headers.get(hdrs.ETAG, previous.get("etag")),
+            "last_modified": headers.get(
+                hdrs.LAST_MODIFIED, previous.get("last_modified")
+            ),
+            "fetched": now,
+            "modified": (
+                previous.get("modified", previous["fetched"])
+                if previous.get("digest") == digest
+                else now
+            ),
+        }
+        self._store.async_delay_save(lambda: self.index, self.save_delay)
+
+    def _file(self, digest: str, width: int | None = None) -> Path:
+        """Return the path of an image or one of its variants."""
+        return self.path / (f"{digest}-{width}.png" if width else f"{digest}.png")
+
+    def _write(self, digest: str, content: bytes) -> int:
+        """Store an image and generate its variants, returning the bytes written."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        if (original := self._file(digest)).exists():
+            return 0
+        written = len(content)
+        with Image.open(io.BytesIO(content)) as image:
+            image.load()
+            for width in self.widths:
+                if width >= image.width:
+                    break
+                height = max(round(image.height * width / image.width), 1)
+                variant = image.resize((width, height), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                variant.save(buffer, format="PNG", optimize=True)
+                _write_file(self._file(digest, width), buffer.getvalue())
+                written += buffer.tell()
+        # the original is written last, marking the variants complete
+        _write_file(original, content)
+        return written
+
+    def _read(self, digest: str, width: int | None) -> bytes | None:
+        """Read the narrowest variant of an image at least `width` wide."""
+        candidates = [size for size in self.widths if width and size >= width]
+        for size in (*candidates, None):
+            try:
+                return self._file(digest, size).read_bytes()
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _remove(self, digests: set[str]) -> tuple[int, int]:
+        """Remove the files of images other than some digests.
+
+        Returns the number of files removed and the bytes they used.
+        """
+        if not self.path.is_dir():
+            return 0, 0
+        count = freed = 0
+        for path in self.path.iterdir():
+            if path.name.split(".")[0].split("-")[0] not in digests:
+                try:
+                    freed += path.stat().st_size
+                except FileNotFoundError:
+                    continue
+                path.unlink(missing_ok=True)
+                count += 1
+        return count, freed
+
+    def _disk_usage(self) -> int:
+        """Return the bytes used by the image files."""
+        if not self.path.is_dir():
+            return 0
+        size = 0
+        for path in self.path.iterdir():
+            try:
+                size += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return size
+
+
+def _write_file(path: Path, content: bytes) -> None:
+    """Write a file atomically, so concurrent writers never leave it partial."""
+    temp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    temp.write_bytes(content)
+    temp.replace(path)
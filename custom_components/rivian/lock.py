@@ -10,12 +10,13 @@ from rivian import VehicleCommand
 from homeassistant.components.lock import LockEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import ATTR_COORDINATOR, ATTR_VEHICLE, DOMAIN, LOCK_STATE_ENTITIES
 from .coordinator import VehicleCoordinator
 from .data_classes import RivianLockEntityDescription
-from .entity import RivianVehicleControlEntity
+from .entity import RivianVehicleControlEntity, async_add_vehicle_control_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,16 +43,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up the lock entities."""
     data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
-    vehicles: dict[str, dict[str, Any]] = data[ATTR_VEHICLE]
     coordinators: dict[str, VehicleCoordinator] = data[ATTR_COORDINATOR][ATTR_VEHICLE]
 
-    entities = [
-        RivianLockEntity(coordinators[vehicle_id], entry, description, vehicle)
-        for vehicle_id, vehicle in vehicles.items()
-        if vehicle.get("phone_identity_id")
-        for description in LOCKS
-    ]
-    async_add_entities(entities)
+    def _entities(vehicle_id: str, vehicle: dict[str, Any]) -> list[Entity]:
+        if not vehicle.get("phone_identity_id"):
+            return []
+        return [
+            RivianLockEntity(coordinators[vehicle_id], entry, description, vehicle)
+            for description in LOCKS
+        ]
+
+    async_add_vehicle_control_entities(hass, entry, async_add_entities, _entities)
 
 
 class RivianLockEntity(RivianVehicleControlEntity, LockEntity):
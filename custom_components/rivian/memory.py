@@ -0,0 +1,289 @@
+"""Memory watchdog for the Rivian integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+import logging
+import sys
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_COORDINATOR,
+    ATTR_FRAME_RECORDER,
+    ATTR_METRICS,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    ATTR_WALLBOX,
+    CONF_MEMORY_POLICY,
+    DATA_IMAGE_CACHE,
+    DOMAIN,
+    MEMORY_POLICY_TRIM,
+    MEMORY_POLICY_WARN,
+    SENSORS,
+)
+from .coordinator import VehicleCoordinator
+from .metrics import ACCOUNT_SCOPE, MEMORY_BYTES
+
+_LOGGER = logging.getLogger(__name__)
+
+ENUM_DESCRIPTIONS = [
+    description
+    for descriptions in SENSORS.values()
+    for description in descriptions
+    if description.device_class == SensorDeviceClass.ENUM and description.options
+]
+# option counts before any are added at runtime for unknown values
+ENUM_OPTION_COUNTS = {id(desc): len(desc.options or ()) for desc in ENUM_DESCRIPTIONS}
+
+
+def approximate_size(obj: Any, seen: set[int] | None = None) -> int:
+    """Return the approximate deep size of an object in bytes.
+
+    Objects already in `seen` are not counted again.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            for cls in type(item).__mro__:
+                stack.extend(
+                    value
+                    for slot in getattr(cls, "__slots__", ())
+                    if (value := getattr(item, slot, None)) is not None
+                )
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+    return size
+
+
+class MemoryWatchdog:
+    """Periodically account the size of a config entry's long-lived structures.
+
+    Structures over their budget are logged or, with the trim policy,
+    trimmed. Budgets of per-vehicle structures scale with the number of
+    vehicles.
+    """
+
+    check_interval = timedelta(minutes=15)
+    budgets = {
+        "coordinator_data": 1024 * 1024,
+        "field_history": 256 * 1024,
+        "enum_options": 16 * 1024,
+        "images": 16 * 1024 * 1024,
+        "buffers": 256 * 1024,
+    }
+    per_vehicle = {"coordinator_data", "field_history", "buffers"}
+    # values kept in a field history when trimming
+    history_limit = 16
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the watchdog."""
+        self.hass = hass
+        self.entry = entry
+        self.sizes: dict[str, dict[str, int]] = {}
+        self.trimmed: dict[str, int] = {}
+        self.last_checked: str | None = None
+        self._over: set[str] = set()
+        self._unsub_check: CALLBACK_TYPE | None = None
+
+    @property
+    def policy(self) -> str:
+        """Return the policy for structures over budget."""
+        return self.entry.options.get(CONF_MEMORY_POLICY, MEMORY_POLICY_WARN)
+
+    @callback
+    def async_start(self) -> None:
+        """Start checking periodically."""
+        if not self._unsub_check:
+            self._unsub_check = async_track_time_interval(
+                self.hass,
+                self.async_check,
+                self.check_interval,
+                name="Rivian memory watchdog",
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop checking."""
+        if self._unsub_check:
+            self._unsub_check()
+            self._unsub_check = None
+
+    @callback
+    def async_measure(self) -> None:
+        """Measure every structure."""
+        if not (entry_data := self.hass.data[DOMAIN].get(self.entry.entry_id)):
+            return
+        vehicles = entry_data[ATTR_COORDINATOR][ATTR_VEHICLE]
+        self.sizes = self._measure(entry_data, vehicles)
+        self.last_checked = dt_util.utcnow().isoformat()
+        metrics = entry_data[ATTR_METRICS]
+        for name, size in self.sizes.items():
+            size["budget"] = self.budgets[name] * (
+                max(len(vehicles), 1) if name in self.per_vehicle else 1
+            )
+            metrics.get(ACCOUNT_SCOPE, name).set(MEMORY_BYTES, size["bytes"])
+
+    @callback
+    def async_check(self, *_: Any) -> None:
+        """Measure every structure and apply the policy to those over budget."""
+        self.async_measure()
+        if not (entry_data := self.hass.data[DOMAIN].get(self.entry.entry_id)):
+            return
+        trimmers = self._trimmers(entry_data[ATTR_COORDINATOR][ATTR_VEHICLE])
+        for name, size in self.sizes.items():
+            if size["bytes"] <= size["budget"]:
+                if name in self._over:
+                    self._over.discard(name)
+                    _LOGGER.info("Rivian %s is back within its memory budget", name)
+                continue
+            trim = trimmers.get(name) if self.policy == MEMORY_POLICY_TRIM else None
+            if trim and (count := trim()):
+                self.trimmed[name] = self.trimmed.get(name, 0) + count
+                _LOGGER.info(
+                    "Trimmed %s item(s) of Rivian %s, which used %s bytes of %s",
+                    count,
+                    name,
+                    size["bytes"],
+                    size["budget"],
+                )
+            elif name not in self._over:
+                _LOGGER.warning(
+                    "Rivian %s uses %s bytes, over its budget of %s bytes",
+                    name,
+                    size["bytes"],
+                    size["budget"],
+                )
+            self._over.add(name)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Measure every structure and return the breakdown."""
+        self.async_measure()
+        return {
+            "policy": self.policy,
+            "last_checked": self.last_checked,
+            "structures": self.sizes,
+            "trimmed": self.trimmed,
+        }
+
+    def _measure(
+        self,
+        entry_data: dict[str, Any],
+        vehicles: dict[str, VehicleCoordinator],
+    ) -> dict[str, dict[str, int]]:
+        """Return the size and item count of every structure.
+
+        The image cache is shared by all config entries. Its size is that of
+        its index and catalogs plus the image files it keeps on disk.
+        """
+        coordinators = entry_data[ATTR_COORDINATOR]
+        seen: set[int] = set()
+
+        histories = [
+            record.history
+            for coor in vehicles.values()
+            if coor.data is not None
+            for record in coor.data.records()
+            if record.history is not None
+        ]
+        # histories are counted on their own, not as part of the vehicle state
+        history_size = sum(approximate_size(history, seen) for history in histories)
+
+        data = [coordinators[ATTR_USER].data, coordinators[ATTR_WALLBOX].data]
+        for coor in vehicles.values():
+            data += (
+                coor.data,
+                coor.charging_coordinator.data,
+                coor.drivers_coordinator.data,
+            )
+
+        extended = [
+            added
+            for desc in ENUM_DESCRIPTIONS
+            if (added := (desc.options or [])[ENUM_OPTION_COUNTS[id(desc)] :])
+        ]
+
+        buffers: list[Any] = [
+            coor._pending  # pylint: disable=protected-access
+            for coor in vehicles.values()
+        ]
+        if recorder := entry_data[ATTR_FRAME_RECORDER]:
+            buffers.append(recorder._pending)  # pylint: disable=protected-access
+
+        image_cache = self.hass.data[DATA_IMAGE_CACHE]
+
+        return {
+            "coordinator_data": _measured(data, seen, len(data)),
+            "field_history": {
+                "bytes": history_size,
+                "items": sum(len(history) for history in histories),
+            },
+            "enum_options": _measured(
+                extended, seen, sum(len(options) for options in extended)
+            ),
+            "images": {
+                "bytes": approximate_size(
+                    (image_cache.index, image_cache.catalogs), seen
+                )
+                + image_cache.disk_bytes,
+                "items": len(image_cache.index),
+                "disk_bytes": image_cache.disk_bytes,
+            },
+            "buffers": _measured(buffers, seen, sum(len(buffer) for buffer in buffers)),
+        }
+
+    def _trimmers(
+        self, vehicles: dict[str, VehicleCoordinator]
+    ) -> dict[str, Callable[[], int]]:
+        """Return the functions trimming each structure.
+
+        The coordinator data, the ENUM options and the cached images are in
+        use, so they are only reported.
+        """
+
+        def _trim_history() -> int:
+            return sum(
+                coor.data.trim_history(self.history_limit)
+                for coor in vehicles.values()
+                if coor.data is not None
+            )
+
+        def _trim_buffers() -> int:
+            count = 0
+            for coor in vehicles.values():
+                count += len(coor._pending)  # pylint: disable=protected-access
+                coor._async_flush_pending()  # pylint: disable=protected-access
+            return count
+
+        return {
+            "field_history": _trim_history,
+            "buffers": _trim_buffers,
+        }
+
+
+def _measured(objects: Iterable[Any], seen: set[int], items: int) -> dict[str, int]:
+    """Return the size of objects along with an item count."""
+    return {
+        "bytes": sum(approximate_size(obj, seen) for obj in objects),
+        "items": items,
+    }
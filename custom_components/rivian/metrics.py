@@ -0,0 +1,277 @@
+"""Runtime performance metrics for the Rivian integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from time import monotonic, perf_counter
+from typing import Any
+
+ACCOUNT_SCOPE = "account"
+
+# metric names
+BYTES = "bytes"
+COMMAND_CONFIRM = "command_confirm"
+COMMAND_FAILURES = "command_failures"
+COMMAND_LATENCY = "command_latency"
+COMMAND_PREPARE = "command_prepare"
+COMMAND_SEND = "command_send"
+COMMAND_TIMEOUTS = "command_timeouts"
+COMMAND_WAKE = "command_wake"
+ERROR_COUNT = "error_count"
+ERRORS = "errors"
+FAN_OUT = "fan_out"
+FRAMES = "frames"
+LISTENER_CALLS = "listener_calls"
+MEMORY_BYTES = "memory_bytes"
+MERGE_TIME = "merge_time"
+POLLING_INTERVAL = "polling_interval"
+QUEUE_DEPTH = "queue_depth"
+RATE_LIMITS = "rate_limits"
+REQUEST_LATENCY = "request_latency"
+TOKEN_REFRESHES = "token_refreshes"
+
+
+class Histogram:
+    """Recent samples of a measurement, in seconds."""
+
+    size = 256
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.samples: deque[float] = deque(maxlen=self.size)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a sample."""
+        self.samples.append(value)
+        self.count += 1
+        self.sum += value
+
+    def summary(self) -> dict[str, Any]:
+        """Return the sample count and percentiles of the recent samples."""
+        return {"count": self.count} | percentiles(self.samples)
+
+
+class Rate:
+    """Events or amounts per second over a sliding window."""
+
+    window = 60
+
+    def __init__(self) -> None:
+        """Initialize the rate."""
+        self.total = 0.0
+        self._amounts = [0.0] * self.window
+        self._seconds = [0] * self.window
+
+    def mark(self, amount: float = 1) -> None:
+        """Record an amount in the current second."""
+        second = int(monotonic())
+        index = second % self.window
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._amounts[index] = 0
+        self._amounts[index] += amount
+        self.total += amount
+
+    def per_second(self) -> float:
+        """Return the average per second over the window."""
+        second = int(monotonic())
+        return (
+            sum(
+                amount
+                for amount, marked in zip(self._amounts, self._seconds)
+                if second - marked < self.window
+            )
+            / self.window
+        )
+
+
+class Metrics:
+    """Counters, gauges, histograms and rates of a single component."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.counters: dict[str, int] = {}
+        self.gauges: dict[str, float | None] = {}
+        self.collectors: dict[str, Callable[[], float | None]] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.rates: dict[str, Rate] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name: str, value: float | None) -> None:
+        """Set a gauge."""
+        self.gauges[name] = value
+
+    def collect(self, name: str, func: Callable[[], float | None]) -> None:
+        """Read a gauge from a function whenever it is needed."""
+        self.collectors[name] = func
+
+    def gauge(self, name: str) -> float | None:
+        """Return the value of a gauge."""
+        if collector := self.collectors.get(name):
+            return collector()
+        return self.gauges.get(name)
+
+    def all_gauges(self) -> dict[str, float | None]:
+        """Return the value of every gauge."""
+        return self.gauges | {name: func() for name, func in self.collectors.items()}
+
+    def observe(self, name: str, value: float) -> None:
+        """Add a sample to a histogram."""
+        if (histogram := self.histograms.get(name)) is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+
+    def mark(self, name: str, amount: float = 1) -> None:
+        """Record an amount on a rate."""
+        if (rate := self.rates.get(name)) is None:
+            rate = self.rates[name] = Rate()
+        rate.mark(amount)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Observe the duration of a block."""
+        began = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - began)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current values."""
+        return {
+            "counters": dict(self.counters),
+            "gauges": self.all_gauges(),
+            "histograms": {
+                name: histogram.summary() for name, histogram in self.histograms.items()
+            },
+            "rates": {
+                name: {"per_second": round(rate.per_second(), 3), "total": rate.total}
+                for name, rate in self.rates.items()
+            },
+        }
+
+
+class MetricsRegistry:
+    """Metrics of a config entry, by device scope and component.
+
+    The scope is either `ACCOUNT_SCOPE` or a vehicle id.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._scopes: dict[str, dict[str, Metrics]] = {}
+
+    def get(self, scope: str, component: str) -> Metrics:
+        """Return the metrics of a component, creating them if needed."""
+        components = self._scopes.setdefault(scope, {})
+        if (metrics := components.get(component)) is None:
+            metrics = components[component] = Metrics()
+        return metrics
+
+    def add(self, scope: str, component: str, metrics: Metrics) -> None:
+        """Register metrics kept by a component."""
+        self._scopes.setdefault(scope, {})[component] = metrics
+
+    def remove(self, scope: str, component: str) -> None:
+        """Forget the metrics of a component that is gone."""
+        self._scopes.get(scope, {}).pop(component, None)
+
+    def scope(self, scope: str) -> ScopeMetrics:
+        """Return the metrics of a device scope."""
+        return ScopeMetrics(self._scopes.setdefault(scope, {}))
+
+    def scopes(self) -> dict[str, dict[str, Metrics]]:
+        """Return the metrics of every scope."""
+        return self._scopes
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return a snapshot of every metric."""
+
+        def _components(components: dict[str, Metrics]) -> dict[str, Any]:
+            return {name: metrics.snapshot() for name, metrics in components.items()}
+
+        return {
+            ACCOUNT_SCOPE: _components(self._scopes.get(ACCOUNT_SCOPE, {})),
+            "vehicles": [
+                {"vehicleId": scope} | _components(components)
+                for scope, components in self._scopes.items()
+                if scope != ACCOUNT_SCOPE
+            ],
+        }
+
+
+class ScopeMetrics:
+    """The metrics of the components of a device, aggregated."""
+
+    def __init__(self, components: dict[str, Metrics]) -> None:
+        """Initialize the view."""
+        self.components = components
+
+    def count(self, name: str) -> int:
+        """Return the sum of a counter."""
+        return sum(
+            metrics.counters.get(name, 0) for metrics in self.components.values()
+        )
+
+    def gauge(self, component: str, name: str) -> float | None:
+        """Return a gauge of a component."""
+        if (metrics := self.components.get(component)) is None:
+            return None
+        return metrics.gauge(name)
+
+    def gauges(self, name: str) -> dict[str, float]:
+        """Return the set values of a gauge by component."""
+        return {
+            component: value
+            for component, metrics in self.components.items()
+            if (value := metrics.gauge(name)) is not None
+        }
+
+    def histograms(self, name: str) -> dict[str, dict[str, Any]]:
+        """Return the sample count and percentiles of a histogram by component."""
+        return {
+            component: histogram.summary()
+            for component, metrics in self.components.items()
+            if (histogram := metrics.histograms.get(name))
+        }
+
+    def per_second(self, name: str) -> float:
+        """Return the sum of a rate."""
+        return sum(
+            rate.per_second()
+            for metrics in self.components.values()
+            if (rate := metrics.rates.get(name))
+        )
+
+    def histogram(self, name: str) -> dict[str, Any]:
+        """Return the sample count and percentiles of a histogram."""
+        histograms = [
+            histogram
+            for metrics in self.components.values()
+            if (histogram := metrics.histograms.get(name))
+        ]
+        return {"count": sum(histogram.count for histogram in histograms)} | (
+            percentiles(
+                sample for histogram in histograms for sample in histogram.samples
+            )
+        )
+
+
+def percentiles(samples: Iterable[float]) -> dict[str, float | None]:
+    """Return the median, 95th and 99th percentile and maximum of samples."""
+    if not (ordered := sorted(samples)):
+        return dict.fromkeys(("p50", "p95", "p99", "max"))
+    last = len(ordered) - 1
+    return {
+        "p50": ordered[round(last * 0.5)],
+        "p95": ordered[round(last * 0.95)],
+        "p99": ordered[round(last * 0.99)],
+        "max": ordered[last],
+    }
@@ -0,0 +1,188 @@
+"""Options application for the Rivian integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ZONE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.issue_registry import (
+    IssueSeverity,
+    async_create_issue,
+    async_delete_issue,
+)
+
+from .const import (
+    ATTR_CONFIG,
+    ATTR_COORDINATOR,
+    ATTR_FRAME_RECORDER,
+    ATTR_METRICS,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    CONF_MEMORY_POLICY,
+    CONF_RECORD_FRAMES,
+    CONF_UPDATE_COALESCE_WINDOW,
+    CONF_VEHICLE_CONTROL,
+    CONF_VEHICLE_IMAGE_STYLE,
+    DEFAULT_UPDATE_COALESCE_WINDOW,
+    DOMAIN,
+    IMAGE_STYLE_CEL,
+    MEMORY_POLICY_WARN,
+)
+from .coordinator import UserCoordinator, VehicleCoordinator
+from .entity import async_replace_vehicle_control_entities
+from .frame_recorder import FrameRecorder, async_start_frame_recorder
+from .metrics import ACCOUNT_SCOPE
+
+_LOGGER = logging.getLogger(__name__)
+
+# options with their defaults
+OPTION_DEFAULTS: dict[str, Any] = {
+    CONF_MEMORY_POLICY: MEMORY_POLICY_WARN,
+    CONF_RECORD_FRAMES: False,
+    CONF_UPDATE_COALESCE_WINDOW: DEFAULT_UPDATE_COALESCE_WINDOW,
+    CONF_VEHICLE_CONTROL: [],
+    CONF_VEHICLE_IMAGE_STYLE: IMAGE_STYLE_CEL,
+    CONF_ZONE: [],
+    "private_key": None,
+    "public_key": None,
+}
+# options applied by reloading the config entry
+RELOAD_OPTIONS = {CONF_VEHICLE_IMAGE_STYLE}
+# options applied along with the vehicle control
+VEHICLE_CONTROL_OPTIONS = {CONF_VEHICLE_CONTROL, "private_key", "public_key"}
+
+
+def config_snapshot(entry: ConfigEntry) -> dict[str, dict[str, Any]]:
+    """Return a copy of the data and options of a config entry."""
+    return {"data": dict(entry.data), "options": dict(entry.options)}
+
+
+def changed_options(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    """Return the options whose values differ, counting defaults as unset."""
+    return {
+        key
+        for key in old.keys() | new.keys()
+        if old.get(key, OPTION_DEFAULTS.get(key))
+        != new.get(key, OPTION_DEFAULTS.get(key))
+    }
+
+
+@callback
+def async_setup_vehicle_control(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    user: UserCoordinator,
+    vehicles: dict[str, dict[str, Any]],
+) -> None:
+    """Set the phone identity of the vehicles the enrolled phone controls."""
+    vehicle_control = entry.options.get(CONF_VEHICLE_CONTROL)
+    if vehicle_control and not user.data.get("registrationChannels"):
+        vehicle_control = []
+        async_create_issue(
+            hass,
+            DOMAIN,
+            entry.entry_id,
+            is_fixable=False,
+            is_persistent=False,
+            severity=IssueSeverity.WARNING,
+            translation_key="2fa_missing",
+        )
+    else:
+        async_delete_issue(hass, DOMAIN, entry.entry_id)
+
+    enrolled = vehicle_control and user.get_enrolled_phone_data(
+        entry.options.get("public_key")
+    )
+    for vehicle_id, vehicle in vehicles.items():
+        if enrolled and vehicle_id in enrolled[1]:
+            vehicle["phone_identity_id"] = enrolled[1][vehicle_id]
+        else:
+            vehicle.pop("phone_identity_id", None)
+
+
+async def async_apply_options(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Apply the changed options of a loaded config entry in place.
+
+    Only the vehicle control entities of the vehicles whose control changed
+    are created again. Return `False` if the changes need the entry to be
+    reloaded instead.
+    """
+    entry_data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
+    applied = entry_data[ATTR_CONFIG]
+    changed = changed_options(applied["options"], dict(entry.options))
+    if (
+        entry.data != applied["data"]
+        or changed & RELOAD_OPTIONS
+        or changed - OPTION_DEFAULTS.keys()
+    ):
+        return False
+    entry_data[ATTR_CONFIG] = config_snapshot(entry)
+    coordinators: dict[str, VehicleCoordinator] = entry_data[ATTR_COORDINATOR][
+        ATTR_VEHICLE
+    ]
+
+    if CONF_UPDATE_COALESCE_WINDOW in changed:
+        for coor in coordinators.values():
+            coor.coalesce_window = entry.options.get(
+                CONF_UPDATE_COALESCE_WINDOW, DEFAULT_UPDATE_COALESCE_WINDOW
+            )
+
+    if CONF_RECORD_FRAMES in changed:
+        await _async_apply_frame_recording(hass, entry, entry_data, coordinators)
+
+    if changed & VEHICLE_CONTROL_OPTIONS:
+        vehicles: dict[str, dict[str, Any]] = entry_data[ATTR_VEHICLE]
+        identities = {
+            vehicle_id: vehicle.get("phone_identity_id")
+            for vehicle_id, vehicle in vehicles.items()
+        }
+        user: UserCoordinator = entry_data[ATTR_COORDINATOR][ATTR_USER]
+        async_setup_vehicle_control(hass, entry, user, vehicles)
+        if controlled := {
+            vehicle_id
+            for vehicle_id, vehicle in vehicles.items()
+            if vehicle.get("phone_identity_id") != identities[vehicle_id]
+        }:
+            # the entities depend on the phone in the drivers and keys
+            await asyncio.gather(
+                *(
+                    coordinators[vehicle_id].drivers_coordinator.async_refresh()
+                    for vehicle_id in controlled
+                )
+            )
+            await async_replace_vehicle_control_entities(hass, entry, controlled)
+
+    # control entities are only available in the zones
+    if CONF_ZONE in changed:
+        for coor in coordinators.values():
+            coor.async_update_listeners()
+
+    _LOGGER.debug("Applied Rivian options %s", ", ".join(sorted(changed)))
+    return True
+
+
+async def _async_apply_frame_recording(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    entry_data: dict[str, Any],
+    coordinators: dict[str, VehicleCoordinator],
+) -> None:
+    """Start or stop recording vehicle frames."""
+    previous: FrameRecorder | None = entry_data[ATTR_FRAME_RECORDER]
+    recorder = previous
+    if entry.options.get(CONF_RECORD_FRAMES) and recorder is None:
+        recorder = async_start_frame_recorder(
+            hass, entry.entry_id, entry_data[ATTR_METRICS]
+        )
+    elif not entry.options.get(CONF_RECORD_FRAMES):
+        recorder = None
+        entry_data[ATTR_METRICS].remove(ACCOUNT_SCOPE, "frame_recorder")
+    entry_data[ATTR_FRAME_RECORDER] = recorder
+    for coor in coordinators.values():
+        coor.recorder = recorder
+    if previous is not None and recorder is None:
+        await previous.async_close()
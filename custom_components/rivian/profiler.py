@@ -0,0 +1,238 @@
+"""On-demand profiling of the Rivian integration."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from dataclasses import dataclass
+import io
+import logging
+from pathlib import Path
+import pstats
+import re
+from time import perf_counter
+import tracemalloc
+from typing import Any
+
+import rivian
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+
+from .const import ATTR_COORDINATOR, ATTR_USER, ATTR_VEHICLE, ATTR_WALLBOX, DOMAIN
+from .coordinator import RivianDataUpdateCoordinator, VehicleCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(ATTR_TOP, default=25): vol.All(
+            cv.positive_int, vol.Range(min=1, max=200)
+        ),
+    }
+)
+
+SOURCE_DIRS = (str(Path(__file__).parent), str(Path(rivian.__file__).parent))
+
+
+@dataclass
+class ListenerTiming:
+    """Dispatch timings of a coordinator listener."""
+
+    calls: int = 0
+    total: float = 0
+    slowest: float = 0
+
+    def add(self, elapsed: float) -> None:
+        """Add a dispatch."""
+        self.calls += 1
+        self.total += elapsed
+        self.slowest = max(self.slowest, elapsed)
+
+
+class IntegrationProfiler:
+    """Profile the integration for a bounded duration.
+
+    cProfile only sees the event loop thread, which is where the
+    integration runs, and its stats are restricted to the integration and
+    the Rivian client. Tracemalloc reports the allocations made by the
+    same code while profiling.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self._lock = asyncio.Lock()
+
+    async def async_handle_profile(self, call: ServiceCall) -> None:
+        """Handle the profile service."""
+        if self._lock.locked():
+            raise HomeAssistantError("A Rivian profile is already running")
+        async with self._lock:
+            await self.async_profile(call.data[ATTR_DURATION], call.data[ATTR_TOP])
+
+    async def async_profile(self, duration: float, top: int) -> Path:
+        """Profile the integration, then write and announce the report."""
+        listeners: dict[str, ListenerTiming] = {}
+        restore = self._time_listeners(listeners)
+        profile = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        try:
+            profile.enable()
+        except ValueError as err:
+            restore()
+            raise HomeAssistantError(f"Could not start profiling: {err}") from err
+        if started_tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        _LOGGER.info("Profiling the Rivian integration for %s seconds", duration)
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profile.disable()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            restore()
+
+        path = Path(
+            self.hass.config.path(
+                DOMAIN,
+                "profiles",
+                f"profile-{dt_util.utcnow().strftime('%Y%m%d-%H%M%S')}.txt",
+            )
+        )
+        summary = await self.hass.async_add_executor_job(
+            _write_report, path, duration, top, profile, before, after, listeners
+        )
+        persistent_notification.async_create(
+            self.hass,
+            f"{summary}\n\nFull report: `{path}`",
+            title="Rivian profile",
+            notification_id=f"{DOMAIN}_profile",
+        )
+        return path
+
+    def _time_listeners(self, timings: dict[str, ListenerTiming]) -> CALLBACK_TYPE:
+        """Time every listener dispatch of the loaded coordinators."""
+        coordinators = _coordinators(self.hass)
+
+        def _timed(coordinator: RivianDataUpdateCoordinator) -> CALLBACK_TYPE:
+            def _update_listeners() -> None:
+                for update_callback, _ in list(coordinator._listeners.values()):  # pylint: disable=protected-access
+                    began = perf_counter()
+                    update_callback()
+                    elapsed = perf_counter() - began
+                    name = _listener_name(update_callback)
+                    timings.setdefault(name, ListenerTiming()).add(elapsed)
+
+            return _update_listeners
+
+        for coordinator in coordinators:
+            coordinator.async_update_listeners = _timed(coordinator)  # type: ignore[method-assign]
+
+        def _restore() -> None:
+            for coordinator in coordinators:
+                del coordinator.async_update_listeners
+
+        return _restore
+
+
+def _coordinators(hass: HomeAssistant) -> list[RivianDataUpdateCoordinator]:
+    """Return the coordinators of every loaded config entry."""
+    coordinators: list[RivianDataUpdateCoordinator] = []
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        entry_coordinators = entry_data[ATTR_COORDINATOR]
+        coordinators += (
+            entry_coordinators[ATTR_USER],
+            entry_coordinators[ATTR_WALLBOX],
+        )
+        vehicle: VehicleCoordinator
+        for vehicle in entry_coordinators[ATTR_VEHICLE].values():
+            coordinators += (
+                vehicle,
+                vehicle.charging_coordinator,
+                vehicle.drivers_coordinator,
+            )
+    return coordinators
+
+
+def _listener_name(update_callback: Any) -> str:
+    """Return a readable name for a coordinator listener."""
+    if entity_id := getattr(
+        getattr(update_callback, "__self__", None), "entity_id", None
+    ):
+        return entity_id
+    return getattr(update_callback, "__qualname__", repr(update_callback))
+
+
+def _write_report(
+    path: Path,
+    duration: float,
+    top: int,
+    profile: cProfile.Profile,
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    listeners: dict[str, ListenerTiming],
+) -> str:
+    """Write the profile report and return its summary."""
+    restriction = "|".join(re.escape(source) for source in SOURCE_DIRS)
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(restriction, top)
+
+    filters = [tracemalloc.Filter(True, f"{source}/*") for source in SOURCE_DIRS]
+    filters.append(tracemalloc.Filter(False, __file__))
+    allocations = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), "lineno"
+    )[:top]
+
+    slowest = sorted(listeners.items(), key=lambda item: item[1].total, reverse=True)
+
+    lines = [f"Rivian integration profile over {duration:g} seconds", ""]
+    lines += ["== cProfile (integration and client frames) ==", stream.getvalue()]
+    lines += ["== Allocations (size change, count change) =="]
+    lines += [str(stat) for stat in allocations]
+    lines += ["", "== Listener dispatch (calls, total ms, slowest ms) =="]
+    lines += [
+        f"{name}: {timing.calls}, {timing.total * 1000:.2f}, {timing.slowest * 1000:.2f}"
+        for name, timing in slowest[:top]
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    functions = sorted(
+        (
+            (cumulative, f"{Path(file).name}:{line}({function})")
+            for (file, line, function), (_, _, _, cumulative, _) in stats.stats.items()  # type: ignore[attr-defined]
+            if re.search(restriction, file)
+        ),
+        reverse=True,
+    )
+    summary = [f"Profiled the Rivian integration for {duration:g} seconds."]
+    summary += ["", "Slowest functions (cumulative):"]
+    summary += [f"- {name}: {seconds * 1000:.1f} ms" for seconds, name in functions[:5]]
+    summary += ["", "Largest allocations:"]
+    summary += [
+        f"- {stat.traceback[0].filename.rsplit('/', 1)[-1]}:{stat.traceback[0].lineno}:"
+        f" {stat.size_diff / 1024:+.1f} KiB"
+        for stat in allocations[:3]
+    ]
+    summary += ["", "Slowest listeners (total):"]
+    summary += [
+        f"- {name}: {timing.total * 1000:.1f} ms over {timing.calls} calls"
+        for name, timing in slowest[:5]
+    ]
+    return "\n".join(summary)
@@ -0,0 +1,82 @@
+"""Release notes cache for the Rivian integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.release_notes"
+STORAGE_VERSION = 1
+
+
+class ReleaseNotesCache:
+    """Release notes of each vehicle's latest software version.
+
+    Notes are kept across restarts and only fetched again when the version
+    changes, replacing the notes of the previous version. Concurrent requests
+    for the same notes share one fetch.
+    """
+
+    save_delay = 10
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        # vehicle ID to the version and its release notes
+        self.notes: dict[str, dict[str, str]] = {}
+        self._store: Store[dict[str, dict[str, str]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._pending: dict[tuple[str, str], asyncio.Future[str | None]] = {}
+
+    async def async_load(self) -> None:
+        """Load the cached release notes."""
+        self.notes = await self._store.async_load() or {}
+
+    @callback
+    def async_retain(self, vehicle_ids: set[str]) -> None:
+        """Forget the release notes of vehicles other than some."""
+        if removed := self.notes.keys() - vehicle_ids:
+            for vehicle_id in removed:
+                del self.notes[vehicle_id]
+            self._store.async_delay_save(lambda: self.notes, self.save_delay)
+
+    async def async_get(
+        self,
+        vehicle_id: str,
+        version: str,
+        fetch: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        """Return the release notes of a version, fetching them if not cached.
+
+        Notes are not cached when `fetch` returns `None`.
+        """
+        if (cached := self.notes.get(vehicle_id)) and cached["version"] == version:
+            return cached["notes"]
+        key = (vehicle_id, version)
+        if (pending := self._pending.get(key)) is None:
+            pending = self._pending[key] = asyncio.ensure_future(
+                self._fetch(vehicle_id, version, fetch)
+            )
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _fetch(
+        self,
+        vehicle_id: str,
+        version: str,
+        fetch: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        """Fetch and cache the release notes of a version."""
+        if (notes := await fetch()) is not None:
+            _LOGGER.debug("Caching release notes of %s for %s", version, vehicle_id)
+            self.notes[vehicle_id] = {"version": version, "notes": notes}
+            self._store.async_delay_save(lambda: self.notes, self.save_delay)
+        return notes
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from datetime import datetime
 import logging
 from typing import Any, Final
@@ -16,6 +16,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     STATE_UNAVAILABLE,
     EntityCategory,
+    UnitOfDataRate,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -25,13 +26,29 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import ATTR_COORDINATOR, ATTR_VEHICLE, ATTR_WALLBOX, DOMAIN, SENSORS
-from .coordinator import DriverKeyCoordinator, VehicleCoordinator, WallboxCoordinator
+from .commands import COMPONENT_PREFIX, PHASES
+from .const import (
+    ATTR_COORDINATOR,
+    ATTR_METRICS,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    ATTR_WALLBOX,
+    DOMAIN,
+    SENSORS,
+)
+from .coordinator import (
+    DriverKeyCoordinator,
+    UserCoordinator,
+    VehicleCoordinator,
+    WallboxCoordinator,
+)
 from .data_classes import (
+    RivianMetricSensorEntityDescription,
     RivianSensorEntityDescription,
     RivianWallboxSensorEntityDescription,
 )
@@ -41,6 +58,24 @@ from .entity import (
     RivianVehicleEntity,
     RivianWallboxEntity,
 )
+from .metrics import (
+    ACCOUNT_SCOPE,
+    BYTES,
+    COMMAND_FAILURES,
+    COMMAND_LATENCY,
+    COMMAND_SEND,
+    COMMAND_TIMEOUTS,
+    ERRORS,
+    FAN_OUT,
+    FRAMES,
+    LISTENER_CALLS,
+    MERGE_TIME,
+    POLLING_INTERVAL,
+    RATE_LIMITS,
+    REQUEST_LATENCY,
+    MetricsRegistry,
+    ScopeMetrics,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -97,6 +132,35 @@ async def async_setup_entry(
         for description in WALLBOX_SENSORS
     )
 
+    # Add performance metric entities
+    metrics: MetricsRegistry = data[ATTR_METRICS]
+    entities.extend(
+        RivianMetricSensorEntity(
+            metrics.scope(vehicle_id),
+            description,
+            DeviceInfo(identifiers={(DOMAIN, vehicle["vin"])}),
+            vehicle["vin"],
+        )
+        for vehicle_id, vehicle in vehicles.items()
+        for description in VEHICLE_METRIC_SENSORS
+    )
+    user_coordinator: UserCoordinator = coordinators[ATTR_USER]
+    user_id = user_coordinator.data["id"]
+    entities.extend(
+        RivianMetricSensorEntity(
+            metrics.scope(ACCOUNT_SCOPE),
+            description,
+            DeviceInfo(
+                identifiers={(DOMAIN, user_id)},
+                name="Rivian account",
+                manufacturer="Rivian",
+                entry_type=DeviceEntryType.SERVICE,
+            ),
+            user_id,
+        )
+        for description in ACCOUNT_METRIC_SENSORS
+    )
+
     async_add_entities(entities)
 
 
@@ -391,3 +455,203 @@ class RivianDriverSensorEntity(RivianEntity[DriverKeyCoordinator], SensorEntity)
 
             return {"paired": get_count("isPaired"), "enabled": get_count("isEnabled")}
         return super().extra_state_attributes
+
+
+def _scaled(seconds: float | None, scale: int, digits: int = 1) -> float | None:
+    """Return a duration in seconds in a smaller unit."""
+    return round(seconds * scale, digits) if seconds is not None else None
+
+
+def _percentile_fn(
+    name: str, scale: int, digits: int = 1
+) -> Callable[[ScopeMetrics], float | None]:
+    """Return a function returning the median of a histogram."""
+    return lambda metrics: _scaled(metrics.histogram(name)["p50"], scale, digits)
+
+
+def _percentile_attributes_fn(
+    name: str, scale: int, digits: int = 1
+) -> Callable[[ScopeMetrics], dict[str, Any]]:
+    """Return a function returning the sample count and upper percentiles."""
+
+    def _attributes(metrics: ScopeMetrics) -> dict[str, Any]:
+        summary = metrics.histogram(name)
+        return {"count": summary["count"]} | {
+            key: _scaled(summary[key], scale, digits) for key in ("p95", "p99", "max")
+        }
+
+    return _attributes
+
+
+def _command_latency_attributes(metrics: ScopeMetrics) -> dict[str, Any]:
+    """Return the phase medians and the median latency of each command."""
+    return (
+        _percentile_attributes_fn(COMMAND_LATENCY, 1000)(metrics)
+        | {
+            f"{phase}_p50_ms": _scaled(metrics.histogram(name)["p50"], 1000)
+            for phase, name in PHASES.items()
+        }
+        | {
+            "timeouts": metrics.count(COMMAND_TIMEOUTS),
+            "failures": metrics.count(COMMAND_FAILURES),
+        }
+        | {
+            f"{component.removeprefix(COMPONENT_PREFIX)}_p50_ms": _scaled(
+                summary["p50"], 1000
+            )
+            for component, summary in metrics.histograms(COMMAND_LATENCY).items()
+        }
+    )
+
+
+def _polling_interval_description(
+    component: str,
+) -> RivianMetricSensorEntityDescription:
+    """Return the polling interval description of a component."""
+    return RivianMetricSensorEntityDescription(
+        key="polling_interval",
+        name="Polling interval",
+        icon="mdi:timer-sync-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.gauge(component, POLLING_INTERVAL),
+        attributes_fn=lambda metrics: metrics.gauges(POLLING_INTERVAL),
+    )
+
+
+METRIC_SENSORS: Final[tuple[RivianMetricSensorEntityDescription, ...]] = (
+    RivianMetricSensorEntityDescription(
+        key="api_latency",
+        name="API latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_percentile_fn(REQUEST_LATENCY, 1000),
+        attributes_fn=_percentile_attributes_fn(REQUEST_LATENCY, 1000),
+    ),
+    RivianMetricSensorEntityDescription(
+        key="api_errors",
+        name="API errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.count(ERRORS),
+    ),
+    RivianMetricSensorEntityDescription(
+        key="api_rate_limits",
+        name="API rate limits",
+        icon="mdi:speedometer-slow",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.count(RATE_LIMITS),
+    ),
+    RivianMetricSensorEntityDescription(
+        key="websocket_frames",
+        name="Websocket frames",
+        icon="mdi:swap-vertical",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: round(metrics.per_second(FRAMES), 3),
+    ),
+    RivianMetricSensorEntityDescription(
+        key="websocket_throughput",
+        name="Websocket throughput",
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: round(metrics.per_second(BYTES), 1),
+    ),
+)
+
+VEHICLE_METRIC_SENSORS: Final[tuple[RivianMetricSensorEntityDescription, ...]] = (
+    *METRIC_SENSORS,
+    _polling_interval_description("vehicle"),
+    RivianMetricSensorEntityDescription(
+        key="merge_time",
+        name="Frame merge time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        # merges take microseconds, so keep that resolution in milliseconds
+        value_fn=_percentile_fn(MERGE_TIME, 1000, 4),
+        attributes_fn=_percentile_attributes_fn(MERGE_TIME, 1000, 4),
+    ),
+    RivianMetricSensorEntityDescription(
+        key="listener_notifications",
+        name="Listener notifications",
+        icon="mdi:bell-ring-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.count(LISTENER_CALLS),
+        attributes_fn=lambda metrics: {
+            f"fan_out_{key}_ms": _scaled(value, 1000)
+            for key, value in metrics.histogram(FAN_OUT).items()
+            if key != "count"
+        },
+    ),
+    RivianMetricSensorEntityDescription(
+        key="command_round_trip",
+        name="Command round trip",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_percentile_fn(COMMAND_SEND, 1000),
+        attributes_fn=_percentile_attributes_fn(COMMAND_SEND, 1000),
+    ),
+    RivianMetricSensorEntityDescription(
+        key="command_latency",
+        name="Command latency",
+        icon="mdi:timer-check-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_percentile_fn(COMMAND_LATENCY, 1000),
+        attributes_fn=_command_latency_attributes,
+    ),
+)
+
+ACCOUNT_METRIC_SENSORS: Final[tuple[RivianMetricSensorEntityDescription, ...]] = (
+    *METRIC_SENSORS,
+    _polling_interval_description("user"),
+)
+
+
+class RivianMetricSensorEntity(SensorEntity):
+    """Representation of a Rivian performance metric sensor entity.
+
+    Metrics are kept in memory and read when the sensor is polled.
+    """
+
+    entity_description: RivianMetricSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        metrics: ScopeMetrics,
+        entity_description: RivianMetricSensorEntityDescription,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ) -> None:
+        """Initialize the entity."""
+        self.metrics = metrics
+        self.entity_description = entity_description
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{unique_id_prefix}-metric-{entity_description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value reported by the sensor."""
+        return self.entity_description.value_fn(self.metrics)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        if attributes_fn := self.entity_description.attributes_fn:
+            return attributes_fn(self.metrics)
+        return None
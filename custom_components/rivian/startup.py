@@ -0,0 +1,77 @@
+"""Startup timings for the Rivian integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+from time import perf_counter
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StartupTimings:
+    """Record how long each phase of setting up a config entry takes.
+
+    Phases are timed as spans, either for the whole entry or for a single
+    vehicle. Spans of the same phase add up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timings."""
+        self._began = perf_counter()
+        self.phases: dict[str, float] = {}
+        self.vehicles: dict[str, dict[str, float]] = {}
+        self.total: float | None = None
+
+    @contextmanager
+    def span(self, phase: str, vehicle_id: str | None = None) -> Iterator[None]:
+        """Time a phase, for a vehicle if given."""
+        began = perf_counter()
+        try:
+            yield
+        finally:
+            phases = (
+                self.phases
+                if vehicle_id is None
+                else self.vehicles.setdefault(vehicle_id, {})
+            )
+            phases[phase] = phases.get(phase, 0) + perf_counter() - began
+
+    def finish(self) -> None:
+        """Stop the clock and log the summary."""
+        self.total = perf_counter() - self._began
+        _LOGGER.info("Rivian setup took %s", self.summary())
+
+    def summary(self) -> str:
+        """Return a one line summary of the timings."""
+        parts = [f"{phase} {seconds:.2f}s" for phase, seconds in self.phases.items()]
+        vehicle_totals: dict[str, float] = {}
+        for phases in self.vehicles.values():
+            for phase, seconds in phases.items():
+                vehicle_totals[phase] = vehicle_totals.get(phase, 0) + seconds
+        if vehicle_totals:
+            slowest = max(sum(phases.values()) for phases in self.vehicles.values())
+            parts.append(
+                f"{len(self.vehicles)} vehicle(s) "
+                + ", ".join(
+                    f"{phase} {seconds:.2f}s"
+                    for phase, seconds in vehicle_totals.items()
+                )
+                + f" (slowest vehicle {slowest:.2f}s)"
+            )
+        total = self.total if self.total is not None else perf_counter() - self._began
+        return f"{total:.2f}s: " + "; ".join(parts)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the timings in seconds."""
+        return {
+            "total": round(self.total, 3) if self.total is not None else None,
+            "phases": {phase: round(sec, 3) for phase, sec in self.phases.items()},
+            "vehicles": [
+                {"vehicleId": vehicle_id}
+                | {phase: round(sec, 3) for phase, sec in phases.items()}
+                for vehicle_id, phases in self.vehicles.items()
+            ],
+        }
@@ -0,0 +1,307 @@
+"""Websocket subscription manager for the Rivian integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+from random import uniform
+from time import monotonic
+from typing import Any
+
+from rivian import Rivian
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+
+from .metrics import ACCOUNT_SCOPE, BYTES, FRAMES, MetricsRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+SubscriptionCallback = Callable[[dict[str, Any]], None]
+
+
+@dataclass
+class SubscriptionState:
+    """Liveness of a single vehicle subscription."""
+
+    last_frame: float | None = None
+    subscribed_at: float | None = None
+    attempts: int = 0
+    retry_at: float = 0
+    stale: bool = False
+
+
+class VehicleSubscriptionManager:
+    """Multiplex the vehicle state subscriptions of an account over one websocket."""
+
+    supervise_interval = timedelta(seconds=15)
+    # no message at all (frames or keepalives) on an open socket
+    connection_stall_seconds = 180
+    # no frame for a single awake vehicle
+    subscription_stall_seconds = 30 * 60
+    # no frame for a single asleep vehicle, which is silent until it wakes
+    asleep_stall_seconds = 12 * 60 * 60
+    backoff_base_seconds = 2
+    backoff_max_seconds = 300
+    # frames between measurements of the serialized frame size
+    byte_sample_interval = 16
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: Rivian,
+        properties: set[str],
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """Initialize the subscription manager."""
+        self.hass = hass
+        self.api = client
+        self.metrics = metrics or MetricsRegistry()
+        self._properties = properties
+        self._callbacks: dict[str, SubscriptionCallback] = {}
+        self._asleep: dict[str, Callable[[], bool]] = {}
+        self._unsubs: dict[str, Callable[[], Awaitable[None]]] = {}
+        self._states: dict[str, SubscriptionState] = {}
+        self._connection = SubscriptionState()
+        self._lock = asyncio.Lock()
+        self._unsub_supervisor: CALLBACK_TYPE | None = None
+
+    @property
+    def vehicle_ids(self) -> set[str]:
+        """Return the vehicles registered with the manager."""
+        return set(self._callbacks)
+
+    def is_subscribed(self, vehicle_id: str) -> bool:
+        """Return `True` if the vehicle has an active subscription."""
+        return vehicle_id in self._unsubs
+
+    def is_healthy(self, vehicle_id: str) -> bool:
+        """Return `True` if the vehicle's subscription is live on a live socket."""
+        if not self.is_subscribed(vehicle_id) or self._states[vehicle_id].stale:
+            return False
+        monitor = self.api._ws_monitor  # pylint: disable=protected-access
+        if not monitor or not monitor.connected:
+            return False
+        age = self._last_message_age()
+        return age is None or age <= self.connection_stall_seconds
+
+    @callback
+    def async_start(self) -> None:
+        """Start supervising the subscriptions."""
+        if not self._unsub_supervisor:
+            self._unsub_supervisor = async_track_time_interval(
+                self.hass,
+                self._async_supervise,
+                self.supervise_interval,
+                name="Rivian subscription supervisor",
+            )
+
+    @callback
+    def async_request_resubscribe(self, vehicle_id: str) -> None:
+        """Flag a vehicle subscription for the supervisor to resubscribe."""
+        if state := self._states.get(vehicle_id):
+            state.stale = True
+
+    async def async_subscribe(
+        self,
+        vehicle_id: str,
+        update_callback: SubscriptionCallback,
+        asleep: Callable[[], bool] | None = None,
+    ) -> bool:
+        """Register a vehicle and (re)subscribe it on the shared connection.
+
+        `asleep` tells whether the vehicle is asleep, so that its silence is
+        given `asleep_stall_seconds` before the subscription counts as stalled.
+        """
+        async with self._lock:
+            self._callbacks[vehicle_id] = update_callback
+            if asleep:
+                self._asleep[vehicle_id] = asleep
+            self._states.setdefault(vehicle_id, SubscriptionState())
+            return await self._async_subscribe(vehicle_id)
+
+    async def async_unsubscribe(self, vehicle_id: str, remove: bool = False) -> None:
+        """Unsubscribe a vehicle, closing the connection once nothing is left."""
+        async with self._lock:
+            await self._async_unsubscribe(vehicle_id)
+            if remove and self._callbacks.pop(vehicle_id, None) is not None:
+                self._states.pop(vehicle_id, None)
+                self._asleep.pop(vehicle_id, None)
+                if not self._callbacks:
+                    await self._async_close_monitor()
+
+    async def async_reconnect(self) -> None:
+        """Reconnect the websocket and resubscribe every vehicle as one unit."""
+        async with self._lock:
+            await self._async_reconnect()
+
+    async def async_close(self) -> None:
+        """Drop every subscription concurrently and close the websocket."""
+        if self._unsub_supervisor:
+            self._unsub_supervisor()
+            self._unsub_supervisor = None
+        async with self._lock:
+            self._callbacks.clear()
+            self._states.clear()
+            self._asleep.clear()
+            await asyncio.gather(
+                *(
+                    self._async_unsubscribe(vehicle_id)
+                    for vehicle_id in list(self._unsubs)
+                )
+            )
+            await self._async_close_monitor()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the liveness of the connection and each subscription."""
+        now = monotonic()
+
+        def _age(timestamp: float | None) -> float | None:
+            return None if timestamp is None else round(now - timestamp, 1)
+
+        return {
+            "connection": {
+                "last_message_age": self._last_message_age(),
+                "attempts": self._connection.attempts,
+            },
+            "vehicles": [
+                {
+                    "subscribed": self.is_subscribed(vehicle_id),
+                    "last_frame_age": _age(state.last_frame),
+                    "attempts": state.attempts,
+                    "stale": state.stale,
+                }
+                for vehicle_id, state in self._states.items()
+            ],
+        }
+
+    async def _async_supervise(self, *_: Any) -> None:
+        """Detect stalled subscriptions and resubscribe them with backoff."""
+        if self._lock.locked() or not self._callbacks:
+            return
+        now = monotonic()
+        async with self._lock:
+            if self._connection_stalled():
+                if self._connection.retry_at <= now:
+                    self._backoff(self._connection, now)
+                    await self._async_reconnect()
+                return
+            self._connection.attempts = 0
+            for vehicle_id, state in list(self._states.items()):
+                if state.retry_at > now or not self._subscription_stalled(
+                    vehicle_id, state, now
+                ):
+                    continue
+                _LOGGER.info("Resubscribing stalled vehicle subscription")
+                self._backoff(state, now)
+                await self._async_subscribe(vehicle_id)
+
+    async def _async_reconnect(self) -> None:
+        """Reconnect the websocket; the caller must hold the lock."""
+        _LOGGER.info("Reconnecting %s vehicle subscription(s)", len(self._callbacks))
+        for vehicle_id in list(self._unsubs):
+            await self._async_unsubscribe(vehicle_id)
+        await self._async_close_monitor()
+        for vehicle_id in list(self._callbacks):
+            await self._async_subscribe(vehicle_id)
+
+    async def _async_subscribe(self, vehicle_id: str) -> bool:
+        """Subscribe a single vehicle, replacing any existing subscription."""
+        await self._async_unsubscribe(vehicle_id)
+        state = self._states[vehicle_id]
+        state.stale = False
+        if not (
+            unsub := await self.api.subscribe_for_vehicle_updates(
+                vehicle_id=vehicle_id,
+                properties=self._properties,
+                callback=self._router(vehicle_id),
+            )
+        ):
+            return False
+        self._unsubs[vehicle_id] = unsub
+        state.subscribed_at = monotonic()
+        return True
+
+    async def _async_unsubscribe(self, vehicle_id: str) -> None:
+        """Unsubscribe a single vehicle."""
+        if unsub := self._unsubs.pop(vehicle_id, None):
+            try:
+                await unsub()
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.debug("Error unsubscribing %s: %s", vehicle_id, ex)
+
+    async def _async_close_monitor(self) -> None:
+        """Close the shared websocket monitor."""
+        if monitor := self.api._ws_monitor:  # pylint: disable=protected-access
+            await monitor.close()
+
+    def _connection_stalled(self) -> bool:
+        """Return `True` if the shared connection needs to be rebuilt."""
+        if not self._unsubs or not (monitor := self.api._ws_monitor):  # pylint: disable=protected-access
+            return False
+        if not monitor.connected:
+            # the client reconnects on its own unless its monitor has given up
+            return monitor.monitor is None or monitor.monitor.done()
+        age = self._last_message_age()
+        return age is not None and age > self.connection_stall_seconds
+
+    def _subscription_stalled(
+        self, vehicle_id: str, state: SubscriptionState, now: float
+    ) -> bool:
+        """Return `True` if a vehicle subscription needs to be resubscribed."""
+        if state.stale or vehicle_id not in self._unsubs:
+            return True
+        last = state.last_frame or state.subscribed_at or now
+        if (asleep := self._asleep.get(vehicle_id)) and asleep():
+            return now - last > self.asleep_stall_seconds
+        return now - last > self.subscription_stall_seconds
+
+    def _last_message_age(self) -> float | None:
+        """Return the seconds since the websocket last received any message."""
+        monitor = self.api._ws_monitor  # pylint: disable=protected-access
+        if not monitor or not (last := monitor._last_received):  # pylint: disable=protected-access
+            return None
+        return round((dt_util.utcnow() - last).total_seconds(), 1)
+
+    def _backoff(self, state: SubscriptionState, now: float) -> None:
+        """Schedule the next allowed attempt with jittered exponential backoff."""
+        delay = min(
+            self.backoff_base_seconds * 2**state.attempts, self.backoff_max_seconds
+        )
+        state.retry_at = now + delay * uniform(0.5, 1.5)
+        state.attempts += 1
+
+    def _router(self, vehicle_id: str) -> SubscriptionCallback:
+        """Return a callback that routes frames to the vehicle's handler.
+
+        Frame sizes are measured on a sample of frames, every other frame
+        counting as the size last measured.
+        """
+        metrics = (
+            self.metrics.get(vehicle_id, "websocket"),
+            self.metrics.get(ACCOUNT_SCOPE, "websocket"),
+        )
+        size = 0
+        routed = 0
+
+        @callback
+        def _route(data: dict[str, Any]) -> None:
+            nonlocal size, routed
+            if not routed % self.byte_sample_interval:
+                size = len(json_bytes(data))
+            routed += 1
+            for component in metrics:
+                component.mark(FRAMES)
+                component.mark(BYTES, size)
+            if state := self._states.get(vehicle_id):
+                state.last_frame = monotonic()
+                state.attempts = 0
+            if update_callback := self._callbacks.get(vehicle_id):
+                update_callback(data)
+
+        return _route
@@ -0,0 +1,256 @@
+"""Vehicle state transports for the Rivian integration."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from rivian.const import VEHICLE_STATES_SUBSCRIPTION_ONLY_PROPERTIES
+from rivian.exceptions import (
+    RivianApiException,
+    RivianApiRateLimitError,
+    RivianExpiredTokenError,
+    RivianUnauthenticated,
+)
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+
+from .const import VEHICLE_STATE_API_FIELDS
+from .metrics import (
+    ERRORS,
+    POLLING_INTERVAL,
+    RATE_LIMITS,
+    REQUEST_LATENCY,
+    TOKEN_REFRESHES,
+)
+from .subscription import VehicleSubscriptionManager
+
+if TYPE_CHECKING:
+    from .coordinator import VehicleCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+POLLING_API_FIELDS = (
+    VEHICLE_STATE_API_FIELDS - VEHICLE_STATES_SUBSCRIPTION_ONLY_PROPERTIES
+)
+
+
+class VehicleTransport(ABC):
+    """Source of vehicle state frames for a vehicle coordinator."""
+
+    name: str
+
+    def __init__(self, coordinator: VehicleCoordinator) -> None:
+        """Initialize the transport."""
+        self.coordinator = coordinator
+        self.running = False
+
+    @property
+    @abstractmethod
+    def healthy(self) -> bool:
+        """Return `True` if the transport is currently delivering state."""
+
+    async def async_start(self) -> None:
+        """Start delivering state to the coordinator."""
+        self.running = True
+
+    async def async_stop(self) -> None:
+        """Stop delivering state to the coordinator."""
+        self.running = False
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return transport diagnostics."""
+        return {"running": self.running, "healthy": self.healthy}
+
+
+class WebSocketTransport(VehicleTransport):
+    """Vehicle state delivered by the account's websocket subscriptions."""
+
+    name = "websocket"
+
+    def __init__(
+        self, coordinator: VehicleCoordinator, subscriptions: VehicleSubscriptionManager
+    ) -> None:
+        """Initialize the transport."""
+        super().__init__(coordinator)
+        self.subscriptions = subscriptions
+
+    @property
+    def healthy(self) -> bool:
+        """Return `True` if the vehicle's subscription is live."""
+        return self.subscriptions.is_healthy(self.coordinator.vehicle_id)
+
+    async def async_start(self) -> None:
+        """Subscribe the vehicle, leaving retries to the subscription supervisor."""
+        await super().async_start()
+        if not self.subscriptions.is_subscribed(self.coordinator.vehicle_id):
+            await self.subscriptions.async_subscribe(
+                self.coordinator.vehicle_id,
+                self.coordinator._process_new_data,  # pylint: disable=protected-access
+                lambda: self.coordinator.get("powerState") == "sleep",
+            )
+
+    async def async_stop(self) -> None:
+        """Unsubscribe the vehicle."""
+        await super().async_stop()
+        await self.subscriptions.async_unsubscribe(
+            self.coordinator.vehicle_id, remove=True
+        )
+
+
+class PollingTransport(VehicleTransport):
+    """Vehicle state polled over GraphQL within a request budget."""
+
+    name = "polling"
+    # poll intervals by vehicle activity
+    active_interval = 60
+    awake_interval = 5 * 60
+    asleep_interval = 15 * 60
+    max_interval = 30 * 60
+    # token bucket shared by all polls of this vehicle
+    budget_per_hour = 60
+    budget_burst = 5
+
+    def __init__(self, coordinator: VehicleCoordinator) -> None:
+        """Initialize the transport."""
+        super().__init__(coordinator)
+        self._tokens = float(self.budget_burst)
+        self._refilled = monotonic()
+        self._error_count = 0
+        self._last_success: float | None = None
+        self._unsub_poll: CALLBACK_TYPE | None = None
+
+    @property
+    def healthy(self) -> bool:
+        """Return `True` if the last poll succeeded recently."""
+        return (
+            self._last_success is not None
+            and not self._error_count
+            and monotonic() - self._last_success <= self.max_interval
+        )
+
+    @property
+    def interval(self) -> float:
+        """Return the poll interval adapted to vehicle activity and errors."""
+        coordinator = self.coordinator
+        if not coordinator.data:
+            interval = self.awake_interval
+        elif coordinator.get("powerState") == "sleep":
+            interval = self.asleep_interval
+        elif coordinator.get("gearStatus") not in (None, "park") or coordinator.get(
+            "chargerState"
+        ) in ("charging_active", "charging_connecting"):
+            interval = self.active_interval
+        else:
+            interval = self.awake_interval
+        return min(interval * 2**self._error_count, self.max_interval)
+
+    async def async_start(self) -> None:
+        """Start polling, immediately unless a poll just succeeded."""
+        await super().async_start()
+        self._schedule(self.interval if self.healthy else 0)
+
+    async def async_stop(self) -> None:
+        """Stop polling."""
+        await super().async_stop()
+        if self._unsub_poll:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    async def async_poll(self) -> bool:
+        """Poll the vehicle state once, if the budget allows it.
+
+        Raises `ConfigEntryAuthFailed` if the credentials are no longer valid.
+        """
+        if not self._take_token():
+            return False
+        api = self.coordinator.api
+        metrics = self.coordinator.metrics
+        try:
+            with metrics.time(REQUEST_LATENCY):
+                resp = await api.get_vehicle_state(
+                    vin=self.coordinator.vehicle_id, properties=set(POLLING_API_FIELDS)
+                )
+            data = await resp.json()
+        except RivianExpiredTokenError:
+            _LOGGER.info("Rivian token expired, refreshing")
+            metrics.increment(TOKEN_REFRESHES)
+            await api.create_csrf_token()
+        except RivianApiRateLimitError as err:
+            _LOGGER.error("Rate limit being enforced: %s", err)
+            metrics.increment(RATE_LIMITS)
+            self._tokens = 0
+        except RivianUnauthenticated as err:
+            _LOGGER.error("Rivian authentication failed while polling: %s", err)
+            metrics.increment(ERRORS)
+            raise ConfigEntryAuthFailed from err
+        except RivianApiException as ex:
+            _LOGGER.error("Rivian api exception while polling: %s", ex)
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Unknown exception while polling vehicle state: %s", ex)
+        else:
+            self._error_count = 0
+            self._last_success = monotonic()
+            self.coordinator._process_new_data({"payload": data})  # pylint: disable=protected-access
+            return True
+        self._error_count += 1
+        metrics.increment(ERRORS)
+        return False
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return transport diagnostics."""
+        return super().diagnostics() | {
+            "interval": self.interval,
+            "tokens": round(self._tokens, 2),
+            "error_count": self._error_count,
+        }
+
+    def _take_token(self) -> bool:
+        """Take a request token from the budget."""
+        now = monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._refilled) * self.budget_per_hour / 3600,
+            self.budget_burst,
+        )
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _schedule(self, delay: float) -> None:
+        """Schedule the next poll."""
+        if self._unsub_poll:
+            self._unsub_poll()
+        self.coordinator.metrics.set(POLLING_INTERVAL, self.interval)
+        self._unsub_poll = async_call_later(
+            self.coordinator.hass, delay, self._async_scheduled_poll
+        )
+
+    @callback
+    def _async_scheduled_poll(self, _: Any) -> None:
+        """Run a scheduled poll and schedule the next one."""
+        self._unsub_poll = None
+        if not self.running:
+            return
+        self.coordinator.config_entry.async_create_background_task(
+            self.coordinator.hass,
+            self._async_poll_and_reschedule(),
+            f"rivian_poll_{self.coordinator.vehicle_id}",
+        )
+
+    async def _async_poll_and_reschedule(self) -> None:
+        """Poll, then schedule the next poll if still running."""
+        try:
+            await self.async_poll()
+        except ConfigEntryAuthFailed:
+            # polling cannot recover until the user signs in again
+            self.running = False
+            self.coordinator.config_entry.async_start_reauth(self.coordinator.hass)
+            return
+        if self.running:
+            self._schedule(self.interval)
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import logging
 from typing import Any
 
+from aiohttp import ClientError
 from rivian import VehicleCommand
-from rivian.exceptions import RivianBadRequestError
+from rivian.exceptions import RivianApiException, RivianBadRequestError
 
 from homeassistant.components.update import (
     UpdateDeviceClass,
@@ -16,16 +18,37 @@ from homeassistant.components.update import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity import Entity, EntityDescription
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_COORDINATOR, ATTR_VEHICLE, DOMAIN
+from .const import ATTR_COORDINATOR, ATTR_VEHICLE, DATA_RELEASE_NOTES, DOMAIN
 from .coordinator import VehicleCoordinator
-from .entity import RivianVehicleEntity
+from .entity import RivianVehicleEntity, async_add_vehicle_control_entities
+from .release_notes import ReleaseNotesCache
+
+_LOGGER = logging.getLogger(__name__)
 
 INSTALLING_STATUS = ("Install_Countdown", "Awaiting_Install", "Installing")
 READY_FOR_INSTALL = ("Ready_To_Install", "Scheduled_To_Install")
 
+# fields of the installed and available versions
+VERSION_FIELDS = frozenset(
+    {
+        "otaAvailableVersion",
+        "otaAvailableVersionGitHash",
+        "otaAvailableVersionNumber",
+        "otaAvailableVersionWeek",
+        "otaAvailableVersionYear",
+        "otaCurrentVersion",
+        "otaCurrentVersionGitHash",
+        "otaCurrentVersionNumber",
+        "otaCurrentVersionWeek",
+        "otaCurrentVersionYear",
+    }
+)
+# fields of the install progress and the supported features
+PROGRESS_FIELDS = frozenset({"otaInstallProgress", "otaStatus"})
+
 UPDATE_DESCRIPTION = UpdateEntityDescription(
     key="software_ota",
     name="Software",
@@ -39,14 +62,16 @@ async def async_setup_entry(
 ) -> None:
     """Set up the update entities."""
     data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
-    vehicles: dict[str, Any] = data[ATTR_VEHICLE]
     coordinators: dict[str, VehicleCoordinator] = data[ATTR_COORDINATOR][ATTR_VEHICLE]
 
-    entities = [
-        RivianUpdateEntity(coordinators[vehicle_id], entry, UPDATE_DESCRIPTION, vehicle)
-        for vehicle_id, vehicle in vehicles.items()
-    ]
-    async_add_entities(entities)
+    def _entities(vehicle_id: str, vehicle: dict[str, Any]) -> list[Entity]:
+        return [
+            RivianUpdateEntity(
+                coordinators[vehicle_id], entry, UPDATE_DESCRIPTION, vehicle
+            )
+        ]
+
+    async_add_vehicle_control_entities(hass, entry, async_add_entities, _entities)
 
 
 class RivianUpdateEntity(RivianVehicleEntity, UpdateEntity):
@@ -55,6 +80,7 @@ class RivianUpdateEntity(RivianVehicleEntity, UpdateEntity):
     _attr_supported_features = Feature.PROGRESS | Feature.RELEASE_NOTES
 
     _rivian_software_url: str
+    _release_version: str
 
     def __init__(
         self,
@@ -67,6 +93,7 @@ class RivianUpdateEntity(RivianVehicleEntity, UpdateEntity):
         super().__init__(coordinator, config_entry, description, vehicle)
         self.can_install = vehicle.get("phone_identity_id") is not None
         self._update_version_info()
+        self._last_update_success = coordinator.last_update_success
 
     def _update_version_info(self) -> None:
         current_version = self._get_value("otaCurrentVersion")
@@ -86,6 +113,7 @@ class RivianUpdateEntity(RivianVehicleEntity, UpdateEntity):
         self._rivian_software_url = (
             f"https://rivian.software/{latest_version.replace('.', '-')}/"
         )
+        self._release_version = f"{latest_version} ({latest_hash})"
 
         self._attr_extra_state_attributes = {
             "current_version": {
@@ -131,7 +159,17 @@ class RivianUpdateEntity(RivianVehicleEntity, UpdateEntity):
         )
 
     async def async_release_notes(self) -> str | None:
-        """Return Rivian release notes."""
+        """Return Rivian release notes, cached per available version."""
+        cache: ReleaseNotesCache = self.hass.data[DATA_RELEASE_NOTES]
+        notes = await cache.async_get(
+            self.coordinator.vehicle_id,
+            self._release_version,
+            self._async_fetch_release_notes,
+        )
+        return notes or self._release_notes(self._rivian_software_url)
+
+    async def _async_fetch_release_notes(self) -> str | None:
+        """Fetch the release notes of the available version."""
         vehicle_id = self.coordinator.vehicle_id
         try:
             resp = await self.coordinator.api.get_vehicle_ota_update_details(vehicle_id)
@@ -141,12 +179,35 @@ class RivianUpdateEntity(RivianVehicleEntity, UpdateEntity):
                 url = details["url"]
             else:
                 url = data["currentOTAUpdateDetails"]["url"]
-        except Exception:  # pylint: disable=broad-except
-            url = self._rivian_software_url
+        except (
+            RivianApiException,
+            ClientError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as err:
+            _LOGGER.warning(
+                "Could not get the release notes of vehicle %s: %s", vehicle_id, err
+            )
+            return None
+        return self._release_notes(url)
+
+    @staticmethod
+    def _release_notes(url: str) -> str:
+        """Return release notes linking to a release announcement."""
         return f"[Read release announcement]({url})"
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._update_version_info()
+        """Handle updated data from the coordinator.
+
+        Only updates changing the OTA fields or the availability are written.
+        """
+        changed = self.coordinator.changed_fields
+        success = self.coordinator.last_update_success
+        if changed & VERSION_FIELDS:
+            self._update_version_info()
+        elif not changed & PROGRESS_FIELDS and success == self._last_update_success:
+            return
+        self._last_update_success = success
         super()._handle_coordinator_update()
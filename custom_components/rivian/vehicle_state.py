@@ -0,0 +1,204 @@
+"""Compact vehicle state storage for the Rivian integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from sys import intern
+from typing import Any, Final
+
+from .const import VEHICLE_STATE_API_FIELDS
+from .helpers import is_invalid_state, is_older
+
+_MISSING: Final = object()
+
+# column index of each subscribed field
+FIELD_INDEX: Final[dict[str, int]] = {
+    field: index for index, field in enumerate(sorted(VEHICLE_STATE_API_FIELDS))
+}
+
+
+class FieldRecord(Mapping[str, Any]):
+    """A vehicle state field record, readable as the original field dict."""
+
+    __slots__ = ("value", "timestamp", "history", "extra")
+
+    def __init__(self) -> None:
+        """Initialize an empty record."""
+        self.value: Any = _MISSING
+        self.timestamp: str | None = None
+        self.history: set[Any] | None = None
+        self.extra: dict[str, Any] | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a record item."""
+        if key == "value":
+            if (value := self.value) is not _MISSING:
+                return value
+        elif key == "timeStamp":
+            if self.timestamp is not None:
+                return self.timestamp
+        elif key == "history":
+            if self.history is not None:
+                return self.history
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the record item keys."""
+        if self.timestamp is not None:
+            yield "timeStamp"
+        if self.value is not _MISSING:
+            yield "value"
+        if self.history is not None:
+            yield "history"
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        """Return the number of record items."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Return the record as a dict representation."""
+        return repr(dict(self))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a record item or a default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def is_stale(self, record: Mapping[str, Any]) -> bool:
+        """Return `True` if a field record is older than, or repeats, this one."""
+        if not (timestamp := record.get("timeStamp")) or self.timestamp is None:
+            return False
+        if is_older(timestamp, self.timestamp):
+            return True
+        if is_older(self.timestamp, timestamp):
+            return False
+        return all(
+            self.get(key, _MISSING) == value
+            for key, value in record.items()
+            if key != "timeStamp"
+        )
+
+    def update(self, record: Mapping[str, Any]) -> None:
+        """Update the record in place from a field dict."""
+        for key, value in record.items():
+            if key == "value":
+                self.value = intern(value) if isinstance(value, str) else value
+            elif key == "timeStamp":
+                self.timestamp = value
+            elif key != "history":
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+        if (value := self.value) is not _MISSING:
+            if self.history is None:
+                self.history = set()
+            self.history.add(value)
+            if pending := record.get("history"):
+                self.history |= pending
+
+
+class VehicleState(Mapping[str, FieldRecord]):
+    """Vehicle state held as slotted field records in indexed columns."""
+
+    __slots__ = ("_records", "_other")
+
+    def __init__(self) -> None:
+        """Initialize an empty vehicle state."""
+        self._records: list[FieldRecord | None] = [None] * len(FIELD_INDEX)
+        # fields outside the subscribed set
+        self._other: dict[str, FieldRecord] = {}
+
+    def __getitem__(self, key: str) -> FieldRecord:
+        """Return the record of a field."""
+        if (index := FIELD_INDEX.get(key)) is None:
+            return self._other[key]
+        if (record := self._records[index]) is None:
+            raise KeyError(key)
+        return record
+
+    def __contains__(self, key: object) -> bool:
+        """Return `True` if a field has a record."""
+        return self.get(key) is not None  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fields with a record."""
+        records = self._records
+        yield from (
+            field for field, index in FIELD_INDEX.items() if records[index] is not None
+        )
+        yield from self._other
+
+    def __len__(self) -> int:
+        """Return the number of fields with a record."""
+        return len(self._other) + sum(
+            1 for record in self._records if record is not None
+        )
+
+    def __bool__(self) -> bool:
+        """Return `True` if any field has a record."""
+        return bool(self._other) or any(record is not None for record in self._records)
+
+    def __repr__(self) -> str:
+        """Return the state as a dict representation."""
+        return repr(dict(self))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the record of a field or a default."""
+        if (index := FIELD_INDEX.get(key)) is None:
+            return self._other.get(key, default)
+        if (record := self._records[index]) is None:
+            return default
+        return record
+
+    def value(self, key: str) -> Any | None:
+        """Return the value of a field."""
+        if (record := self.get(key)) is None or record.value is _MISSING:
+            return None
+        return record.value
+
+    def records(self) -> Iterator[FieldRecord]:
+        """Iterate over the field records."""
+        yield from (record for record in self._records if record is not None)
+        yield from self._other.values()
+
+    def trim_history(self, limit: int) -> int:
+        """Reset histories longer than limit to the current value.
+
+        Return the number of values dropped.
+        """
+        dropped = 0
+        for record in self.records():
+            if record.history is not None and len(record.history) > limit:
+                dropped += len(record.history) - 1
+                record.history = {record.value}
+        return dropped
+
+    def merge(self, frame: Mapping[str, Any]) -> set[str]:
+        """Merge a frame into the state in place and return the changed fields.
+
+        Invalid values keep the previous record; untouched fields are reused.
+        """
+        changed: set[str] = set()
+        records = self._records
+        for key, item in frame.items():
+            if not item:
+                continue
+            index = FIELD_INDEX.get(key)
+            record = self._other.get(key) if index is None else records[index]
+            if record is None:
+                record = FieldRecord()
+                if index is None:
+                    self._other[key] = record
+                else:
+                    records[index] = record
+            elif "value" in item and is_invalid_state(item["value"]):
+                continue
+            record.update(item)
+            changed.add(key)
+        return changed
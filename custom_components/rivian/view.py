@@ -0,0 +1,185 @@
+"""HTTP views for the Rivian integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_AUTHENTICATED, KEY_HASS, HomeAssistantView
+from homeassistant.components.image import DOMAIN as IMAGE_DOMAIN
+
+from .const import ATTR_METRICS, DOMAIN
+from .image import RivianVehicleImageEntity
+from .metrics import (
+    BYTES,
+    COMMAND_CONFIRM,
+    COMMAND_FAILURES,
+    COMMAND_LATENCY,
+    COMMAND_PREPARE,
+    COMMAND_SEND,
+    COMMAND_TIMEOUTS,
+    COMMAND_WAKE,
+    ERROR_COUNT,
+    ERRORS,
+    FAN_OUT,
+    FRAMES,
+    LISTENER_CALLS,
+    MEMORY_BYTES,
+    MERGE_TIME,
+    POLLING_INTERVAL,
+    QUEUE_DEPTH,
+    RATE_LIMITS,
+    REQUEST_LATENCY,
+    TOKEN_REFRESHES,
+    MetricsRegistry,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "rivian_"
+QUANTILES = {"p50": "0.5", "p95": "0.95", "p99": "0.99"}
+
+# Prometheus metric names and help texts, by registry metric name
+FAMILIES: dict[str, tuple[str, str]] = {
+    BYTES: ("websocket_bytes", "Estimated bytes of websocket frames received"),
+    COMMAND_CONFIRM: (
+        "command_confirm_seconds",
+        "Time from a command acknowledgement to the frame confirming it",
+    ),
+    COMMAND_FAILURES: ("command_failures", "Vehicle commands failed or rejected"),
+    COMMAND_LATENCY: (
+        "command_latency_seconds",
+        "Time from a command call to its confirmation",
+    ),
+    COMMAND_PREPARE: ("command_prepare_seconds", "Time to prepare a command"),
+    COMMAND_SEND: (
+        "command_send_seconds",
+        "Time to sign and send a command until the API acknowledges it",
+    ),
+    COMMAND_TIMEOUTS: ("command_timeouts", "Vehicle commands never confirmed"),
+    COMMAND_WAKE: ("command_wake_seconds", "Time waiting for a vehicle to wake"),
+    ERROR_COUNT: ("consecutive_errors", "Consecutive failed updates"),
+    ERRORS: ("errors", "Failed API requests and updates"),
+    FAN_OUT: ("listener_fan_out_seconds", "Time to notify coordinator listeners"),
+    FRAMES: ("websocket_frames", "Websocket frames received"),
+    LISTENER_CALLS: ("listener_notifications", "Coordinator listeners notified"),
+    MEMORY_BYTES: ("memory_bytes", "Approximate size of cached structures"),
+    MERGE_TIME: ("frame_merge_seconds", "Time to merge a frame into the state"),
+    POLLING_INTERVAL: ("polling_interval_seconds", "Current polling interval"),
+    QUEUE_DEPTH: ("queue_depth", "Items waiting to be published or written"),
+    RATE_LIMITS: ("rate_limits", "Rate limited API requests"),
+    REQUEST_LATENCY: ("request_latency_seconds", "API request latency"),
+    TOKEN_REFRESHES: ("token_refreshes", "Access token refreshes"),
+}
+
+
+class RivianImageView(HomeAssistantView):
+    """Serve a vehicle image from the image cache at a requested width.
+
+    As with the image proxy, the entity's access token authenticates requests.
+    """
+
+    url = "/api/rivian/image/{entity_id}"
+    name = "api:rivian:image"
+    requires_auth = False
+
+    async def get(self, request: web.Request, entity_id: str) -> web.Response:
+        """Return the narrowest image variant at least `width` wide."""
+        hass = request.app[KEY_HASS]
+        component = hass.data.get(IMAGE_DOMAIN)
+        entity = component.get_entity(entity_id) if component else None
+        if not isinstance(entity, RivianVehicleImageEntity):
+            raise web.HTTPNotFound
+        if not (
+            request[KEY_AUTHENTICATED]
+            or request.query.get("token") in entity.access_tokens
+        ):
+            if hdrs.AUTHORIZATION in request.headers:
+                raise web.HTTPUnauthorized
+            raise web.HTTPForbidden
+        try:
+            width = int(request.query["width"]) if "width" in request.query else None
+        except ValueError as err:
+            raise web.HTTPBadRequest from err
+        if (image := await entity.async_image_variant(width)) is None:
+            raise web.HTTPNotFound
+        return web.Response(body=image, content_type=entity.content_type)
+
+
+class RivianMetricsView(HomeAssistantView):
+    """Export the integration's metrics in the Prometheus text format.
+
+    Metrics are read from memory, so scraping never touches the state machine.
+    """
+
+    url = "/api/rivian/metrics"
+    name = "api:rivian:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of every loaded config entry."""
+        hass = request.app[KEY_HASS]
+        registries = {
+            entry_id: registry
+            for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+            if (registry := entry_data.get(ATTR_METRICS))
+        }
+        return web.Response(
+            body=format_prometheus(registries).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+def format_prometheus(registries: dict[str, MetricsRegistry]) -> str:
+    """Return the metrics of config entries in the Prometheus text format."""
+    families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def _family(name: str, kind: str, suffix: str = "") -> list[str]:
+        metric, help_text = FAMILIES.get(name, (name, name.replace("_", " ")))
+        metric = f"{PREFIX}{metric}{suffix}"
+        return families.setdefault(metric, (kind, help_text, []))[2]
+
+    for entry_id, registry in registries.items():
+        for scope, components in registry.scopes().items():
+            for component, metrics in components.items():
+                labels = {"entry": entry_id, "scope": scope, "component": component}
+                for name, count in metrics.counters.items():
+                    _family(name, "counter", "_total").append(
+                        _sample(name, "_total", labels, count)
+                    )
+                for name, value in metrics.all_gauges().items():
+                    if value is not None:
+                        _family(name, "gauge").append(_sample(name, "", labels, value))
+                for name, rate in metrics.rates.items():
+                    _family(name, "counter", "_total").append(
+                        _sample(name, "_total", labels, rate.total)
+                    )
+                for name, histogram in metrics.histograms.items():
+                    samples = _family(name, "summary")
+                    summary = histogram.summary()
+                    samples.extend(
+                        _sample(name, "", labels | {"quantile": quantile}, value)
+                        for key, quantile in QUANTILES.items()
+                        if (value := summary[key]) is not None
+                    )
+                    samples.append(_sample(name, "_sum", labels, histogram.sum))
+                    samples.append(_sample(name, "_count", labels, histogram.count))
+
+    lines = []
+    for metric, (kind, help_text, samples) in sorted(families.items()):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def _sample(name: str, suffix: str, labels: dict[str, str], value: Any) -> str:
+    """Return a sample line."""
+    metric = FAMILIES.get(name, (name,))[0]
+    label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+    return f"{PREFIX}{metric}{suffix}{{{label_text}}} {float(value)!r}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,341 @@
+"""Benchmarks for the coordinator and entity hot paths.
+
+Runs the integration against the fake backend in an offline Home Assistant:
+
+    python -m tools.benchmark --vehicles 1 10 50 --json before.json
+    python -m tools.benchmark --vehicles 1 10 50 --baseline before.json
+    python -m tools.benchmark --archive config/rivian/frames/<archive>.jsonl.gz
+
+With `--archive`, the merge and fan-out benchmarks replay the frames of a
+recorded archive instead of synthetic ones, with one vehicle per recorded
+vehicle alias.
+
+Each benchmark reports the best time per operation over a few rounds, then
+the peak traced memory and the allocations still alive after one extra
+traced round, as measured by tracemalloc. Setup is timed from adding the
+config entry until Home Assistant is idle again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import gc
+import json
+import logging
+from pathlib import Path
+import random
+import tempfile
+from time import perf_counter
+import tracemalloc
+from typing import Any
+
+from rivian import Rivian
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from custom_components.rivian.const import (
+    ATTR_COORDINATOR,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    DOMAIN,
+    VEHICLE_STATE_API_FIELDS,
+)
+from custom_components.rivian.coordinator import VehicleCoordinator
+from custom_components.rivian.frame_recorder import iter_archive
+from custom_components.rivian.helpers import redact
+
+from .fake_rivian import FakeRivian, FakeVehicle, parse_fields, patch_client
+from .harness import (
+    async_setup_integration,
+    async_start_hass,
+    async_stop_hass,
+    create_config_entry,
+    create_vehicle_coordinators,
+)
+
+ENTITY_PROPERTIES = ("native_value", "is_on", "extra_state_attributes")
+
+
+@dataclass
+class Result:
+    """The measurements of a benchmark."""
+
+    name: str
+    ops: int
+    seconds: float
+    peak_kib: float = 0
+    retained_blocks: int = 0
+
+    @property
+    def per_op_us(self) -> float:
+        """Return the microseconds per operation."""
+        return self.seconds / self.ops * 1e6
+
+    def row(self) -> str:
+        """Return the result as a table row."""
+        return (
+            f"{self.name:<40} {self.per_op_us:>12.2f} {self.ops / self.seconds:>12.0f}"
+            f" {self.peak_kib:>10.1f} {self.retained_blocks:>10}"
+        )
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Return a snapshot without tracemalloc's own allocations."""
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+
+def _trace_end(before: tracemalloc.Snapshot, result: Result) -> Result:
+    """Stop tracing and record the allocations of the traced round."""
+    after = _snapshot()
+    result.peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    result.retained_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename")
+    )
+    return result
+
+
+def measure(name: str, func: Callable[[], Any], ops: int, rounds: int) -> Result:
+    """Measure `func`, which performs `ops` operations per call."""
+    best = float("inf")
+    for _ in range(rounds):
+        began = perf_counter()
+        func()
+        best = min(best, perf_counter() - began)
+    gc.collect()
+    tracemalloc.start()
+    before = _snapshot()
+    func()
+    return _trace_end(before, Result(name, ops, best))
+
+
+def synthetic_frames(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Return an initial full vehicle state frame followed by incremental ones."""
+    vehicle = FakeVehicle(id="V0", vin="VIN0", name="Vehicle", rng=random.Random(seed))
+    fragment = Rivian()._build_vehicle_state_fragment(VEHICLE_STATE_API_FIELDS)  # pylint: disable=protected-access
+    frames = [
+        {
+            name: dict(record)
+            for name, record in vehicle.select(parse_fields(fragment)).items()
+        }
+    ]
+    for _ in range(count - 1):
+        frames.append({name: dict(vehicle.records[name]) for name in vehicle.tick(3)})
+    return frames
+
+
+def archive_frames(path: Path) -> list[tuple[str, dict[str, Any]]]:
+    """Return the (vehicle alias, vehicle state) frames of a recorded archive."""
+    frames = []
+    for _, vehicle, frame in iter_archive(path):
+        data = (frame.get("payload") or {}).get("data") or {}
+        if state := data.get("vehicleState"):
+            frames.append((vehicle, state))
+    return frames
+
+
+def bench_merge(
+    hass: HomeAssistant,
+    frames: int,
+    rounds: int,
+    recorded: list[tuple[str, dict[str, Any]]] | None = None,
+) -> Result:
+    """Measure merging frames into the vehicle state."""
+    if recorded is None:
+        recorded = [("V0", frame) for frame in synthetic_frames(frames)]
+    entry = create_config_entry()
+    coordinators = create_vehicle_coordinators(
+        hass, entry, sorted({vehicle for vehicle, _ in recorded})
+    )
+    data = [(coordinators[vehicle], frame) for vehicle, frame in recorded]
+
+    def _merge() -> None:
+        for coordinator, frame in data:
+            coordinator.data = coordinator._build_vehicle_info_dict(frame)  # pylint: disable=protected-access
+
+    return measure("merge frame", _merge, len(data), rounds)
+
+
+def bench_loaded(
+    hass: HomeAssistant,
+    entry_id: str,
+    repeat: int,
+    rounds: int,
+    recorded: list[tuple[str, dict[str, Any]]] | None = None,
+) -> list[Result]:
+    """Measure listener fan-out, entity properties and redaction.
+
+    With `recorded` frames, fan-out publishes them to the vehicles in
+    recorded alias order, so listeners only run for frames that change the
+    state, as they do for live frames.
+    """
+    results = []
+    coordinators: dict[str, VehicleCoordinator] = hass.data[DOMAIN][entry_id][
+        ATTR_COORDINATOR
+    ][ATTR_VEHICLE]
+    listeners = sum(len(coor._listeners) for coor in coordinators.values())  # pylint: disable=protected-access
+
+    if recorded:
+        aliases = dict(
+            zip(sorted({vehicle for vehicle, _ in recorded}), coordinators.values())
+        )
+        data = [(aliases[vehicle], frame) for vehicle, frame in recorded]
+
+        def _fanout() -> None:
+            for coordinator, frame in data:
+                coordinator._publish(frame)  # pylint: disable=protected-access
+
+        ops = len(data)
+    else:
+
+        def _fanout() -> None:
+            for _ in range(repeat):
+                for coordinator in coordinators.values():
+                    coordinator.async_set_updated_data(coordinator.data)
+
+        ops = repeat * len(coordinators)
+
+    results.append(measure(f"fan-out ({listeners} listeners)", _fanout, ops, rounds))
+
+    entities = [
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+    ]
+    for prop in ENTITY_PROPERTIES:
+        if not (owners := [entity for entity in entities if hasattr(entity, prop)]):
+            continue
+
+        def _read(owners: list[Any] = owners, prop: str = prop) -> None:
+            for _ in range(repeat):
+                for entity in owners:
+                    getattr(entity, prop)
+
+        results.append(
+            measure(
+                f"{prop} ({len(owners)} entities)",
+                _read,
+                repeat * len(owners),
+                rounds,
+            )
+        )
+
+    user = hass.data[DOMAIN][entry_id][ATTR_COORDINATOR][ATTR_USER]
+
+    def _redact() -> None:
+        for _ in range(repeat):
+            redact(
+                {
+                    "user": user.data,
+                    "vehicle": [coor.data for coor in coordinators.values()],
+                }
+            )
+
+    results.append(measure("redact diagnostics", _redact, repeat, rounds))
+    return results
+
+
+async def bench_setup(vehicles: int, rounds: int) -> Result:
+    """Measure setting up a config entry for a synthetic fleet."""
+    backend = FakeRivian(vehicles=vehicles, frame_rate=0, keepalive=0, seed=vehicles)
+    restore = patch_client(await backend.start())
+    result = Result(f"setup entry ({vehicles} vehicles)", 1, float("inf"))
+    try:
+        for traced in [False] * rounds + [True]:
+            with tempfile.TemporaryDirectory() as config_dir:
+                hass = await async_start_hass(config_dir)
+                gc.collect()
+                if traced:
+                    tracemalloc.start()
+                    before = _snapshot()
+                began = perf_counter()
+                await async_setup_integration(hass)
+                if traced:
+                    _trace_end(before, result)
+                else:
+                    result.seconds = min(result.seconds, perf_counter() - began)
+                await async_stop_hass(hass)
+    finally:
+        restore()
+        await backend.stop()
+    return result
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    """Run every benchmark."""
+    results = []
+    recorded = archive_frames(args.archive) if args.archive else None
+    fleet = len({vehicle for vehicle, _ in recorded}) if recorded else args.fleet
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        results.append(bench_merge(hass, args.frames, args.rounds, recorded))
+
+        backend = FakeRivian(vehicles=fleet, frame_rate=0, keepalive=0, seed=1)
+        restore = patch_client(await backend.start())
+        try:
+            entry = await async_setup_integration(hass)
+            results.extend(
+                bench_loaded(hass, entry.entry_id, args.repeat, args.rounds, recorded)
+            )
+            await async_stop_hass(hass)
+        finally:
+            restore()
+            await backend.stop()
+
+    for vehicles in args.vehicles:
+        results.append(await bench_setup(vehicles, args.setup_rounds))
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=5000, help="frames to merge")
+    parser.add_argument("--fleet", type=int, default=2, help="vehicles for fan-out")
+    parser.add_argument("--repeat", type=int, default=50, help="calls per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--vehicles", type=int, nargs="*", default=[1, 10, 50], help="setup fleets"
+    )
+    parser.add_argument("--setup-rounds", type=int, default=1)
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        help="merge and fan out the frames of a recorded archive",
+    )
+    parser.add_argument("--json", type=Path, help="write the results to a file")
+    parser.add_argument("--baseline", type=Path, help="compare with earlier results")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    print(
+        f"{'benchmark':<40} {'us/op':>12} {'ops/s':>12} {'peak KiB':>10} {'retained':>10}"
+    )
+    for result in results:
+        line = result.row()
+        if previous := baseline.get(result.name):
+            change = result.per_op_us / previous["per_op_us"] - 1
+            line += f" {change:+.1%}"
+        print(line)
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    result.name: asdict(result) | {"per_op_us": result.per_op_us}
+                    for result in results
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,821 @@
+"""Local stand-in for the Rivian GraphQL and websocket backend.
+
+Serves the queries, mutations and vehicle state subscription the integration
+uses for a scripted fleet, so it can be exercised without the Rivian cloud:
+
+    python -m tools.fake_rivian --vehicles 10 --frame-rate 2 --rate-limit 0.05
+
+Call `patch_client` with the printed URL, before the integration is set up, to
+point rivian-python-client at the server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import json
+import logging
+import random
+import re
+import struct
+from typing import Any
+from uuid import uuid4
+import zlib
+
+from aiohttp import WSMsgType, hdrs, web
+from rivian import rivian as rivian_client
+from rivian.rivian import LIVE_SESSION_VALUE_RECORD_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+GATEWAY_PATH = "/api/gql/gateway/graphql"
+CHARGING_PATH = "/api/gql/chrg/user/graphql"
+WEBSOCKET_PATH = "/gql-consumer-subscriptions/graphql"
+IMAGE_PATH = "/images/{vehicle_id}/{name}"
+
+# `field { sub sub }` pairs of a vehicle state fragment
+FIELD_PATTERN = re.compile(r"(\w+) \{ ([^{}]*) \}")
+UNAUTHENTICATED_OPERATIONS = {"CreateCSRFToken", "Login", "LoginWithOTP"}
+
+FIELD_CHOICES: dict[str, tuple[str, ...]] = {
+    "chargerState": ("charging_ready", "charging_active", "charging_complete"),
+    "chargerStatus": ("chrgr_sts_not_connected", "chrgr_sts_connected_charging"),
+    "driveMode": ("everyday", "sport", "distance", "winter", "towing"),
+    "gearStatus": ("park", "drive", "reverse", "neutral"),
+    "powerState": ("ready", "go", "sleep"),
+}
+SUFFIX_CHOICES: dict[str, tuple[str, ...]] = {
+    "Closed": ("closed", "open"),
+    "Locked": ("locked", "unlocked"),
+}
+NUMERIC_RANGES: dict[str, tuple[float, float]] = {
+    "batteryCapacity": (128, 135),
+    "batteryLevel": (5, 100),
+    "batteryLimit": (70, 100),
+    "cabinClimateDriverTemperature": (16, 29),
+    "cabinClimateInteriorTemperature": (-10, 45),
+    "distanceToEmpty": (10, 500),
+    "gnssAltitude": (0, 2000),
+    "gnssBearing": (0, 360),
+    "gnssSpeed": (0, 35),
+    "otaDownloadProgress": (0, 100),
+    "otaInstallDuration": (10, 60),
+    "otaInstallProgress": (0, 100),
+    "otaInstallTime": (0, 60),
+    "timeToEndOfCharge": (0, 600),
+    "tirePressureFrontLeft": (2.5, 3.2),
+    "tirePressureFrontRight": (2.5, 3.2),
+    "tirePressureRearLeft": (2.5, 3.2),
+    "tirePressureRearRight": (2.5, 3.2),
+    "vehicleMileage": (1_000_000, 100_000_000),
+}
+FIELD_DEFAULTS: dict[str, Any] = {
+    "gearGuardVideoMode": "everywhere",
+    "gearGuardVideoStatus": "enabled",
+    "otaAvailableVersion": "0.0.0",
+    "otaAvailableVersionGitHash": "",
+    "otaCurrentVersion": "2024.03.1",
+    "otaCurrentVersionGitHash": "0123456789abcdef",
+    "otaCurrentVersionNumber": 1,
+    "otaCurrentVersionWeek": 3,
+    "otaCurrentVersionYear": 2024,
+    "otaStatus": "Idle",
+}
+# state changes applied once a command has been acknowledged
+COMMAND_EFFECTS: dict[str, dict[str, Any]] = {
+    "CLOSE_FRUNK": {"closureFrunkClosed": "closed"},
+    "LOCK_ALL_CLOSURES_FEEDBACK": {
+        f"door{door}Locked": "locked"
+        for door in ("FrontLeft", "FrontRight", "RearLeft", "RearRight")
+    },
+    "OPEN_FRUNK": {"closureFrunkClosed": "open"},
+    "START_CHARGING": {"chargerState": "charging_active"},
+    "STOP_CHARGING": {"chargerState": "charging_ready"},
+    "UNLOCK_ALL_CLOSURES": {
+        f"door{door}Locked": "unlocked"
+        for door in ("FrontLeft", "FrontRight", "RearLeft", "RearRight")
+    },
+    "WAKE_VEHICLE": {"powerState": "ready"},
+}
+IMAGE_PLACEMENTS = ("side", "front", "rear")
+IMAGE_SIZES = ("small", "medium", "large")
+
+
+def timestamp() -> str:
+    """Return the current time as a Rivian timestamp."""
+    now = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    return now.replace("+00:00", "Z")
+
+
+def patch_client(url: str) -> Callable[[], None]:
+    """Point rivian-python-client at a fake server and return an undo callable."""
+    original = {
+        name: getattr(rivian_client, name)
+        for name in ("GRAPHQL_GATEWAY", "GRAPHQL_CHARGING", "GRAPHQL_WEBSOCKET")
+    }
+    rivian_client.GRAPHQL_GATEWAY = url + GATEWAY_PATH
+    rivian_client.GRAPHQL_CHARGING = url + CHARGING_PATH
+    rivian_client.GRAPHQL_WEBSOCKET = url.replace("http", "ws", 1) + WEBSOCKET_PATH
+
+    def _restore() -> None:
+        for name, value in original.items():
+            setattr(rivian_client, name, value)
+
+    return _restore
+
+
+def _png(width: int = 1200, height: int = 600) -> bytes:
+    """Return a gray PNG the size of a large vehicle image."""
+
+    def _chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    # every row starts with the "no filter" byte
+    rows = (b"\x00" + b"\x80\x80\x80\xff" * width) * height
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(rows))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def _choices(name: str) -> tuple[str, ...] | None:
+    """Return the possible string values of a field, if it has a known set."""
+    if choices := FIELD_CHOICES.get(name):
+        return choices
+    return next(
+        (
+            choices
+            for suffix, choices in SUFFIX_CHOICES.items()
+            if name.endswith(suffix)
+        ),
+        None,
+    )
+
+
+@dataclass
+class Subscriber:
+    """A vehicle state subscription on a websocket."""
+
+    websocket: web.WebSocketResponse
+    id: str
+    fields: dict[str, list[str]]
+
+
+@dataclass
+class FakeVehicle:
+    """A scripted vehicle and its current state."""
+
+    id: str
+    vin: str
+    name: str
+    rng: random.Random
+    latitude: float = 42.0
+    longitude: float = -83.0
+    records: dict[str, dict[str, Any]] = field(default_factory=dict)
+    subscribers: list[Subscriber] = field(default_factory=list)
+
+    def select(self, fields: dict[str, list[str]]) -> dict[str, dict[str, Any]]:
+        """Return the records of the requested fields."""
+        return {name: self.record(name, subs) for name, subs in fields.items()}
+
+    def record(self, name: str, subfields: Iterable[str]) -> dict[str, Any]:
+        """Return the record of a field, creating it on first use."""
+        if (record := self.records.get(name)) is None:
+            record = self.records[name] = {}
+        for sub in subfields:
+            if sub not in record:
+                record[sub] = self._initial(name, sub)
+        return record
+
+    def tick(self, count: int) -> list[str]:
+        """Change a few fields the way a driven vehicle would."""
+        dynamic = [
+            name
+            for name, record in self.records.items()
+            if "latitude" in record or name in NUMERIC_RANGES or _choices(name)
+        ]
+        changed = self.rng.sample(dynamic, min(count, len(dynamic)))
+        for name in changed:
+            record = self.records[name]
+            if "latitude" in record:
+                self.latitude += self.rng.uniform(-0.001, 0.001)
+                self.longitude += self.rng.uniform(-0.001, 0.001)
+                record.update(latitude=self.latitude, longitude=self.longitude)
+            elif "value" in record:
+                record["value"] = self._next(name, record["value"])
+            if "timeStamp" in record:
+                record["timeStamp"] = timestamp()
+        return changed
+
+    def apply(self, values: dict[str, Any]) -> list[str]:
+        """Set field values and return the fields that exist in the state."""
+        changed = []
+        for name, value in values.items():
+            if (record := self.records.get(name)) is None:
+                continue
+            record.update(value=value, timeStamp=timestamp())
+            changed.append(name)
+        return changed
+
+    def _initial(self, name: str, sub: str) -> Any:
+        """Return the initial value of a record item."""
+        if sub in ("timeStamp", "lastSync"):
+            return timestamp()
+        if sub in ("isAuthorized", "isOnline"):
+            return True
+        if sub == "latitude":
+            return self.latitude
+        if sub == "longitude":
+            return self.longitude
+        if sub != "value":
+            return round(self.rng.uniform(0, 10), 2)
+        if name in FIELD_DEFAULTS:
+            return FIELD_DEFAULTS[name]
+        if bounds := NUMERIC_RANGES.get(name):
+            return round(self.rng.uniform(*bounds), 1)
+        if choices := _choices(name):
+            return choices[0]
+        return "off"
+
+    def _next(self, name: str, value: Any) -> Any:
+        """Return the next value of a dynamic field."""
+        if bounds := NUMERIC_RANGES.get(name):
+            low, high = bounds
+            step = (high - low) / 100
+            return round(min(max(value + self.rng.uniform(-step, step), low), high), 1)
+        if choices := _choices(name):
+            return self.rng.choice(choices)
+        return value
+
+
+class FakeRivian:
+    """A fake Rivian backend serving a fleet of scripted vehicles."""
+
+    def __init__(
+        self,
+        *,
+        vehicles: int = 1,
+        wallboxes: int = 0,
+        frame_rate: float = 1.0,
+        fields_per_frame: int = 3,
+        latency: float = 0,
+        jitter: float = 0,
+        rate_limit: float = 0,
+        token_ttl: float | None = None,
+        keepalive: float = 30,
+        command_delay: float = 1,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the fake backend.
+
+        `rate_limit` is the share of requests answered with a 429 and
+        `token_ttl` the seconds an app session token stays valid.
+        """
+        self.rng = random.Random(seed)
+        self.vehicles = {
+            vehicle.id: vehicle
+            for vehicle in (
+                FakeVehicle(
+                    id=f"V{index:016d}",
+                    vin=f"7FCTGAAL{index:09d}",
+                    name=f"Vehicle {index}",
+                    rng=random.Random(self.rng.random()),
+                )
+                for index in range(vehicles)
+            )
+        }
+        self.wallboxes = wallboxes
+        self.frame_rate = frame_rate
+        self.fields_per_frame = fields_per_frame
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.token_ttl = token_ttl
+        self.keepalive = keepalive
+        self.command_delay = command_delay
+        self.url = ""
+        self.stats: Counter[str] = Counter()
+        self._sessions: dict[str, float] = {}
+        self._commands: dict[str, dict[str, Any]] = {}
+        self._websockets: set[web.WebSocketResponse] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._runner: web.AppRunner | None = None
+        self._image = _png()
+        self._operations: dict[str, Callable[[dict[str, Any], str], Any]] = {
+            "CreateCSRFToken": self._create_csrf_token,
+            "DisenrollPhone": self._phone,
+            "DriversAndKeys": self._drivers_and_keys,
+            "EnrollPhone": self._phone,
+            "GetVehicleState": self._vehicle_state,
+            "Login": self._login,
+            "getLiveSessionData": self._live_session,
+            "getOTAUpdateDetails": self._ota_details,
+            "getRegisteredWallboxes": self._wallboxes,
+            "getUserInfo": self._user_info,
+            "getVehicleCommand": self._command_state,
+            "getVehicleImages": self._images,
+            "sendVehicleCommand": self._send_command,
+        }
+
+    def application(self) -> web.Application:
+        """Return the aiohttp application of the backend."""
+        app = web.Application()
+        app.router.add_post(GATEWAY_PATH, self._handle_graphql)
+        app.router.add_post(CHARGING_PATH, self._handle_graphql)
+        app.router.add_get(WEBSOCKET_PATH, self._handle_websocket)
+        app.router.add_get(IMAGE_PATH, self._handle_image)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and the vehicle simulation, returning the base URL."""
+        self._runner = web.AppRunner(self.application())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        if self.frame_rate > 0:
+            for vehicle in self.vehicles.values():
+                self._spawn(self._drive(vehicle))
+        if self.keepalive > 0:
+            self._spawn(self._ping())
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        for task in self._tasks:
+            task.cancel()
+        for websocket in list(self._websockets):
+            await websocket.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def push(self, vehicle_id: str, values: dict[str, Any]) -> None:
+        """Set vehicle field values and send them to the vehicle's subscribers."""
+        vehicle = self.vehicles[vehicle_id]
+        await self._publish(vehicle, vehicle.apply(values))
+
+    async def expire_tokens(self, close_websockets: bool = True) -> None:
+        """Expire every app session, optionally dropping the websockets too."""
+        self._sessions.clear()
+        if close_websockets:
+            for websocket in list(self._websockets):
+                await websocket.close(code=4401, message=b"Unauthenticated")
+
+    def _spawn(self, coro: Any) -> None:
+        """Run a background task until the backend stops."""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drive(self, vehicle: FakeVehicle) -> None:
+        """Change a vehicle's state at the configured frame rate."""
+        interval = 1 / self.frame_rate
+        await asyncio.sleep(vehicle.rng.uniform(0, interval))
+        while True:
+            await self._publish(vehicle, vehicle.tick(self.fields_per_frame))
+            await asyncio.sleep(interval)
+
+    async def _ping(self) -> None:
+        """Keep the websockets alive like the real backend."""
+        while True:
+            await asyncio.sleep(self.keepalive)
+            for websocket in list(self._websockets):
+                await self._send(websocket, {"type": "ping"})
+
+    async def _publish(self, vehicle: FakeVehicle, changed: list[str]) -> None:
+        """Send the changed fields to each subscriber that asked for them."""
+        for subscriber in list(vehicle.subscribers):
+            if fields := {
+                name: vehicle.records[name]
+                for name in changed
+                if name in subscriber.fields
+            }:
+                await self._send_frame(subscriber, fields)
+
+    async def _send_frame(
+        self, subscriber: Subscriber, fields: dict[str, dict[str, Any]]
+    ) -> None:
+        """Send a vehicle state frame to a subscriber."""
+        self.stats["frames"] += 1
+        await self._send(
+            subscriber.websocket,
+            {
+                "id": subscriber.id,
+                "payload": {"data": {"vehicleState": fields}},
+                "type": "next",
+            },
+        )
+
+    async def _send(self, websocket: web.WebSocketResponse, data: Any) -> None:
+        """Send a websocket message, ignoring sockets that are going away."""
+        if websocket.closed:
+            return
+        message = json.dumps(data)
+        self.stats["bytes"] += len(message)
+        try:
+            await websocket.send_str(message)
+        except ConnectionError:
+            pass
+
+    async def _delay(self) -> None:
+        """Wait for the configured latency."""
+        if delay := self.latency + self.rng.uniform(0, self.jitter):
+            await asyncio.sleep(delay)
+
+    def _session_valid(self, token: str | None) -> bool:
+        """Return `True` if an app session token has not expired."""
+        if (issued := self._sessions.get(token or "")) is None:
+            return False
+        loop = asyncio.get_running_loop()
+        return self.token_ttl is None or loop.time() - issued < self.token_ttl
+
+    async def _handle_graphql(self, request: web.Request) -> web.Response:
+        """Answer a GraphQL query or mutation."""
+        await self._delay()
+        body = await request.json()
+        operation = body.get("operationName")
+        self.stats[operation] += 1
+        if self.rate_limit and self.rng.random() < self.rate_limit:
+            self.stats["rate_limited"] += 1
+            return _error(429, "RATE_LIMIT", "Rate limit exceeded")
+        if operation not in UNAUTHENTICATED_OPERATIONS and (
+            "A-Sess" in request.headers
+            and not self._session_valid(request.headers["A-Sess"])
+        ):
+            self.stats["unauthenticated"] += 1
+            return _error(401, "UNAUTHENTICATED", "Session expired")
+        if (handler := self._operations.get(operation)) is None:
+            return _error(400, "BAD_REQUEST_ERROR", f"Unknown operation {operation}")
+        try:
+            data = handler(body.get("variables") or {}, body.get("query", ""))
+        except KeyError as err:
+            return _error(200, "DATA_ERROR", f"Unknown id {err}")
+        return web.json_response({"data": data})
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Serve vehicle state subscriptions over graphql-transport-ws."""
+        websocket = web.WebSocketResponse(protocols=("graphql-transport-ws",))
+        await websocket.prepare(request)
+        self._websockets.add(websocket)
+        try:
+            async for msg in websocket:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                if (kind := data.get("type")) == "connection_init":
+                    await self._send(websocket, {"type": "connection_ack"})
+                elif kind == "subscribe":
+                    await self._subscribe(websocket, data["id"], data["payload"])
+                elif kind == "complete":
+                    self._unsubscribe(websocket, data["id"])
+                elif kind == "ping":
+                    await self._send(websocket, {"type": "pong"})
+        finally:
+            self._websockets.discard(websocket)
+            self._unsubscribe(websocket)
+        return websocket
+
+    async def _handle_image(self, request: web.Request) -> web.Response:
+        """Serve a vehicle image, honoring its entity tag."""
+        await self._delay()
+        etag = f'"{zlib.crc32(self._image):08x}"'
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            self.stats["images_not_modified"] += 1
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        self.stats["images"] += 1
+        return web.Response(
+            body=self._image, content_type="image/png", headers={hdrs.ETAG: etag}
+        )
+
+    async def _subscribe(
+        self, websocket: web.WebSocketResponse, sub_id: str, payload: dict[str, Any]
+    ) -> None:
+        """Start a subscription and send the full requested state."""
+        vehicle = self.vehicles.get(payload.get("variables", {}).get("vehicleID"))
+        if vehicle is None:
+            await self._send(
+                websocket,
+                {
+                    "id": sub_id,
+                    "payload": [{"message": "Unknown vehicle"}],
+                    "type": "error",
+                },
+            )
+            return
+        fields = parse_fields(payload.get("query", ""))
+        subscriber = Subscriber(websocket=websocket, id=sub_id, fields=fields)
+        vehicle.subscribers.append(subscriber)
+        self.stats["subscriptions"] += 1
+        await self._send_frame(subscriber, vehicle.select(fields))
+
+    def _unsubscribe(
+        self, websocket: web.WebSocketResponse, sub_id: str | None = None
+    ) -> None:
+        """Drop one or every subscription of a websocket."""
+        for vehicle in self.vehicles.values():
+            vehicle.subscribers = [
+                subscriber
+                for subscriber in vehicle.subscribers
+                if subscriber.websocket is not websocket
+                or (sub_id is not None and subscriber.id != sub_id)
+            ]
+
+    def _create_csrf_token(self, variables: dict[str, Any], query: str) -> Any:
+        """Issue a new app session."""
+        token = uuid4().hex
+        self._sessions[token] = asyncio.get_running_loop().time()
+        return {
+            "createCsrfToken": {
+                "__typename": "CreateCsrfTokenResponse",
+                "csrfToken": uuid4().hex,
+                "appSessionToken": token,
+            }
+        }
+
+    def _login(self, variables: dict[str, Any], query: str) -> Any:
+        """Log in without a second factor."""
+        return {
+            "login": {
+                "__typename": "MobileLoginResponse",
+                "accessToken": uuid4().hex,
+                "refreshToken": uuid4().hex,
+                "userSessionToken": uuid4().hex,
+            }
+        }
+
+    def _phone(self, variables: dict[str, Any], query: str) -> Any:
+        """Enroll or disenroll a phone."""
+        key = "disenrollPhone" if "disenrollPhone" in query else "enrollPhone"
+        return {key: {"__typename": "EnrollPhoneResponse", "success": True}}
+
+    def _user_info(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the current user and their vehicles."""
+        return {
+            "currentUser": {
+                "__typename": "User",
+                "id": "fake-user",
+                "vehicles": [
+                    {
+                        "id": vehicle.id,
+                        "vin": vehicle.vin,
+                        "name": vehicle.name,
+                        "vas": {
+                            "__typename": "UserVehicleAccess",
+                            "vasVehicleId": f"vas-{vehicle.id}",
+                            "vehiclePublicKey": "00" * 32,
+                        },
+                        "roles": ["primary-owner"],
+                        "state": "DELIVERED",
+                        "createdAt": "2024-01-01T00:00:00.000Z",
+                        "updatedAt": "2024-01-01T00:00:00.000Z",
+                        "vehicle": {
+                            "__typename": "Vehicle",
+                            "id": vehicle.id,
+                            "vin": vehicle.vin,
+                            "modelYear": 2024,
+                            "make": "Rivian",
+                            "model": "R1S",
+                            "expectedBuildDate": None,
+                            "plannedBuildDate": None,
+                            "expectedGeneralAssemblyStartDate": None,
+                            "actualGeneralAssemblyDate": None,
+                            "vehicleState": {"supportedFeatures": []},
+                        },
+                    }
+                    for vehicle in self.vehicles.values()
+                ],
+                "registrationChannels": [{"type": "EMAIL"}],
+                "enrolledPhones": [],
+            }
+        }
+
+    def _drivers_and_keys(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the drivers and keys of a vehicle."""
+        vehicle = self.vehicles[variables["vehicleId"]]
+        return {
+            "getVehicle": {
+                "__typename": "Vehicle",
+                "id": vehicle.id,
+                "vin": vehicle.vin,
+                "invitedUsers": [],
+            }
+        }
+
+    def _vehicle_state(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the polled state of a vehicle."""
+        vehicle = self.vehicles[variables["vehicleID"]]
+        return {"vehicleState": vehicle.select(parse_fields(query))}
+
+    def _ota_details(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the OTA details of a vehicle."""
+        vehicle = self.vehicles[variables["vehicleId"]]
+        version = vehicle.record("otaCurrentVersion", ("value",))["value"]
+        return {
+            "getVehicle": {
+                "availableOTAUpdateDetails": None,
+                "currentOTAUpdateDetails": {
+                    "url": f"{self.url}/release-notes/{version}",
+                    "version": version,
+                    "locale": "en_US",
+                },
+            }
+        }
+
+    def _images(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the mobile images of every vehicle."""
+        extension = variables.get("extension") or "png"
+        resolution = variables.get("resolution") or "@3x"
+        design = f"fake{variables.get('versionForVehicle') or '1'}"
+        return {
+            "getVehicleOrderMobileImages": [],
+            "getVehicleMobileImages": [
+                {
+                    "orderId": None,
+                    "vehicleId": vehicle.id,
+                    "url": self.url
+                    + IMAGE_PATH.format(
+                        vehicle_id=vehicle.id,
+                        name=f"{design}-{placement}-{size}.{extension}",
+                    ),
+                    "extension": extension,
+                    "resolution": resolution,
+                    "size": size,
+                    "design": design,
+                    "placement": placement,
+                    "overlays": [],
+                }
+                for vehicle in self.vehicles.values()
+                for placement in IMAGE_PLACEMENTS
+                for size in IMAGE_SIZES
+            ],
+        }
+
+    def _wallboxes(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the account's wallboxes."""
+        return {
+            "getRegisteredWallboxes": [
+                {
+                    "__typename": "WallboxRecord",
+                    "wallboxId": f"W{index:08d}",
+                    "userId": "fake-user",
+                    "wifiId": "fake-wifi",
+                    "name": f"Wallbox {index}",
+                    "linked": True,
+                    "latitude": "42.0",
+                    "longitude": "-83.0",
+                    "chargingStatus": "AVAILABLE",
+                    "power": "0",
+                    "currentVoltage": "240",
+                    "currentAmps": "0",
+                    "softwareVersion": "1.0.0",
+                    "model": "Wallbox",
+                    "serialNumber": f"SN{index:08d}",
+                    "maxAmps": "48",
+                    "maxVoltage": "240",
+                    "maxPower": "11520",
+                }
+                for index in range(self.wallboxes)
+            ]
+        }
+
+    def _live_session(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the live charging session of a vehicle."""
+        vehicle = self.vehicles[variables["vehicleId"]]
+        charging = (
+            vehicle.record("chargerState", ("value",))["value"] == "charging_active"
+        )
+        session: dict[str, Any] = {
+            "__typename": "LiveSessionData",
+            "chargerId": None,
+            "currentCurrency": "USD",
+            "currentPrice": 0.0,
+            "isFreeSession": False,
+            "isRivianCharger": False,
+            "locationId": None,
+            "startTime": timestamp() if charging else None,
+            "timeElapsed": 0.0,
+        }
+        for key in LIVE_SESSION_VALUE_RECORD_KEYS:
+            session[key] = {
+                "__typename": "ValueRecord",
+                "value": round(vehicle.rng.uniform(0, 10), 2) if charging else 0,
+                "updatedAt": timestamp(),
+            }
+        return {"getLiveSessionData": session}
+
+    def _send_command(self, variables: dict[str, Any], query: str) -> Any:
+        """Accept a vehicle command and apply its effect after a delay."""
+        attrs = variables["attrs"]
+        vehicle = self.vehicles[attrs["vehicleId"]]
+        command = {
+            "__typename": "GetVehicleCommandState",
+            "id": uuid4().hex,
+            "command": attrs["command"],
+            "createdAt": timestamp(),
+            "state": 0,
+            "responseCode": None,
+            "statusCode": None,
+        }
+        self._commands[command["id"]] = command
+        self._spawn(self._complete_command(vehicle, command))
+        return {
+            "sendVehicleCommand": {
+                "__typename": "SendVehicleCommandResponse",
+                "id": command["id"],
+                "command": command["command"],
+                "state": command["state"],
+            }
+        }
+
+    async def _complete_command(
+        self, vehicle: FakeVehicle, command: dict[str, Any]
+    ) -> None:
+        """Complete a command and publish the state it changed."""
+        await asyncio.sleep(self.command_delay)
+        command.update(state=2, responseCode=0, statusCode=0)
+        await self._publish(
+            vehicle, vehicle.apply(COMMAND_EFFECTS.get(command["command"], {}))
+        )
+
+    def _command_state(self, variables: dict[str, Any], query: str) -> Any:
+        """Return the state of a vehicle command."""
+        return {"getVehicleCommand": self._commands[variables["id"]]}
+
+
+def parse_fields(query: str) -> dict[str, list[str]]:
+    """Return the vehicle state fields, and their items, requested by a query."""
+    return {name: subfields.split() for name, subfields in FIELD_PATTERN.findall(query)}
+
+
+def _error(status: int, code: str, message: str) -> web.Response:
+    """Return a GraphQL error response."""
+    return web.json_response(
+        {"data": None, "errors": [{"message": message, "extensions": {"code": code}}]},
+        status=status,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted, reporting traffic periodically."""
+    backend = FakeRivian(
+        vehicles=args.vehicles,
+        wallboxes=args.wallboxes,
+        frame_rate=args.frame_rate,
+        fields_per_frame=args.fields_per_frame,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        token_ttl=args.token_ttl,
+        command_delay=args.command_delay,
+        seed=args.seed,
+    )
+    url = await backend.start(args.host, args.port)
+    _LOGGER.info("Fake Rivian backend serving %s vehicle(s) at %s", args.vehicles, url)
+    try:
+        while True:
+            await asyncio.sleep(args.report)
+            _LOGGER.info("Traffic: %s", dict(backend.stats))
+    finally:
+        await backend.stop()
+
+
+def main() -> None:
+    """Run the fake backend from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--vehicles", type=int, default=1)
+    parser.add_argument("--wallboxes", type=int, default=0)
+    parser.add_argument(
+        "--frame-rate", type=float, default=1.0, help="frames/s per vehicle"
+    )
+    parser.add_argument("--fields-per-frame", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0, help="extra random latency")
+    parser.add_argument("--rate-limit", type=float, default=0, help="share of 429s")
+    parser.add_argument("--token-ttl", type=float, help="app session lifetime (s)")
+    parser.add_argument("--command-delay", type=float, default=1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--report", type=float, default=10, help="seconds between reports"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
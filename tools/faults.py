@@ -0,0 +1,334 @@
+"""Fault injection for the Rivian client, driven by a scenario file.
+
+A scenario is a JSON file listing faults and when they are active, in
+seconds from the start of the run:
+
+    {
+      "warmup": 10,
+      "settle": 120,
+      "faults": [
+        {"kind": "latency", "start": 0, "end": 20, "seconds": 2,
+         "methods": ["get_vehicle_state"]},
+        {"kind": "timeout", "start": 20, "end": 30, "probability": 0.5},
+        {"kind": "rate_limit", "start": 40, "end": 60},
+        {"kind": "expired_token", "start": 70},
+        {"kind": "websocket_drop", "start": 80, "end": 100, "every": 10},
+        {"kind": "malformed", "start": 110, "end": 115, "variant": "no_data"}
+      ]
+    }
+
+Fault times are relative to the end of the warmup. Request faults apply to
+every request method unless `methods` is given. An expired token stays
+expired until the client creates a new CSRF token, like the real backend.
+
+Call `patch_faults` before the integration is set up so that
+`get_rivian_api_from_entry` returns a `FaultyRivian`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
+import functools
+import json
+import logging
+from pathlib import Path
+import random
+from time import monotonic
+from typing import Any
+import weakref
+
+from rivian import Rivian
+from rivian.exceptions import (
+    RivianApiException,
+    RivianApiRateLimitError,
+    RivianExpiredTokenError,
+)
+
+from custom_components.rivian import helpers
+
+_LOGGER = logging.getLogger(__name__)
+
+LATENCY = "latency"
+TIMEOUT = "timeout"
+RATE_LIMIT = "rate_limit"
+EXPIRED_TOKEN = "expired_token"
+WEBSOCKET_DROP = "websocket_drop"
+MALFORMED = "malformed"
+REQUEST_FAULTS = {LATENCY, TIMEOUT, RATE_LIMIT, EXPIRED_TOKEN}
+KINDS = REQUEST_FAULTS | {WEBSOCKET_DROP, MALFORMED}
+
+REQUEST_METHODS = (
+    "create_csrf_token",
+    "get_drivers_and_keys",
+    "get_live_charging_session",
+    "get_registered_wallboxes",
+    "get_user_information",
+    "get_vehicle_command_state",
+    "get_vehicle_images",
+    "get_vehicle_ota_update_details",
+    "get_vehicle_state",
+    "send_vehicle_command",
+)
+
+# subscription messages replacing a vehicle state frame
+MALFORMED_VARIANTS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "no_payload": lambda data: {key: data[key] for key in data if key != "payload"},
+    "no_data": lambda data: data | {"payload": {"data": None}},
+    "bad_record": lambda data: data
+    | {"payload": {"data": {"vehicleState": {"batteryLevel": "garbage"}}}},
+    "not_an_object": lambda data: "garbage",
+}
+
+
+@dataclass
+class Fault:
+    """A fault and the window it is active in."""
+
+    kind: str
+    start: float
+    end: float | None = None
+    methods: list[str] | None = None
+    probability: float = 1
+    seconds: float = 0
+    every: float | None = None
+    variant: str | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the fault."""
+        if self.kind not in KINDS:
+            raise ValueError(f"Unknown fault kind {self.kind!r}")
+        if self.end is None:
+            self.end = self.start
+        if self.end < self.start:
+            raise ValueError(f"{self.kind} fault ends before it starts")
+        if unknown := set(self.methods or ()) - set(REQUEST_METHODS):
+            raise ValueError(f"Unknown request methods {sorted(unknown)}")
+        if self.variant is not None and self.variant not in MALFORMED_VARIANTS:
+            raise ValueError(f"Unknown malformed payload variant {self.variant!r}")
+
+    def active(self, elapsed: float, method: str | None = None) -> bool:
+        """Return `True` if the fault applies at a time to a method."""
+        assert self.end is not None
+        # without an end, an expired token lasts until it is refreshed
+        open_ended = self.kind == EXPIRED_TOKEN and self.end == self.start
+        if not self.start <= elapsed <= (float("inf") if open_ended else self.end):
+            return False
+        return method is None or self.methods is None or method in self.methods
+
+
+@dataclass
+class Scenario:
+    """Faults to inject, with the time to run before and after them."""
+
+    faults: list[Fault]
+    warmup: float = 10
+    settle: float = 120
+
+    @classmethod
+    def load(cls, path: Path) -> Scenario:
+        """Load a scenario file."""
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        known = {item.name for item in fields(Fault)}
+        faults = []
+        for item in raw.get("faults", []):
+            if unknown := set(item) - known:
+                raise ValueError(f"Unknown fault settings {sorted(unknown)}")
+            faults.append(Fault(**item))
+        return cls(
+            faults=sorted(faults, key=lambda fault: fault.start),
+            warmup=raw.get("warmup", 10),
+            settle=raw.get("settle", 120),
+        )
+
+    @property
+    def duration(self) -> float:
+        """Return the seconds from the end of the warmup to the last fault."""
+        return max((fault.end or fault.start for fault in self.faults), default=0)
+
+
+@dataclass
+class Request:
+    """A request made through the faulty client."""
+
+    elapsed: float
+    method: str
+    outcome: str = "ok"
+
+
+@dataclass
+class FaultInjector:
+    """Inject a scenario's faults into every client created while patched.
+
+    The clock starts with `start`; nothing is injected before.
+    """
+
+    scenario: Scenario
+    seed: int | None = None
+    requests: list[Request] = field(default_factory=list)
+    injected: list[tuple[float, str]] = field(default_factory=list)
+    _started: float | None = None
+    _refreshed: float = float("-inf")
+    _clients: weakref.WeakSet[FaultyRivian] = field(default_factory=weakref.WeakSet)
+    _rng: random.Random = field(init=False)
+    _drops: asyncio.Task | None = None
+
+    def __post_init__(self) -> None:
+        """Seed the injector."""
+        self._rng = random.Random(self.seed)
+
+    def elapsed(self) -> float:
+        """Return the seconds since the injector started, negative before."""
+        if self._started is None:
+            return float("-inf")
+        return monotonic() - self._started
+
+    def start(self) -> None:
+        """Start the clock and the scheduled websocket drops."""
+        self._started = monotonic()
+        self._drops = asyncio.ensure_future(self._drop_websockets())
+
+    def stop(self) -> None:
+        """Stop injecting faults."""
+        if self._drops:
+            self._drops.cancel()
+        self._started = None
+
+    def add_client(self, client: FaultyRivian) -> None:
+        """Track a client for websocket drops."""
+        self._clients.add(client)
+
+    async def call(
+        self, method: str, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Make a request, injecting the faults active for it."""
+        elapsed = self.elapsed()
+        request = Request(elapsed, method)
+        self.requests.append(request)
+        if method == "create_csrf_token":
+            self._refreshed = elapsed
+        for fault in self._faults(elapsed, method):
+            if fault.kind == LATENCY:
+                await asyncio.sleep(fault.seconds)
+                continue
+            if fault.kind == EXPIRED_TOKEN and self._refreshed >= fault.start:
+                continue
+            request.outcome = fault.kind
+            self.injected.append((elapsed, fault.kind))
+            if fault.kind == TIMEOUT:
+                await asyncio.sleep(fault.seconds)
+                raise RivianApiException(
+                    "Timeout occurred while connecting to Rivian API."
+                )
+            if fault.kind == RATE_LIMIT:
+                raise RivianApiRateLimitError("Rate limit exceeded (injected)")
+            raise RivianExpiredTokenError("Token expired (injected)")
+        try:
+            return await func(*args, **kwargs)
+        except Exception as err:
+            request.outcome = type(err).__name__
+            raise
+
+    def route(self, callback: Callable[[dict[str, Any]], None]) -> Callable:
+        """Return a subscription callback receiving malformed messages."""
+
+        def _route(data: dict[str, Any]) -> None:
+            elapsed = self.elapsed()
+            for fault in self._faults(elapsed, None, (MALFORMED,)):
+                variant = fault.variant or self._rng.choice(list(MALFORMED_VARIANTS))
+                self.injected.append((elapsed, f"{MALFORMED}:{variant}"))
+                data = MALFORMED_VARIANTS[variant](data)
+                break
+            callback(data)
+
+        return _route
+
+    def _faults(
+        self,
+        elapsed: float,
+        method: str | None,
+        kinds: set[str] | tuple[str, ...] = tuple(REQUEST_FAULTS),
+    ) -> list[Fault]:
+        """Return the faults of some kinds that fire now."""
+        return [
+            fault
+            for fault in self.scenario.faults
+            if fault.kind in kinds
+            and fault.active(elapsed, method)
+            and self._rng.random() < fault.probability
+        ]
+
+    async def _drop_websockets(self) -> None:
+        """Close the clients' websockets when the scenario says so."""
+        drops = sorted(
+            moment
+            for fault in self.scenario.faults
+            if fault.kind == WEBSOCKET_DROP
+            for moment in _moments(fault)
+        )
+        for moment in drops:
+            await asyncio.sleep(max(moment - self.elapsed(), 0))
+            self.injected.append((self.elapsed(), WEBSOCKET_DROP))
+            for client in list(self._clients):
+                monitor = client._ws_monitor  # pylint: disable=protected-access
+                if monitor and monitor.websocket and not monitor.websocket.closed:
+                    await monitor.websocket.close()
+
+
+class FaultyRivian(Rivian):
+    """A Rivian client whose requests and subscriptions go through an injector."""
+
+    def __init__(self, *args: Any, injector: FaultInjector, **kwargs: Any) -> None:
+        """Initialize the client."""
+        super().__init__(*args, **kwargs)
+        self.injector = injector
+        injector.add_client(self)
+
+    async def subscribe_for_vehicle_updates(
+        self,
+        vehicle_id: str,
+        callback: Callable[[dict[str, Any]], None],
+        properties: set[str] | None = None,
+    ) -> Callable | None:
+        """Subscribe to vehicle updates, possibly receiving malformed messages."""
+        return await super().subscribe_for_vehicle_updates(
+            vehicle_id, self.injector.route(callback), properties
+        )
+
+
+def _faulty(method: str) -> Callable[..., Any]:
+    """Return a request method that goes through the client's injector."""
+    original = getattr(Rivian, method)
+
+    @functools.wraps(original)
+    async def _request(self: FaultyRivian, *args: Any, **kwargs: Any) -> Any:
+        return await self.injector.call(
+            method, functools.partial(original, self), *args, **kwargs
+        )
+
+    return _request
+
+
+for _method in REQUEST_METHODS:
+    setattr(FaultyRivian, _method, _faulty(_method))
+
+
+def _moments(fault: Fault) -> list[float]:
+    """Return the times a websocket drop fault fires."""
+    assert fault.end is not None
+    if not fault.every:
+        return [fault.start]
+    count = int((fault.end - fault.start) // fault.every) + 1
+    return [fault.start + index * fault.every for index in range(count)]
+
+
+def patch_faults(injector: FaultInjector) -> Callable[[], None]:
+    """Make the integration create faulty clients and return an undo callable."""
+    original = helpers.Rivian
+    helpers.Rivian = functools.partial(FaultyRivian, injector=injector)  # type: ignore[misc]
+
+    def _restore() -> None:
+        helpers.Rivian = original  # type: ignore[misc]
+
+    return _restore
@@ -0,0 +1,127 @@
+"""Offline Home Assistant scaffolding for the development tools."""
+
+from __future__ import annotations
+
+import inspect
+import socket
+from types import MappingProxyType
+from typing import Any
+
+from rivian import Rivian
+
+from homeassistant import bootstrap, loader
+from homeassistant.auth import auth_manager_from_config
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.rivian.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_SESSION_TOKEN,
+    DOMAIN,
+)
+from custom_components.rivian.coordinator import VehicleCoordinator
+from custom_components.rivian.subscription import VehicleSubscriptionManager
+
+
+def create_config_entry(
+    options: dict[str, Any] | None = None, data: dict[str, Any] | None = None
+) -> ConfigEntry:
+    """Return a config entry for the integration, outside of any flow."""
+    kwargs: dict[str, Any] = {
+        "data": data or {},
+        "discovery_keys": MappingProxyType({}),
+        "domain": DOMAIN,
+        "minor_version": 1,
+        "options": options or {},
+        "source": "user",
+        "subentries_data": None,
+        "title": "Rivian (tools)",
+        "unique_id": None,
+        "version": 1,
+    }
+    # the constructor's keyword arguments vary between Home Assistant versions
+    accepted = inspect.signature(ConfigEntry).parameters
+    return ConfigEntry(**{key: kwargs[key] for key in kwargs if key in accepted})
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Return a running Home Assistant instance that can load config entries.
+
+    Only the registries, auth and the http server are set up, which is what
+    the integration's platforms need.
+    """
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config_entries = ConfigEntries(hass, {})
+    loader.async_setup(hass)
+    await bootstrap.async_load_base_functionality(hass)
+    hass.auth = await auth_manager_from_config(hass, [], [])
+    hass.set_state(CoreState.running)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    await async_setup_component(
+        hass, "http", {"http": {"server_host": "127.0.0.1", "server_port": port}}
+    )
+    return hass
+
+
+async def async_stop_hass(hass: HomeAssistant) -> None:
+    """Unload every config entry, then stop Home Assistant."""
+    for entry in hass.config_entries.async_entries():
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_stop()
+
+
+async def async_setup_integration(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> ConfigEntry:
+    """Add and set up a config entry with placeholder tokens.
+
+    Point the client at a fake backend with `patch_client` first.
+    """
+    entry = create_config_entry(
+        options=options,
+        data={
+            CONF_ACCESS_TOKEN: "access",
+            CONF_REFRESH_TOKEN: "refresh",
+            CONF_USER_SESSION_TOKEN: "session",
+        },
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    return entry
+
+
+def create_vehicle_coordinators(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    vehicle_ids: list[str],
+    client: Rivian | None = None,
+) -> dict[str, VehicleCoordinator]:
+    """Return vehicle coordinators whose transports are never started.
+
+    Frames are fed through `_process_new_data` directly. Scheduled refreshes
+    and charging interval changes are disabled since there is no backend.
+    """
+    client = client or Rivian()
+    subscriptions = VehicleSubscriptionManager(
+        hass=hass, client=client, properties=set()
+    )
+    coordinators = {}
+    for vehicle_id in vehicle_ids:
+        coordinator = VehicleCoordinator(
+            hass=hass,
+            config_entry=entry,
+            client=client,
+            vehicle_id=vehicle_id,
+            subscriptions=subscriptions,
+        )
+        coordinator.update_interval = None
+        coordinator.charging_coordinator.adjust_update_interval = (  # type: ignore[method-assign]
+            lambda is_plugged_in: None
+        )
+        coordinators[vehicle_id] = coordinator
+    return coordinators
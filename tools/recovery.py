@@ -0,0 +1,296 @@
+"""Measure how the integration recovers from the faults of a scenario.
+
+Runs the integration against the fake backend through a faulty client:
+
+    python -m tools.recovery tools/scenarios/outage.json --vehicles 2
+    python -m tools.recovery scenario.json --interval-scale 0.05 --json out.json
+
+For each fault it reports the time from the end of the fault until every
+coordinator updates successfully again and every vehicle is back on its
+websocket subscription, and the request amplification: the request rate
+from the start of the fault until recovery, relative to the rate during the
+warmup. The polling interval and error count of every coordinator are
+sampled throughout to show the backoff of `_set_update_interval`.
+
+`--interval-scale` shortens the coordinators' polling intervals so a run
+takes seconds rather than hours; the backoff cap is not scaled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+from pathlib import Path
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rivian.const import (
+    ATTR_COORDINATOR,
+    ATTR_USER,
+    ATTR_VEHICLE,
+    ATTR_WALLBOX,
+    DOMAIN,
+)
+from custom_components.rivian.coordinator import (
+    ChargingCoordinator,
+    DriverKeyCoordinator,
+    RivianDataUpdateCoordinator,
+    UserCoordinator,
+    VehicleCoordinator,
+    WallboxCoordinator,
+)
+
+from .fake_rivian import FakeRivian, patch_client
+from .faults import FaultInjector, Scenario, patch_faults
+from .harness import async_setup_integration, async_start_hass, async_stop_hass
+
+INTERVAL_ATTRIBUTES = (
+    "_update_interval_seconds",
+    "_plugged_interval",
+    "_unplugged_interval",
+)
+SCALED_COORDINATORS = (
+    RivianDataUpdateCoordinator,
+    ChargingCoordinator,
+    DriverKeyCoordinator,
+    UserCoordinator,
+    VehicleCoordinator,
+    WallboxCoordinator,
+)
+
+
+@dataclass
+class FaultResult:
+    """The recovery from a fault."""
+
+    kind: str
+    start: float
+    end: float
+    requests: int
+    amplification: float | None
+    recovered_after: float | None
+
+
+@dataclass
+class Report:
+    """The measurements of a scenario run."""
+
+    baseline_rate: float
+    faults: list[FaultResult]
+    requests: dict[str, dict[str, int]]
+    injected: dict[str, int]
+    backoff: dict[str, list[tuple[float, float | None, int]]] = field(
+        default_factory=dict
+    )
+
+
+@contextmanager
+def scaled_intervals(scale: float) -> Iterator[None]:
+    """Scale the coordinators' polling intervals, keeping at least a second."""
+    saved = {
+        (cls, name): cls.__dict__[name]
+        for cls in SCALED_COORDINATORS
+        for name in INTERVAL_ATTRIBUTES
+        if name in cls.__dict__
+    }
+    for (cls, name), seconds in saved.items():
+        setattr(cls, name, max(1, round(seconds * scale)) if seconds else seconds)
+    try:
+        yield
+    finally:
+        for (cls, name), seconds in saved.items():
+            setattr(cls, name, seconds)
+
+
+def coordinators(hass: HomeAssistant) -> dict[str, RivianDataUpdateCoordinator]:
+    """Return every coordinator of the loaded entries, by a readable name."""
+    found: dict[str, RivianDataUpdateCoordinator] = {}
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        entry_coordinators = entry_data[ATTR_COORDINATOR]
+        found["user"] = entry_coordinators[ATTR_USER]
+        found["wallbox"] = entry_coordinators[ATTR_WALLBOX]
+        coor: VehicleCoordinator
+        for vehicle_id, coor in entry_coordinators[ATTR_VEHICLE].items():
+            found[f"vehicle {vehicle_id[-4:]}"] = coor
+            found[f"charging {vehicle_id[-4:]}"] = coor.charging_coordinator
+            found[f"drivers {vehicle_id[-4:]}"] = coor.drivers_coordinator
+    return found
+
+
+def healthy(coordinators_by_name: dict[str, RivianDataUpdateCoordinator]) -> bool:
+    """Return `True` if every coordinator is updating and subscribed."""
+    for coor in coordinators_by_name.values():
+        if not coor.last_update_success or coor._error_count:  # pylint: disable=protected-access
+            return False
+        if isinstance(coor, VehicleCoordinator) and (
+            coor.transport is not coor.websocket
+            or not coor.subscriptions.is_subscribed(coor.vehicle_id)
+        ):
+            return False
+    return True
+
+
+async def async_run(
+    scenario: Scenario,
+    vehicles: int,
+    frame_rate: float,
+    resolution: float,
+    seed: int | None,
+) -> Report:
+    """Run a scenario and return its measurements."""
+    injector = FaultInjector(scenario, seed=seed)
+    backend = FakeRivian(vehicles=vehicles, frame_rate=frame_rate, seed=seed)
+    restore_client = patch_client(await backend.start())
+    restore_faults = patch_faults(injector)
+    samples: list[tuple[float, bool]] = []
+    backoff: dict[str, list[tuple[float, float | None, int]]] = {}
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = await async_start_hass(config_dir)
+            await async_setup_integration(hass)
+            found = coordinators(hass)
+            setup_requests = len(injector.requests)
+            await asyncio.sleep(scenario.warmup)
+            warmup_requests = len(injector.requests) - setup_requests
+
+            injector.start()
+            end = scenario.duration + scenario.settle
+            while (elapsed := injector.elapsed()) <= end:
+                samples.append((elapsed, healthy(found)))
+                for name, coor in found.items():
+                    interval = (
+                        coor.update_interval.total_seconds()
+                        if coor.update_interval
+                        else None
+                    )
+                    errors = coor._error_count  # pylint: disable=protected-access
+                    history = backoff.setdefault(name, [])
+                    if not history or history[-1][1:] != (interval, errors):
+                        history.append((round(elapsed, 2), interval, errors))
+                if elapsed > scenario.duration and samples[-1][1]:
+                    break
+                await asyncio.sleep(resolution)
+            injector.stop()
+            await async_stop_hass(hass)
+    finally:
+        restore_faults()
+        restore_client()
+        await backend.stop()
+
+    baseline = warmup_requests / scenario.warmup if scenario.warmup else None
+    results = []
+    for index, fault in enumerate(scenario.faults):
+        assert fault.end is not None
+        following = scenario.faults[index + 1 :]
+        # recovery only counts until the next fault begins
+        next_start = following[0].start if following else float("inf")
+        recovered = next(
+            (
+                elapsed
+                for elapsed, ok in samples
+                if fault.end <= elapsed < next_start and ok
+            ),
+            None,
+        )
+        until = recovered if recovered is not None else min(next_start, samples[-1][0])
+        requests = sum(
+            fault.start <= request.elapsed <= until for request in injector.requests
+        )
+        rate = requests / max(until - fault.start, resolution)
+        results.append(
+            FaultResult(
+                kind=fault.kind,
+                start=fault.start,
+                end=fault.end,
+                requests=requests,
+                amplification=round(rate / baseline, 2) if baseline else None,
+                recovered_after=(
+                    round(recovered - fault.end, 2) if recovered is not None else None
+                ),
+            )
+        )
+
+    by_method: dict[str, Counter[str]] = {}
+    for request in injector.requests:
+        by_method.setdefault(request.method, Counter())[request.outcome] += 1
+    return Report(
+        baseline_rate=round(baseline or 0, 3),
+        faults=results,
+        requests={method: dict(counts) for method, counts in by_method.items()},
+        injected=dict(Counter(kind for _, kind in injector.injected)),
+        backoff=backoff,
+    )
+
+
+def print_report(report: Report) -> None:
+    """Print a report as tables."""
+    print(f"baseline: {report.baseline_rate} requests/s")
+    print(
+        f"{'fault':<16} {'window (s)':>14} {'requests':>9} {'amplif.':>8} {'recovered (s)':>14}"
+    )
+    for result in report.faults:
+        window = f"{result.start:g}-{result.end:g}"
+        amplification = (
+            f"{result.amplification:.2f}x" if result.amplification is not None else "-"
+        )
+        recovered = (
+            f"{result.recovered_after:.2f}"
+            if result.recovered_after is not None
+            else "never"
+        )
+        print(
+            f"{result.kind:<16} {window:>14} {result.requests:>9} {amplification:>8} {recovered:>14}"
+        )
+    print("\ninjected:", report.injected)
+    print("\nrequests by method and outcome:")
+    for method, outcomes in sorted(report.requests.items()):
+        print(f"  {method}: {outcomes}")
+    print("\nbackoff (elapsed s, polling interval s, consecutive errors):")
+    for name, history in report.backoff.items():
+        changes = " -> ".join(
+            f"{elapsed:g}s: {interval if interval is not None else 'off'}/{errors}"
+            for elapsed, interval, errors in history
+        )
+        print(f"  {name}: {changes}")
+
+
+def main() -> None:
+    """Run a scenario from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenario", type=Path, help="scenario file")
+    parser.add_argument("--vehicles", type=int, default=1)
+    parser.add_argument(
+        "--frame-rate", type=float, default=1.0, help="frames/s per vehicle"
+    )
+    parser.add_argument(
+        "--interval-scale", type=float, default=1.0, help="polling interval factor"
+    )
+    parser.add_argument(
+        "--resolution", type=float, default=0.1, help="seconds between samples"
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", type=Path, help="write the report to a file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    scenario = Scenario.load(args.scenario)
+    with scaled_intervals(args.interval_scale):
+        report = asyncio.run(
+            async_run(
+                scenario, args.vehicles, args.frame_rate, args.resolution, args.seed
+            )
+        )
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Replay a recorded vehicle frame archive into vehicle coordinators.
+
+Archives are written by the integration when "Record vehicle updates for
+troubleshooting" is enabled in its options:
+
+    python -m tools.replay_frames config/rivian/frames/<archive>.jsonl.gz --speed 10
+
+`--speed 1` replays in real time, `--speed N` N times faster and `--speed 0`
+as fast as possible. Timings of the merge and listener dispatch path are
+reported at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+import statistics
+import tempfile
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rivian.const import CONF_UPDATE_COALESCE_WINDOW
+from custom_components.rivian.frame_recorder import iter_archive
+
+from .harness import create_config_entry, create_vehicle_coordinators
+
+Frame = tuple[float, str, dict[str, Any]]
+
+
+@dataclass
+class ReplayStats:
+    """Timings of a replay."""
+
+    frames: int = 0
+    elapsed: float = 0
+    durations: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict[str, float]:
+        """Return the replay summary."""
+        durations = sorted(self.durations) or [0]
+        return {
+            "frames": self.frames,
+            "elapsed_s": round(self.elapsed, 3),
+            "frames_per_s": round(self.frames / self.elapsed, 1) if self.elapsed else 0,
+            "deliver_mean_us": round(statistics.fmean(durations) * 1e6, 1),
+            "deliver_p50_us": round(durations[len(durations) // 2] * 1e6, 1),
+            "deliver_p99_us": round(durations[int(len(durations) * 0.99)] * 1e6, 1),
+        }
+
+
+async def replay(
+    frames: Iterable[Frame],
+    deliver: Callable[[str, dict[str, Any]], None],
+    speed: float = 1,
+) -> ReplayStats:
+    """Deliver frames with their recorded spacing divided by `speed`.
+
+    A `speed` of 0 delivers the frames back to back, only yielding to the
+    event loop between them so scheduled callbacks still run.
+    """
+    loop = asyncio.get_running_loop()
+    stats = ReplayStats()
+    start = loop.time()
+    first: float | None = None
+    for recorded, vehicle, frame in frames:
+        if first is None:
+            first = recorded
+        if (
+            speed > 0
+            and (delay := start + (recorded - first) / speed - loop.time()) > 0
+        ):
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+        began = perf_counter()
+        deliver(vehicle, frame)
+        stats.durations.append(perf_counter() - began)
+        stats.frames += 1
+    stats.elapsed = loop.time() - start
+    return stats
+
+
+async def _replay_archive(args: argparse.Namespace) -> None:
+    """Replay an archive into fresh vehicle coordinators and print the timings."""
+    frames = list(iter_archive(args.archive))
+    vehicles = sorted({vehicle for _, vehicle, _ in frames})
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = create_config_entry(
+            options={CONF_UPDATE_COALESCE_WINDOW: args.coalesce_window}
+        )
+        coordinators = create_vehicle_coordinators(hass, entry, vehicles)
+        updates = dict.fromkeys(vehicles, 0)
+        for vehicle, coordinator in coordinators.items():
+
+            def _count(vehicle: str = vehicle) -> None:
+                updates[vehicle] += 1
+
+            coordinator.async_add_listener(_count)
+
+        stats = await replay(
+            frames,
+            lambda vehicle, frame: coordinators[vehicle]._process_new_data(frame),  # pylint: disable=protected-access
+            args.speed,
+        )
+        # let pending coalesced updates publish
+        await asyncio.sleep(args.coalesce_window)
+        for coordinator in coordinators.values():
+            coordinator._async_flush_pending()  # pylint: disable=protected-access
+        print(stats.summary())
+        print({"updates": sum(updates.values()), "vehicles": len(vehicles)})
+        for coordinator in coordinators.values():
+            await coordinator.async_shutdown()
+
+
+def main() -> None:
+    """Run a replay from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archive", type=Path)
+    parser.add_argument(
+        "--speed", type=float, default=1, help="1 = real time, 0 = as fast as possible"
+    )
+    parser.add_argument(
+        "--coalesce-window", type=float, default=0, help="update coalescing (s)"
+    )
+    asyncio.run(_replay_archive(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()